@@ -0,0 +1,67 @@
+"""
+transform_round 처리량 벤치마크
+
+얕은 복사 기반 변형 경로와, 예전 copy.deepcopy 경로(라운드 전체 + 홀별 + 샷별
+깊은 복사)를 같은 입력/시드로 실행하여 초당 라운드 수를 비교합니다.
+
+사용법:
+    python bench_transform.py [--input ../../assets/data/all_sample_rounds.json] [--users 3]
+"""
+
+import argparse
+import copy
+import time
+from pathlib import Path
+
+from entity_rng import EntityRandom
+from expand_sample_data import SKILL_LEVELS, round_key, transform_round
+from round_io import read_rounds
+
+
+def deepcopy_transform_round(round_data, skill_level, user_index, rng, id_key=None):
+    """예전 경로 재현: 라운드/홀/샷을 모두 깊은 복사한 뒤 변형"""
+    copied = copy.deepcopy(round_data)
+    copied['holes'] = [copy.deepcopy(hole) for hole in copied['holes']]
+    copied['shots'] = [copy.deepcopy(shot) for shot in copied['shots']]
+    return transform_round(copied, skill_level, user_index, rng, id_key)
+
+
+def measure(transform, base_rounds, users, seed):
+    """레벨 × 사용자 × 원본 라운드 전체를 변형하고 (라운드 수, 소요 초) 반환"""
+    count = 0
+    start = time.perf_counter()
+    for skill_level in SKILL_LEVELS:
+        for user_index in range(1, users + 1):
+            for round_index, round_data in enumerate(base_rounds):
+                key = round_key(seed, skill_level, user_index, round_index)
+                transform(round_data, skill_level, user_index, EntityRandom(*key), key)
+                count += 1
+    return count, time.perf_counter() - start
+
+
+def main():
+    project_root = Path(__file__).parent.parent.parent
+    parser = argparse.ArgumentParser(description="transform_round 처리량 벤치마크")
+    parser.add_argument("--input", type=Path,
+                        default=project_root / "assets" / "data" / "all_sample_rounds.json")
+    parser.add_argument("--users", type=int, default=3, help="실력 레벨당 사용자 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    base_rounds = read_rounds(args.input)
+    shots = sum(len(r['shots']) for r in base_rounds)
+    print(f"원본 라운드: {len(base_rounds)}개 (샷 {shots}개), 레벨당 사용자: {args.users}명")
+
+    results = {}
+    for label, transform in (("deepcopy (이전)", deepcopy_transform_round),
+                             ("얕은 복사 (현재)", transform_round)):
+        count, elapsed = measure(transform, base_rounds, args.users, args.seed)
+        results[label] = count / elapsed
+        print(f"  {label}: {count}라운드 / {elapsed:.2f}초 = {count / elapsed:,.0f} rounds/sec")
+
+    before, after = results.values()
+    print(f"  속도 향상: {after / before:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
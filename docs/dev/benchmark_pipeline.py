@@ -0,0 +1,304 @@
+"""
+데이터 파이프라인 벤치마크
+
+고정 시드와 가상 코스(generate_population.synthetic_courses)로 실행하므로 엑셀 파일이 필요 없습니다.
+케이스마다 새 프로세스(spawn)에서 실행해 최대 RSS를 케이스별로 측정합니다.
+
+케이스 (1× = SCENARIOS 한 번 = 60라운드):
+    generate_shot_data   기존 샷 단위 생성 (홀 60 × 18 × 배율개)
+    generate_round_data  배치 생성 (시나리오 라운드 수 × 배율, iter_round_data로 스트리밍)
+    transform_round      expand_sample_data 변형 (1× 라운드 × 3레벨 × 배율명)
+    serialize_json       write_rounds JSON 배열 기록 MB/s
+    serialize_jsonl      write_rounds JSON Lines 기록 MB/s
+    validate             iter_rounds + RoundValidator 단일 패스 검증
+
+결과는 JSON으로 저장하고, 이전 결과를 --baseline으로 주면 허용 오차(--tolerance)를 넘는
+처리량 감소 / 메모리 증가를 회귀로 보고 종료 코드 1을 반환합니다.
+
+사용법:
+    python benchmark_pipeline.py --output bench.json                      # 1×, 10×, 100×
+    python benchmark_pipeline.py --scales 1,10 --baseline bench.json --tolerance 0.2
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import platform
+import tempfile
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from entity_rng import EntityRandom
+from expand_sample_data import SKILL_LEVELS, round_key, transform_round
+from generate_population import synthetic_courses
+from generate_sample_data import SCENARIOS, generate_shot_data, iter_round_data
+from round_io import iter_rounds, write_rounds
+from validate_data import RoundValidator
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_VERSION = 1
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_SEED = 20251027
+# 시드 생성의 날짜 기준 (실행 날짜와 무관하게 같은 데이터)
+END_DATE = datetime(2025, 10, 27)
+
+# 회귀 판정에 쓰는 지표: (키, 클수록 좋은지)
+COMPARED_METRICS = (('rounds_per_sec', True), ('mb_per_sec', True), ('peak_rss_mb', False))
+
+
+def _fixtures():
+    """가상 코스 → (courses, course_index) (generate_sample_data.load_golf_courses와 같은 형식)"""
+    courses = synthetic_courses()
+    course_index = {
+        'holes_by_course': {(c['cc_id'], c['course_id']): c['holes'] for c in courses},
+        'cc_by_course': {c['course_id']: c['cc_id'] for c in courses},
+    }
+    return [{key: value for key, value in c.items() if key != 'holes'} for c in courses], course_index
+
+
+def _scaled_scenarios(scale):
+    return [{**scenario, 'num_rounds': scenario['num_rounds'] * scale} for scenario in SCENARIOS]
+
+
+def _iter_rounds(scale, seed):
+    """배율만큼 늘린 시나리오의 시드 생성 라운드 (라운드 단위 독립 생성이라 1× 결과가 앞부분에 그대로 포함)"""
+    courses, course_index = _fixtures()
+    for scenario in _scaled_scenarios(scale):
+        yield from iter_round_data(scenario, courses, course_index, seed=seed, end_date=END_DATE)
+
+
+def _iter_expanded(base_rounds, users, seed):
+    for skill_level in SKILL_LEVELS:
+        for user_index in range(1, users + 1):
+            for round_index, round_data in enumerate(base_rounds):
+                key = round_key(seed, skill_level, user_index, round_index)
+                yield transform_round(round_data, skill_level, user_index, EntityRandom(*key), id_key=key)
+
+
+def bench_generate_shot_data(scale, seed, workdir):
+    courses, course_index = _fixtures()
+    pars = [hole['par'] for holes in course_index['holes_by_course'].values() for hole in holes]
+    random.seed(seed)
+    holes = 60 * 18 * scale
+    shots = 0
+    start = time.perf_counter()
+    for i in range(holes):
+        par = pars[i % len(pars)]
+        hole_shots = generate_shot_data(f"hole-{i}", "bench.user", par, par + random.randint(-1, 3), END_DATE)[0]
+        shots += len(hole_shots)
+    return {'rounds': holes / 18, 'shots': shots, 'seconds': time.perf_counter() - start}
+
+
+def bench_generate_round_data(scale, seed, workdir):
+    rounds = shots = 0
+    start = time.perf_counter()
+    for round_data in _iter_rounds(scale, seed):
+        rounds += 1
+        shots += len(round_data['shots'])
+    return {'rounds': rounds, 'shots': shots, 'seconds': time.perf_counter() - start}
+
+
+def bench_transform_round(scale, seed, workdir):
+    base_rounds = list(_iter_rounds(1, seed))
+    rounds = shots = 0
+    start = time.perf_counter()
+    for round_data in _iter_expanded(base_rounds, scale, seed):
+        rounds += 1
+        shots += len(round_data['shots'])
+    return {'rounds': rounds, 'shots': shots, 'seconds': time.perf_counter() - start}
+
+
+def _bench_serialize(fmt, scale, seed, workdir):
+    # 1× 라운드를 배율만큼 반복해서 기록 (생성 시간은 제외하고 메모리는 1×로 유지)
+    base_rounds = list(_iter_rounds(1, seed))
+    shots_per_pass = sum(len(round_data['shots']) for round_data in base_rounds)
+    path = os.path.join(workdir, f"serialize.{fmt}")
+    start = time.perf_counter()
+    rounds = write_rounds((round_data for _ in range(scale) for round_data in base_rounds), path, fmt=fmt)
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    os.remove(path)
+    return {'rounds': rounds, 'shots': shots_per_pass * scale, 'bytes': size, 'seconds': seconds}
+
+
+def bench_serialize_json(scale, seed, workdir):
+    return _bench_serialize('json', scale, seed, workdir)
+
+
+def bench_serialize_jsonl(scale, seed, workdir):
+    return _bench_serialize('jsonl', scale, seed, workdir)
+
+
+def bench_validate(scale, seed, workdir):
+    # ID가 겹치지 않도록 변형 라운드(1× × 3레벨 × 배율명)로 입력 파일을 미리 만듦 (측정 제외)
+    path = os.path.join(workdir, "validate.jsonl")
+    write_rounds(_iter_expanded(list(_iter_rounds(1, seed)), scale, seed), path, fmt='jsonl')
+    size = os.path.getsize(path)
+    validator = RoundValidator()
+    shots = 0
+    start = time.perf_counter()
+    for round_data in iter_rounds(path, 'jsonl'):
+        validator.add(round_data)
+        shots += len(round_data['shots'])
+    seconds = time.perf_counter() - start
+    os.remove(path)
+    if not all(passed for _, passed in validator.checks()):
+        raise RuntimeError("벤치마크 입력이 검증을 통과하지 못했습니다")
+    return {'rounds': validator.total_rounds, 'shots': shots, 'bytes': size, 'seconds': seconds}
+
+
+CASES = {
+    'generate_shot_data': bench_generate_shot_data,
+    'generate_round_data': bench_generate_round_data,
+    'transform_round': bench_transform_round,
+    'serialize_json': bench_serialize_json,
+    'serialize_jsonl': bench_serialize_jsonl,
+    'validate': bench_validate,
+}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(name, scale, seed, workdir):
+    """케이스 하나 실행 (새 프로세스에서 호출) → 결과 dict"""
+    baseline_rss = _peak_rss_mb()
+    result = CASES[name](scale, seed, workdir)
+    seconds = max(result['seconds'], 1e-9)
+    record = {
+        'case': name,
+        'scale': scale,
+        'rounds': result['rounds'],
+        'shots': result['shots'],
+        'seconds': round(result['seconds'], 4),
+        'rounds_per_sec': round(result['rounds'] / seconds, 1),
+        'shots_per_sec': round(result['shots'] / seconds, 1),
+        'peak_rss_mb': _peak_rss_mb(),
+        'import_rss_mb': baseline_rss,
+    }
+    if 'bytes' in result:
+        record['bytes'] = result['bytes']
+        record['mb_per_sec'] = round(result['bytes'] / (1024 * 1024) / seconds, 2)
+    return record
+
+
+def run_benchmarks(cases, scales, seed=DEFAULT_SEED, repeat=1):
+    """케이스 × 배율마다 새 프로세스에서 repeat번 실행하고 가장 빠른 결과를 채택"""
+    context = multiprocessing.get_context('spawn')
+    results = []
+    with tempfile.TemporaryDirectory(prefix='golf_bench_') as workdir:
+        for scale in scales:
+            for name in cases:
+                best = None
+                for _ in range(repeat):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                        record = executor.submit(run_case, name, scale, seed, workdir).result()
+                    if best is None or record['seconds'] < best['seconds']:
+                        best = record
+                results.append(best)
+                mb = f", {best['mb_per_sec']:,.1f} MB/s" if 'mb_per_sec' in best else ""
+                rss = f", 최대 RSS {best['peak_rss_mb']:,.0f} MB" if best['peak_rss_mb'] is not None else ""
+                print(f"  {name:<20} {scale:>4}×: {best['rounds_per_sec']:>10,.1f} rounds/s, "
+                      f"{best['shots_per_sec']:>12,.0f} shots/s{mb}{rss}")
+    return {
+        'version': BENCHMARK_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'repeat': repeat,
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """
+    기준 결과 대비 회귀 목록
+
+    처리량 지표는 기준 × (1 - tolerance)보다 낮으면, 메모리는 기준 × (1 + tolerance)보다 높으면 회귀.
+    기준에 없는 (케이스, 배율)은 비교하지 않습니다.
+    """
+    if baseline.get('version') != BENCHMARK_VERSION:
+        raise ValueError(f"기준 결과 버전이 다릅니다: {baseline.get('version')}")
+    previous = {(r['case'], r['scale']): r for r in baseline['results']}
+    regressions = []
+    for record in report['results']:
+        old = previous.get((record['case'], record['scale']))
+        if old is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            new_value, old_value = record.get(metric), old.get(metric)
+            if new_value is None or not old_value:
+                continue
+            change = new_value / old_value - 1
+            worse = change < -tolerance if higher_is_better else change > tolerance
+            if worse:
+                regressions.append({'case': record['case'], 'scale': record['scale'], 'metric': metric,
+                                    'baseline': old_value, 'current': new_value, 'change': round(change, 4)})
+    return regressions
+
+
+def parse_scales(text):
+    scales = [int(part) for part in text.split(',') if part.strip()]
+    if not scales or min(scales) < 1:
+        raise argparse.ArgumentTypeError("배율은 1 이상의 정수 목록이어야 합니다 (예: 1,10,100)")
+    return scales
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터 파이프라인 벤치마크")
+    parser.add_argument("--scales", type=parse_scales, default=list(DEFAULT_SCALES),
+                        help="데이터 배율 목록 (기본: 1,10,100)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="실행할 케이스")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="난수 시드")
+    parser.add_argument("--repeat", type=int, default=1, help="케이스별 반복 횟수 (가장 빠른 결과 채택)")
+    parser.add_argument("--output", default="benchmark_results.json", help="결과 JSON 파일")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 오차 비율 (기본: 0.2 = 20%%)")
+    args = parser.parse_args()
+
+    print(f"벤치마크: 케이스 {len(args.cases)}개 × 배율 {args.scales} (시드 {args.seed})")
+    report = run_benchmarks(args.cases, args.scales, args.seed, args.repeat)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        report['baseline'] = {'file': args.baseline, 'tolerance': args.tolerance,
+                              'regressions': compare_to_baseline(report, baseline, args.tolerance)}
+        regressions = report['baseline']['regressions']
+        if regressions:
+            print(f"\n❌ 기준 대비 회귀 {len(regressions)}건 (허용 오차 {args.tolerance:.0%}):")
+            for r in regressions:
+                print(f"  {r['case']} {r['scale']}× {r['metric']}: {r['baseline']:,} → {r['current']:,} ({r['change']:+.1%})")
+            exit_code = 1
+        else:
+            print(f"\n✅ 기준 대비 회귀 없음 (허용 오차 {args.tolerance:.0%})")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📁 결과: {args.output}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
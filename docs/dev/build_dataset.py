@@ -0,0 +1,346 @@
+"""
+데이터셋 빌드 오케스트레이터 (내용 주소 캐시)
+
+엑셀 → generate_sample_data → 원본 라운드 → expand_sample_data → 확장 라운드 → validate_data
+파이프라인을 단계(sample / expand / validate)별 지문으로 캐시합니다.
+
+지문은 다음을 합친 JSON의 SHA-256입니다.
+    - 입력 파일 내용 해시 (엑셀, 상위 단계 산출물)
+    - 단계 스크립트와 로컬 의존 모듈의 소스 해시 (스크립트 버전)
+    - 파라미터 (SCENARIOS, SKILL_LEVELS, users_per_level, seed, end_date, 포맷, 배치)
+
+산출물은 <build-dir>/<단계>-<지문 앞 16자리>/에 stamp.json(지문 구성, 산출물 해시 · 크기)과 함께 저장되며,
+    - 지문이 같은 산출물이 있으면 단계를 건너뜁니다.
+    - 상위 단계가 다시 만들어지면 하위 단계의 입력 해시가 바뀌므로 하위 단계만 다시 실행합니다.
+      상위 산출물 내용이 그대로면(시드 고정) 하위 단계는 캐시를 그대로 씁니다.
+    - 파라미터를 예전 값으로 되돌리면 남아 있는 산출물을 다시 사용합니다.
+마지막으로 성공한 빌드의 단계별 산출물 경로는 <build-dir>/latest.json에 기록합니다.
+
+사용법 (generate_sample_data와 같이 프로젝트 루트에서 실행):
+    python docs/dev/build_dataset.py --seed 42 --end-date 2026-01-01 --users-per-level 10
+    python docs/dev/build_dataset.py --seed 42 --end-date 2026-01-01 --status         # 실행 없이 캐시 상태만
+    python docs/dev/build_dataset.py --seed 42 --end-date 2026-01-01 --force sample   # 지문과 무관하게 다시 실행
+    python docs/dev/build_dataset.py --prune                                           # latest.json 외 산출물 삭제
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import hashlib
+import argparse
+from datetime import date, datetime
+
+import numpy as np
+
+import entity_rng
+import round_io
+import validate_data
+import expand_sample_data
+import generate_sample_data
+from expand_sample_data import SKILL_LEVELS
+from generate_sample_data import EXAMPLES_DIR, EXCEL_FILE, SCENARIOS
+from round_io import FORMATS, LAYOUTS, file_sha256, iter_rounds, write_rounds
+
+# 지문 / stamp 형식이 바뀌면 올려서 기존 산출물을 모두 무효화
+BUILD_VERSION = 1
+
+BUILD_DIR = "build/dataset"
+STAMP_FILE = "stamp.json"
+LATEST_FILE = "latest.json"
+
+
+def source_hashes(modules):
+    """단계 스크립트 버전: 모듈 소스 파일별 내용 해시"""
+    return {os.path.basename(module.__file__): file_sha256(module.__file__) for module in modules}
+
+
+def fingerprint(key):
+    """지문 구성 dict → SHA-256 (키 순서와 무관)"""
+    payload = json.dumps(key, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def artifact_input(stamp, name):
+    """상위 단계 stamp의 산출물 → 하위 단계 입력 (경로, 해시)"""
+    artifact = stamp['artifacts'][name]
+    return {'path': os.path.join(stamp['dir'], artifact['file']), 'sha256': artifact['sha256']}
+
+
+# --- 단계 정의 ---
+
+def sample_inputs(args, upstream):
+    excel = os.path.join(EXAMPLES_DIR, EXCEL_FILE)
+    return {'excel': {'path': excel, 'sha256': file_sha256(excel)}}
+
+
+def sample_params(args):
+    return {'scenarios': SCENARIOS, 'seed': args.seed, 'end_date': args.end_date.isoformat(),
+            'format': 'json', 'layout': 'flat'}
+
+
+def run_sample(args, inputs, out_dir):
+    """
+    generate_sample_data.main과 같은 생성 경로 (배치 샷 생성, 출력은 all_sample_rounds.json)
+
+    Returns:
+        (산출물, 요약) - 코스 정보를 읽지 못하면 (None, None)
+    """
+    courses_df, course_index = generate_sample_data.load_golf_courses()
+    if courses_df is None:
+        print("[ERROR] Cannot generate data without course info.")
+        return None, None
+    if args.seed is not None:
+        random.seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    end_date = datetime.combine(args.end_date, datetime.min.time())
+    path = os.path.join(out_dir, "all_sample_rounds.json")
+    rounds = generate_sample_data.iter_all_rounds(courses_df.to_dict('records'), course_index, rng=rng,
+                                                  seed=args.seed, end_date=end_date)
+    count = write_rounds(rounds, path, fmt='json')
+    return {'rounds': path}, {'rounds': count}
+
+
+def expand_inputs(args, upstream):
+    return {'rounds': artifact_input(upstream['sample'], 'rounds')}
+
+
+def expand_params(args):
+    # workers는 결과에 영향이 없으므로 (시드 고정 시 프로세스 수와 무관) 지문에 넣지 않음
+    return {'skill_levels': SKILL_LEVELS, 'users_per_level': args.users_per_level, 'seed': args.seed,
+            'format': args.format, 'layout': args.layout}
+
+
+def run_expand(args, inputs, out_dir):
+    path = os.path.join(out_dir, f"all_sample_rounds_expanded.{args.format}")
+    expand_sample_data.expand_sample_data(
+        input_file=inputs['rounds']['path'],
+        output_file=path,
+        users_per_level=args.users_per_level,
+        output_format=args.format,
+        seed=args.seed,
+        workers=args.workers,
+        layout=args.layout,
+    )
+    with open(expand_sample_data.manifest_path(path), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return ({'rounds': path, 'manifest': expand_sample_data.manifest_path(path)},
+            {'rounds': manifest['rounds'], 'users': sum(level['users'] for level in manifest['levels'].values())})
+
+
+def validate_inputs(args, upstream):
+    return {'rounds': artifact_input(upstream['expand'], 'rounds')}
+
+
+def validate_params(args):
+    return {}
+
+
+def run_validate(args, inputs, out_dir):
+    """검증 결과를 report.json으로 남김 (실패해도 산출물로 캐시하고 빌드 종료 코드로 알림)"""
+    validator = validate_data.RoundValidator()
+    for round_data in iter_rounds(inputs['rounds']['path']):
+        validator.add(round_data)
+    validate_data.print_report(validator)
+    checks = [{'check': label, 'passed': passed} for label, passed in validator.checks()]
+    passed = all(check['passed'] for check in checks)
+    path = os.path.join(out_dir, "report.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'rounds': validator.total_rounds, 'users': len(validator.users), 'passed': passed,
+                   'checks': checks, 'violations': validator.violations}, f, ensure_ascii=False, indent=2)
+    return {'report': path}, {'rounds': validator.total_rounds, 'passed': passed}
+
+
+# 실행 순서대로. modules는 출력에 영향을 주는 스크립트 (소스가 바뀌면 해당 단계부터 다시 실행)
+STAGES = [
+    {'name': 'sample', 'modules': (generate_sample_data, entity_rng, round_io),
+     'inputs': sample_inputs, 'params': sample_params, 'run': run_sample},
+    {'name': 'expand', 'modules': (expand_sample_data, entity_rng, round_io),
+     'inputs': expand_inputs, 'params': expand_params, 'run': run_expand},
+    {'name': 'validate', 'modules': (validate_data, round_io),
+     'inputs': validate_inputs, 'params': validate_params, 'run': run_validate},
+]
+STAGE_NAMES = tuple(stage['name'] for stage in STAGES)
+
+
+# --- 캐시 ---
+
+def read_stamp(stage_dir, key_hash):
+    """지문이 같고 산출물 파일이 모두 기록 당시 크기로 남아 있으면 stamp, 아니면 None"""
+    try:
+        with open(os.path.join(stage_dir, STAMP_FILE), 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if stamp.get('build_version') != BUILD_VERSION or stamp.get('fingerprint') != key_hash:
+        return None
+    for artifact in stamp['artifacts'].values():
+        path = os.path.join(stage_dir, artifact['file'])
+        if not os.path.exists(path) or os.path.getsize(path) != artifact['size']:
+            return None
+    stamp['dir'] = stage_dir
+    return stamp
+
+
+def run_stage(stage, args, inputs, key, key_hash, stage_dir):
+    """임시 디렉터리에서 단계를 실행하고 stamp를 쓴 뒤 stage_dir로 교체 (중단 시 반쪽 산출물이 남지 않음, 실패하면 None)"""
+    tmp_dir = f"{stage_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    start = time.perf_counter()
+    artifacts, summary = stage['run'](args, inputs, tmp_dir)
+    if artifacts is None:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+    stamp = {
+        'build_version': BUILD_VERSION,
+        'stage': stage['name'],
+        'fingerprint': key_hash,
+        'key': key,
+        'artifacts': {
+            name: {'file': os.path.basename(path), 'sha256': file_sha256(path), 'size': os.path.getsize(path)}
+            for name, path in artifacts.items()
+        },
+        'summary': summary,
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        'seconds': round(time.perf_counter() - start, 2),
+    }
+    with open(os.path.join(tmp_dir, STAMP_FILE), 'w', encoding='utf-8') as f:
+        json.dump(stamp, f, ensure_ascii=False, indent=2, default=str)
+    shutil.rmtree(stage_dir, ignore_errors=True)
+    os.replace(tmp_dir, stage_dir)
+    stamp['dir'] = stage_dir
+    return stamp
+
+
+def build(args, status_only=False):
+    """
+    단계를 순서대로 확인해 지문이 맞는 산출물은 재사용하고 나머지만 실행
+
+    Returns:
+        {단계: stamp} (status_only면 실행하지 않으므로 상위가 없는 단계는 빠짐), 단계 실행이 실패하면 None
+    """
+    os.makedirs(args.build_dir, exist_ok=True)
+    stamps = {}
+    for stage in STAGES:
+        name = stage['name']
+        if any(upstream not in stamps for upstream in STAGE_NAMES[:STAGE_NAMES.index(name)]):
+            print(f"⏸  {name}: 상위 단계 실행 후 결정")
+            continue
+        inputs = stage['inputs'](args, stamps)
+        key = {
+            'stage': name,
+            'scripts': source_hashes(stage['modules']),
+            'inputs': {input_name: value['sha256'] for input_name, value in inputs.items()},
+            'params': stage['params'](args),
+        }
+        key_hash = fingerprint(key)
+        stage_dir = os.path.join(args.build_dir, f"{name}-{key_hash[:16]}")
+        stamp = read_stamp(stage_dir, key_hash)
+
+        if stamp is not None and name not in args.force:
+            print(f"✓ {name}: 캐시 사용 ({stage_dir}, {stamp['built_at']} 생성)")
+            stamps[name] = stamp
+            continue
+        if status_only:
+            reason = "강제 재실행" if stamp is not None else "지문과 일치하는 산출물 없음"
+            print(f"▶ {name}: 실행 필요 ({reason}, 지문 {key_hash[:16]})")
+            continue
+
+        print(f"\n▶ {name}: 실행 ({stage_dir})")
+        stamp = run_stage(stage, args, inputs, key, key_hash, stage_dir)
+        if stamp is None:
+            print(f"❌ {name}: 실패")
+            return None
+        stamps[name] = stamp
+        print(f"✓ {name}: 완료 {stamps[name]['seconds']:.1f}초 {stamps[name]['summary']}")
+    return stamps
+
+
+def write_latest(build_dir, stamps):
+    latest = {
+        name: {
+            'dir': stamp['dir'],
+            'fingerprint': stamp['fingerprint'],
+            'artifacts': {key: os.path.join(stamp['dir'], artifact['file'])
+                          for key, artifact in stamp['artifacts'].items()},
+        }
+        for name, stamp in stamps.items()
+    }
+    path = os.path.join(build_dir, LATEST_FILE)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(latest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def prune(build_dir):
+    """latest.json이 가리키지 않는 단계 산출물 디렉터리 삭제 (중단된 .tmp 포함)"""
+    try:
+        with open(os.path.join(build_dir, LATEST_FILE), 'r', encoding='utf-8') as f:
+            keep = {os.path.abspath(entry['dir']) for entry in json.load(f).values()}
+    except FileNotFoundError:
+        keep = set()
+    removed = 0
+    for entry in sorted(os.listdir(build_dir)):
+        path = os.path.join(build_dir, entry)
+        if (os.path.isdir(path) and entry.split('-', 1)[0] in STAGE_NAMES
+                and os.path.abspath(path) not in keep):
+            shutil.rmtree(path)
+            print(f"🗑  {path}")
+            removed += 1
+    print(f"✅ 산출물 {removed}개 삭제")
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="데이터셋 빌드 (단계별 지문 캐시)")
+    parser.add_argument("--build-dir", default=BUILD_DIR, help=f"산출물 캐시 디렉터리 (기본: {BUILD_DIR})")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="마스터 시드 (sample / expand 공통). 없으면 실행마다 다른 데이터가 지문 기준으로 캐시됨")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="플레이 날짜 범위의 끝 (기본: 오늘 - 날짜가 바뀌면 sample부터 다시 생성)")
+    parser.add_argument("--users-per-level", type=int, default=10, help="expand 실력 레벨당 사용자 수")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="확장 데이터 포맷")
+    parser.add_argument("--layout", choices=LAYOUTS, default="flat", help="확장 데이터 샷 배치")
+    parser.add_argument("--workers", type=int, default=1, help="expand 병렬 프로세스 수 (지문에 포함되지 않음)")
+    parser.add_argument("--force", action="append", choices=STAGE_NAMES, default=[],
+                        help="지문과 무관하게 다시 실행할 단계 (여러 번 지정 가능, 하위는 산출물 내용이 바뀌면 재실행)")
+    parser.add_argument("--status", action="store_true", help="실행하지 않고 단계별 캐시 상태만 출력")
+    parser.add_argument("--prune", action="store_true", help="latest.json이 가리키지 않는 산출물 삭제 후 종료")
+    args = parser.parse_args()
+    args.end_date = args.end_date or date.today()
+
+    if args.prune:
+        if os.path.isdir(args.build_dir):
+            prune(args.build_dir)
+        return 0
+
+    print("=" * 60)
+    print(f"데이터셋 빌드: {args.build_dir}")
+    print("=" * 60)
+    excel = os.path.join(EXAMPLES_DIR, EXCEL_FILE)
+    if not os.path.exists(excel):
+        print(f"[ERROR] Excel file not found: {excel}")
+        return 1
+    if args.seed is None:
+        print("⚠️  시드가 없어 생성 결과가 실행마다 다릅니다 (지문이 같으면 처음 만든 결과를 재사용)")
+    stamps = build(args, status_only=args.status)
+    if stamps is None:
+        return 1
+    if args.status:
+        return 0
+
+    latest = write_latest(args.build_dir, stamps)
+    report = stamps['validate']['artifacts']['report']
+    print(f"\n📁 산출물 목록: {latest}")
+    if not stamps['validate']['summary']['passed']:
+        print(f"❌ 검증 실패: {os.path.join(stamps['validate']['dir'], report['file'])}")
+        return 1
+    print("✅ 빌드 완료 (검증 통과)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
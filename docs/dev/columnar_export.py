@@ -0,0 +1,253 @@
+"""
+라운드 데이터 컬럼형(Parquet / Arrow IPC) 내보내기
+
+중첩 JSON 라운드를 정규화된 세 테이블로 나눠 기록합니다.
+
+    rounds.<ext> : 라운드 1행 (holes/shots 제외한 라운드 필드)
+    holes.<ext>  : 홀 1행, round_id로 rounds와 연결
+    shots.<ext>  : 샷 1행, hole_score_id로 holes와 연결
+
+user_id / club_type / shot_type / lie 같은 반복 문자열은 dictionary 인코딩하므로
+JSON보다 파일이 훨씬 작고, 분석 시 필요한 컬럼만 읽을 수 있습니다.
+    예) pq.read_table('shots.parquet', columns=['club_type', 'TOTAL'])
+
+pyarrow가 필요합니다 (pip install pyarrow). JSON/JSONL 출력만 쓸 때는 필요 없습니다.
+"""
+
+import os
+import math
+
+import pipeline_metrics
+from round_io import flatten_shots
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+
+# 기본 배치 크기 (라운드 수 기준, 배치마다 row group / record batch 하나)
+DEFAULT_BATCH_ROUNDS = 1000
+
+# 샷 측정값 컬럼 (모두 float64)
+SHOT_METRICS = [
+    'TOTAL', 'CARRY', 'HEIGHT', 'LAND_ANG', 'SIDE', 'SIDE_TOT', 'HANG_TIME', 'FROM_PIN',
+    'BALL_SPEED', 'LAUNCH_ANG', 'LAUNCH_DIR', 'SPIN_RATE', 'SPIN_AXIS', 'BACK_SPIN', 'SIDE_SPIN',
+    'SMASH_FAC', 'ATTACK_ANG', 'CLUB_PATH', 'DYN_LOFT', 'SPIN_LOFT', 'FACE_ANG', 'FACE_TO_PATH',
+    'CLUB_SPEED',
+]
+
+
+def _int_or_none(value):
+    """정수 컬럼 값 정리: 엑셀 빈 셀에서 온 float / NaN을 int / None으로 변환"""
+    if isinstance(value, float):
+        return None if math.isnan(value) else int(value)
+    return value
+
+
+def _schemas():
+    """테이블별 스키마 (lib/models의 Round/Hole/Shot 필드 순서)"""
+    dict_str = pa.dictionary(pa.int32(), pa.string())
+    rounds = pa.schema([
+        ('round_id', pa.string()),
+        ('user_id', dict_str),
+        ('game_session_id', pa.string()),
+        ('game_mode', dict_str),
+        ('game_rule', dict_str),
+        ('simulator_id', pa.string()),
+        ('team_id', pa.string()),
+        ('played_at', pa.string()),
+        ('play_end_time', pa.string()),
+        ('cc_id', dict_str),
+        ('cc_name', dict_str),
+        ('course_id', dict_str),
+        ('course_name', dict_str),
+        ('tee_box', dict_str),
+        ('total_par', pa.int16()),
+        ('total_score', pa.int16()),
+        ('rank', pa.int32()),
+        ('ranking_eligible', pa.bool_()),
+        ('total_putts', pa.int16()),
+        ('fairways_hit', pa.int16()),
+        ('fairways_attempted', pa.int16()),
+        ('greens_in_regulation', pa.int16()),
+        ('mulligans_used', pa.int16()),
+        ('birdies_or_better', pa.int16()),
+        ('pars', pa.int16()),
+        ('bogeys', pa.int16()),
+        ('double_bogey_or_worse', pa.int16()),
+    ])
+    holes = pa.schema([
+        ('hole_score_id', pa.string()),
+        ('round_id', pa.string()),
+        ('hole_number', pa.int8()),
+        ('hole_id', pa.string()),
+        ('par', pa.int8()),
+        ('distance', pa.int32()),
+        ('strokes', pa.int8()),
+        ('putts', pa.int8()),
+        ('fairway_hit', pa.bool_()),
+        ('green_in_regulation', pa.bool_()),
+        ('penalties', pa.int8()),
+        ('penalty_details', pa.list_(pa.string())),
+        ('first_putt_distance', pa.float64()),
+        ('first_putt_made', pa.bool_()),
+    ])
+    shots = pa.schema([
+        ('shot_id', pa.string()),
+        ('hole_score_id', pa.string()),
+        ('user_id', dict_str),
+        ('shot_number', pa.int8()),
+        ('club_type', dict_str),
+        ('shot_type', dict_str),
+        ('lie', dict_str),
+        ('is_putt', pa.bool_()),
+        ('putt_made', pa.bool_()),
+        ('putt_length', pa.float64()),
+        ('is_mulligan', pa.bool_()),
+        ('shot_at', pa.string()),
+    ] + [(name, pa.float64()) for name in SHOT_METRICS])
+    return {'rounds': rounds, 'holes': holes, 'shots': shots}
+
+
+class ColumnarWriter:
+    """
+    라운드를 하나씩 받아 rounds/holes/shots 테이블을 배치 단위로 기록
+
+    배치 크기만큼의 컬럼 버퍼만 메모리에 유지하므로 round_io.write_rounds와 같이
+    스트리밍으로 쓸 수 있습니다. with 문으로 사용하거나 close()를 호출해야 파일이 완성됩니다.
+    """
+
+    def __init__(self, output_dir, fmt='parquet', batch_rounds=DEFAULT_BATCH_ROUNDS):
+        if pa is None:
+            raise ImportError("컬럼형 내보내기에는 pyarrow가 필요합니다: pip install pyarrow")
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"지원하지 않는 컬럼형 포맷: {fmt}")
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.batch_rounds = batch_rounds
+        self.schemas = _schemas()
+        self.paths = {name: os.path.join(output_dir, f"{name}.{fmt}") for name in self.schemas}
+        self._buffers = {name: {field: [] for field in schema.names} for name, schema in self.schemas.items()}
+        self._writers = {}
+        # dictionary 컬럼별 누적 사전 (값 → 코드). 배치마다 사전이 앞부분을 유지하며 늘어나므로
+        # Arrow IPC 파일에는 델타만 기록되고 Parquet에도 같은 코드가 쓰입니다.
+        self._dictionaries = {}
+        self._pending = 0
+        self.count = 0
+
+    def _append(self, table, record):
+        for field, column in self._buffers[table].items():
+            column.append(record.get(field))
+
+    def add(self, round_data):
+        with pipeline_metrics.stage('columnar'):
+            round_data = flatten_shots(round_data)
+            self._append('rounds', round_data)
+            for hole in round_data.get('holes', []):
+                self._append('holes', hole)
+            for shot in round_data.get('shots', []):
+                self._append('shots', shot)
+
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.batch_rounds:
+            self.flush()
+
+    def flush(self):
+        """버퍼에 쌓인 행을 테이블별로 기록 (Parquet은 row group, Arrow는 record batch 하나)"""
+        if not self._pending:
+            return
+        with pipeline_metrics.stage('columnar'):
+            self._flush()
+
+    def _flush(self):
+        for name, schema in self.schemas.items():
+            columns = self._buffers[name]
+            batch = pa.RecordBatch.from_arrays(
+                [self._to_array(name, field, columns[field.name]) for field in schema],
+                schema=schema,
+            )
+            writer = self._writers.get(name)
+            if writer is None:
+                writer = self._open(name, schema)
+                self._writers[name] = writer
+            writer.write_batch(batch)
+            for column in columns.values():
+                column.clear()
+        self._pending = 0
+
+    def _to_array(self, table, field, values):
+        if pa.types.is_integer(field.type):
+            return pa.array([_int_or_none(value) for value in values], type=field.type)
+        if not pa.types.is_dictionary(field.type):
+            return pa.array(values, type=field.type)
+        codes = self._dictionaries.setdefault((table, field.name), {})
+        indices = [None if value is None else codes.setdefault(value, len(codes)) for value in values]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=field.type.index_type),
+            pa.array(list(codes), type=field.type.value_type),
+        )
+
+    def _open(self, name, schema):
+        if self.fmt == 'parquet':
+            return pq.ParquetWriter(self.paths[name], schema, compression='zstd')
+        options = ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        return ipc.new_file(self.paths[name], schema, options=options)
+
+    def close(self):
+        self.flush()
+        # 라운드가 하나도 없어도 스키마만 있는 빈 파일을 남김
+        for name, schema in self.schemas.items():
+            if name not in self._writers:
+                self._writers[name] = self._open(name, schema)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def tee(self, rounds):
+        """라운드를 기록하면서 그대로 다시 내보내기 (JSON 출력과 한 번에 생성할 때 사용)"""
+        for round_data in rounds:
+            self.add(round_data)
+            yield round_data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # 실패 시 남은 버퍼는 버리고 파일 핸들만 정리
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = {}
+
+
+def write_columnar(rounds, output_dir, fmt='parquet', batch_rounds=DEFAULT_BATCH_ROUNDS):
+    """
+    라운드 이터러블을 컬럼형 테이블 세 개로 기록
+
+    Returns:
+        기록한 라운드 수
+    """
+    with ColumnarWriter(output_dir, fmt, batch_rounds) as writer:
+        for round_data in rounds:
+            writer.add(round_data)
+    return writer.count
+
+
+def read_table(path, columns=None):
+    """컬럼형 테이블 읽기 (확장자로 Parquet/Arrow 판별, columns로 필요한 컬럼만 선택)"""
+    if pa is None:
+        raise ImportError("컬럼형 읽기에는 pyarrow가 필요합니다: pip install pyarrow")
+    if str(path).endswith('.parquet'):
+        return pq.read_table(path, columns=columns)
+    # 메모리 맵으로 열어 필요한 컬럼만 실제로 읽힘
+    table = ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.select(columns) if columns else table
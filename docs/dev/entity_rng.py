@@ -0,0 +1,95 @@
+"""
+엔티티 단위 결정적 난수 스트림과 ID
+
+(시드, 시나리오, 사용자, 라운드, 홀, 샷) 같은 엔티티 경로마다 독립된 난수 스트림과 ID를 만듭니다.
+앞선 엔티티를 몇 개 생성했는지와 무관하게 경로만으로 결과가 정해지므로, 라운드 하나만 따로
+(또는 여러 프로세스에서 병렬로) 다시 만들어도 전체를 생성했을 때와 같은 값이 나옵니다.
+
+    - 난수: Philox(카운터 기반 생성기)의 키를 경로 해시로 정하고 카운터 0부터 사용
+    - ID: 시드별 네임스페이스 아래에서 경로 문자열의 uuid5
+
+경로 요소는 문자열로 바꿔 '/'로 이으므로 요소 안에 '/'가 없어야 합니다.
+"""
+
+import random
+import hashlib
+import uuid
+
+import numpy as np
+
+# 샘플 데이터 ID 네임스페이스 (바꾸면 같은 시드의 모든 ID가 달라짐)
+ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'golf_snap_userdata/sample_data')
+
+
+def entity_name(seed, *path):
+    """엔티티 경로 → 해시 입력 문자열"""
+    return '/'.join(str(part) for part in (seed,) + path)
+
+
+def entity_rng(seed, *path):
+    """엔티티 전용 numpy Generator (Philox, 키 = 경로의 128비트 해시)"""
+    digest = hashlib.blake2b(entity_name(seed, *path).encode('utf-8'), digest_size=16).digest()
+    return np.random.Generator(np.random.Philox(key=int.from_bytes(digest, 'little')))
+
+
+class EntityRandom(random.Random):
+    """
+    random.Random과 같은 인터페이스의 엔티티 전용 스트림 (expand_sample_data처럼 random API를 쓰는 코드용)
+
+    random()만 Philox에서 뽑고 uniform/randint/randrange/choice 등은 random.Random 구현을 그대로 씁니다.
+    호출마다 numpy를 부르지 않도록 BATCH개씩 미리 뽑아 둡니다.
+    """
+
+    BATCH = 256
+
+    def __init__(self, seed, *path):
+        self._generator = entity_rng(seed, *path)
+        self._buffer = []
+        super().__init__()
+
+    def seed(self, *args, **kwargs):
+        # random.Random.__init__이 호출하는 Mersenne Twister 시드 설정은 사용하지 않음
+        pass
+
+    def random(self):
+        if not self._buffer:
+            # pop()은 뒤에서 꺼내므로 뒤집어서 뽑은 순서대로 사용
+            self._buffer = self._generator.random(self.BATCH).tolist()[::-1]
+        return self._buffer.pop()
+
+    def getstate(self):
+        raise NotImplementedError("EntityRandom은 상태 저장을 지원하지 않습니다 (경로로 다시 생성)")
+
+    def setstate(self, state):
+        raise NotImplementedError("EntityRandom은 상태 저장을 지원하지 않습니다 (경로로 다시 생성)")
+
+
+def _namespace(seed):
+    return uuid.uuid5(ID_NAMESPACE, str(seed))
+
+
+def entity_uuid(seed, *path):
+    """엔티티 경로의 uuid5 문자열"""
+    return str(uuid.uuid5(_namespace(seed), entity_name(*path)))
+
+
+def entity_uuids(seed, prefix, suffixes):
+    """
+    같은 접두 경로 아래 여러 엔티티의 uuid5 (홀/샷 일괄 생성용, entity_uuid와 같은 값)
+
+    Args:
+        prefix: 공통 경로 튜플 (예: (시나리오, 라운드, 사용자, 'shot'))
+        suffixes: 엔티티별 나머지 경로 튜플 목록 (예: [(홀 번호, 샷 번호), ...])
+    """
+    # 네임스페이스 + 접두 경로까지 해시한 상태를 복사해 엔티티마다 나머지만 이어서 해시
+    head = hashlib.sha1(_namespace(seed).bytes + (entity_name(*prefix) + '/').encode('utf-8'))
+    ids = []
+    for suffix in suffixes:
+        h = head.copy()
+        h.update(entity_name(*suffix).encode('utf-8'))
+        raw = bytearray(h.digest()[:16])
+        raw[6] = (raw[6] & 0x0F) | 0x50  # version 5
+        raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+        x = raw.hex()
+        ids.append(f"{x[:8]}-{x[8:12]}-{x[12:16]}-{x[16:20]}-{x[20:]}")
+    return ids
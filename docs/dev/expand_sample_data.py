@@ -5,20 +5,33 @@
 기존 프레임워크를 전혀 수정하지 않으며, 데이터 구조를 완벽하게 유지합니다.
 
 사용법:
-    python expand_sample_data.py
+    python expand_sample_data.py [--users-per-level N] [--format json|jsonl]
+    python expand_sample_data.py --append --users-per-level 60 --levels advanced   # 상급 사용자만 60명까지 추가
 
 출력:
     - all_sample_rounds_expanded.json (확장된 데이터)
+    - <출력>.manifest.json (레벨별 사용자 수, 시드, 포맷 - --append의 기준)
     - 기존 파일은 all_sample_rounds_original.json으로 백업
 """
 
+import os
 import json
-import copy
 import random
 import uuid
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import pipeline_metrics
+from entity_rng import EntityRandom, entity_uuid, entity_uuids
+from round_io import (
+    FORMATS, LAYOUTS, detect_format, file_sha256, flatten_shots, index_path, read_rounds, summarize_holes,
+    with_layout, write_rounds,
+)
+from columnar_export import COLUMNAR_FORMATS, ColumnarWriter
+
 # 실력 레벨별 변형 계수
 SKILL_LEVELS = {
     'beginner': {
@@ -50,6 +63,12 @@ SKILL_LEVELS = {
     }
 }
 
+# 출력 파일의 레벨 순서 (레벨 → 사용자 → 원본 라운드)
+LEVEL_ORDER = ('beginner', 'intermediate', 'advanced')
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = '.manifest.json'
+
 
 def generate_user_id(skill_level, index):
     """가상 사용자 ID 생성"""
@@ -61,85 +80,99 @@ def generate_user_id(skill_level, index):
     return f"{level_prefix[skill_level]}.user{index:03d}"
 
 
-def adjust_score_distribution(original, skill_level):
-    """스코어 분포 재계산"""
-    config = SKILL_LEVELS[skill_level]
-    
-    # 원본 비율 유지하면서 조정
-    total = (original['birdies_or_better'] + original['pars'] + 
-             original['bogeys'] + original['double_bogey_or_worse'])
-    
-    if skill_level == 'beginner':
-        # 초급: 보기/더블보기 증가
-        return {
-            'birdies_or_better': max(0, original['birdies_or_better'] - 1),
-            'pars': max(0, original['pars'] - 2),
-            'bogeys': original['bogeys'] + 1,
-            'double_bogey_or_worse': original['double_bogey_or_worse'] + 2
-        }
-    elif skill_level == 'advanced':
-        # 상급: 버디/파 증가
-        return {
-            'birdies_or_better': original['birdies_or_better'] + 2,
-            'pars': original['pars'] + 2,
-            'bogeys': max(0, original['bogeys'] - 2),
-            'double_bogey_or_worse': max(0, original['double_bogey_or_worse'] - 2)
-        }
-    else:
-        # 중급: 약간의 랜덤 변동
-        return {
-            'birdies_or_better': max(0, original['birdies_or_better'] + random.randint(-1, 1)),
-            'pars': max(0, original['pars'] + random.randint(-2, 2)),
-            'bogeys': max(0, original['bogeys'] + random.randint(-1, 1)),
-            'double_bogey_or_worse': max(0, original['double_bogey_or_worse'] + random.randint(-1, 1))
-        }
-
-
-def transform_hole(hole, skill_level, new_round_id):
-    """홀 데이터 변형"""
-    new_hole = copy.deepcopy(hole)
-    config = SKILL_LEVELS[skill_level]
+def new_uuid(rng=None):
+    """UUID4 문자열 생성 (rng가 random 모듈이 아니면 해당 스트림에서 재현 가능하게 생성)"""
+    if rng is None or rng is random:
+        return str(uuid.uuid4())
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def round_key(seed, skill_level, user_index, round_index):
+    """(실력 레벨, 사용자, 원본 라운드 순번) 엔티티 키 - 라운드 전용 난수 스트림과 ID의 기준"""
+    return (seed, 'expand', skill_level, user_index, round_index)
+
+
+def distribute_adjustment(total, count, rng):
+    """라운드 단위 조정값(total)을 합이 total인 홀별 정수 조정값 count개로 분배"""
+    adjustments = [0] * count
+    if not count:
+        return adjustments
+    step = 1 if total > 0 else -1
+    for _ in range(abs(total)):
+        adjustments[rng.randrange(count)] += step
+    return adjustments
+
+
+def flag_probabilities(flags, mult):
+    """
+    홀별 True/False 플래그(페어웨이, GIR)를 mult배로 바꾸기 위한 확률
+
+    Returns:
+        (keep_prob, gain_prob) - 원래 True인 홀이 True로 남을 확률,
+        원래 False인 홀이 True가 될 확률. 기대 True 개수 = 원래 개수 × mult
+    """
+    hits = sum(1 for flag in flags if flag)
+    misses = len(flags) - hits
+    keep_prob = min(1.0, mult)
+    gain_prob = 0.0
+    if mult > 1 and misses:
+        gain_prob = min(1.0, (mult - 1) * hits / misses)
+    return keep_prob, gain_prob
+
+
+def transform_hole(hole, new_round_id, rng=None, stroke_adjust=0, putt_adjust=0,
+                   fairway_probs=(1.0, 0.0), gir_probs=(1.0, 0.0), hole_score_id=None):
+    """
+    홀 데이터 변형
+
+    Args:
+        stroke_adjust, putt_adjust: 이 홀에 분배된 타수/퍼팅 조정값
+        fairway_probs, gir_probs: flag_probabilities의 (keep_prob, gain_prob)
+        hole_score_id: 새 ID (None이면 rng에서 UUID4 생성)
+    """
+    rng = rng or random
+    # 홀은 평평한 레코드이므로 얕은 복사 후 변경할 키만 덮어씀
+    new_hole = dict(hole)
+    if 'penalty_details' in hole:
+        new_hole['penalty_details'] = list(hole['penalty_details'])
     
     # ID 갱신
-    new_hole['hole_score_id'] = str(uuid.uuid4())
+    new_hole['hole_score_id'] = hole_score_id or new_uuid(rng)
     new_hole['round_id'] = new_round_id
     
-    # 스트로크 조정
-    stroke_adjust = random.randint(*config['score_adjust']) // 18
-    new_hole['strokes'] = max(new_hole['par'], new_hole['strokes'] + stroke_adjust)
-    
-    # 퍼팅 조정
-    putt_adjust = random.randint(*config['putt_adjust']) // 18
+    # 퍼팅 조정 (최소 1개)
     new_hole['putts'] = max(1, new_hole['putts'] + putt_adjust)
     
+    # 스트로크 조정 (퍼팅 외 최소 1타)
+    new_hole['strokes'] = max(new_hole['putts'] + 1, new_hole['strokes'] + stroke_adjust)
+    
     # 페어웨이/GIR 조정
+    def adjust_flag(flag, probs):
+        keep_prob, gain_prob = probs
+        return rng.random() < (keep_prob if flag else gain_prob)
+    
     if new_hole['par'] >= 4:  # Par 3는 페어웨이 없음
-        if random.random() < config['fairway_mult']:
-            new_hole['fairway_hit'] = True
-        else:
-            new_hole['fairway_hit'] = False
+        new_hole['fairway_hit'] = adjust_flag(hole.get('fairway_hit'), fairway_probs)
     
-    if random.random() < config['gir_mult']:
-        new_hole['green_in_regulation'] = True
-    else:
-        new_hole['green_in_regulation'] = False
+    new_hole['green_in_regulation'] = adjust_flag(hole.get('green_in_regulation'), gir_probs)
     
     return new_hole
 
 
-def transform_shot(shot, skill_level, new_user_id):
-    """샷 데이터 변형"""
-    new_shot = copy.deepcopy(shot)
+def transform_shot(shot, skill_level, new_user_id, rng=None, shot_id=None):
+    """샷 데이터 변형 (shot_id가 None이면 rng에서 UUID4 생성)"""
+    rng = rng or random
+    new_shot = dict(shot)  # 샷은 평평한 레코드 (중첩 값 없음)
     config = SKILL_LEVELS[skill_level]
     
     # ID 갱신
-    new_shot['shot_id'] = str(uuid.uuid4())
+    new_shot['shot_id'] = shot_id or new_uuid(rng)
     new_shot['user_id'] = new_user_id
     
     # 드라이버 샷 변형
     if new_shot['club_type'] == 'CLUB_D' and new_shot['TOTAL']:
         mult = config['driver_dist_mult']
-        variation = random.uniform(0.95, 1.05)  # ±5% 랜덤 변동
+        variation = rng.uniform(0.95, 1.05)  # ±5% 랜덤 변동
         
         new_shot['TOTAL'] = round(new_shot['TOTAL'] * mult * variation, 2)
         if new_shot['CARRY']:
@@ -154,7 +187,7 @@ def transform_shot(shot, skill_level, new_user_id):
     # 퍼팅 성공률 조정
     if new_shot['is_putt']:
         success_mult = config['putt_success_mult']
-        if random.random() < success_mult:
+        if rng.random() < success_mult:
             # 성공률 향상
             if new_shot['putt_length'] and new_shot['putt_length'] < 3:
                 new_shot['putt_made'] = True
@@ -166,13 +199,30 @@ def transform_shot(shot, skill_level, new_user_id):
     return new_shot
 
 
-def transform_round(round_data, skill_level, user_index):
-    """라운드 데이터 전체 변형"""
-    new_round = copy.deepcopy(round_data)
+def transform_round(round_data, skill_level, user_index, rng=None, id_key=None):
+    """
+    라운드 데이터 전체 변형
+
+    rng(random.Random)를 넘기면 모든 난수를 해당 스트림에서 뽑습니다.
+    id_key=(seed, *경로)를 넘기면 라운드/홀/샷 ID를 경로 기반 uuid5로 만들고,
+    없으면 rng에서 UUID4를 뽑습니다.
+    """
+    rng = rng or random
+    # 얕은 복사: holes/shots는 아래에서 새 리스트로 교체 (키 순서 유지)
+    new_round = dict(round_data)
     config = SKILL_LEVELS[skill_level]
+    holes = round_data['holes']
     
     # 새 ID 생성
-    new_round_id = str(uuid.uuid4())
+    if id_key is None:
+        new_round_id = new_uuid(rng)
+        hole_ids = [None] * len(holes)
+        shot_ids = [None] * len(round_data['shots'])
+    else:
+        seed, path = id_key[0], id_key[1:]
+        new_round_id = entity_uuid(seed, *path, 'round')
+        hole_ids = entity_uuids(seed, path + ('hole',), [(i,) for i in range(len(holes))])
+        shot_ids = entity_uuids(seed, path + ('shot',), [(i,) for i in range(len(round_data['shots']))])
     new_user_id = generate_user_id(skill_level, user_index)
     
     # 기본 정보 갱신
@@ -181,42 +231,34 @@ def transform_round(round_data, skill_level, user_index):
     
     # 날짜 랜덤 조정 (최근 6개월 내)
     base_date = datetime.fromisoformat(round_data['played_at'].replace('Z', '+00:00'))
-    days_offset = random.randint(-180, 0)
+    days_offset = rng.randint(-180, 0)
     new_date = base_date + timedelta(days=days_offset)
     new_round['played_at'] = new_date.isoformat()
     if 'play_end_time' in new_round:
         end_date = base_date + timedelta(days=days_offset, hours=5)
         new_round['play_end_time'] = end_date.isoformat()
     
-    # 스코어 조정
-    score_adjust = random.randint(*config['score_adjust'])
-    new_round['total_score'] = max(new_round['total_par'], new_round['total_score'] + score_adjust)
-    
-    # 페어웨이 조정
-    new_fairways = int(new_round['fairways_hit'] * config['fairway_mult'])
-    new_round['fairways_hit'] = max(0, min(new_fairways, new_round['fairways_attempted']))
+    # 라운드 단위 스코어/퍼팅 조정값을 홀에 분배
+    stroke_adjusts = distribute_adjustment(rng.randint(*config['score_adjust']), len(holes), rng)
+    putt_adjusts = distribute_adjustment(rng.randint(*config['putt_adjust']), len(holes), rng)
     
-    # GIR 조정
-    new_gir = int(new_round['greens_in_regulation'] * config['gir_mult'])
-    new_round['greens_in_regulation'] = max(0, min(new_gir, 18))
-    
-    # 퍼팅 조정
-    putt_adjust = random.randint(*config['putt_adjust'])
-    new_round['total_putts'] = max(18, new_round['total_putts'] + putt_adjust)
-    
-    # 스코어 분포 재계산
-    score_dist = adjust_score_distribution(new_round, skill_level)
-    new_round['birdies_or_better'] = score_dist['birdies_or_better']
-    new_round['pars'] = score_dist['pars']
-    new_round['bogeys'] = score_dist['bogeys']
-    new_round['double_bogey_or_worse'] = score_dist['double_bogey_or_worse']
+    # 페어웨이/GIR은 원본 적중 수 × 배율이 기대값이 되도록 홀별로 조정
+    fairway_probs = flag_probabilities(
+        [hole.get('fairway_hit') for hole in holes if hole['par'] >= 4], config['fairway_mult']
+    )
+    gir_probs = flag_probabilities(
+        [hole.get('green_in_regulation') for hole in holes], config['gir_mult']
+    )
     
     # 홀 데이터 변형
     new_round['holes'] = [
-        transform_hole(hole, skill_level, new_round_id)
-        for hole in new_round['holes']
+        transform_hole(hole, new_round_id, rng, stroke_adjust, putt_adjust, fairway_probs, gir_probs, hole_id)
+        for hole, stroke_adjust, putt_adjust, hole_id in zip(holes, stroke_adjusts, putt_adjusts, hole_ids)
     ]
     
+    # 라운드 집계값은 변형된 홀에서 다시 계산 (홀 합계와 항상 일치)
+    new_round.update(summarize_holes(new_round['holes']))
+    
     # 샷 데이터 변형 및 hole_score_id 매핑
     hole_id_map = {
         old['hole_score_id']: new['hole_score_id']
@@ -224,15 +266,168 @@ def transform_round(round_data, skill_level, user_index):
     }
     
     new_round['shots'] = []
-    for shot in round_data['shots']:
-        new_shot = transform_shot(shot, skill_level, new_user_id)
+    for shot, shot_id in zip(round_data['shots'], shot_ids):
+        new_shot = transform_shot(shot, skill_level, new_user_id, rng, shot_id)
         new_shot['hole_score_id'] = hole_id_map[shot['hole_score_id']]
         new_round['shots'].append(new_shot)
     
     return new_round
 
 
-def expand_sample_data(input_file, output_file, users_per_level=10):
+def expand_user(base_rounds, skill_level, user_index, seed=None):
+    """
+    사용자 한 명분의 변형 라운드 생성 (병렬 작업 단위)
+
+    seed가 주어지면 라운드마다 round_key 전용 난수 스트림과 uuid5 ID를 사용하므로
+    작업이 어느 프로세스에서 실행되든, 라운드 하나만 다시 만들든 결과가 같습니다.
+    """
+    if seed is None:
+        return [transform_round(round_data, skill_level, user_index) for round_data in base_rounds]
+    rounds = []
+    for round_index, round_data in enumerate(base_rounds):
+        key = round_key(seed, skill_level, user_index, round_index)
+        rounds.append(transform_round(round_data, skill_level, user_index, EntityRandom(*key), id_key=key))
+    return rounds
+
+
+# 작업 프로세스별 원본 라운드 (initializer에서 한 번만 전달)
+_worker_base_rounds = None
+
+
+def _init_worker(base_rounds, collect_metrics=False):
+    global _worker_base_rounds
+    _worker_base_rounds = base_rounds
+    pipeline_metrics.init_worker(collect_metrics)
+
+
+def _expand_user_task(task):
+    """사용자 한 명 변형 → (라운드 목록, 작업 프로세스 계측 스냅샷 또는 None)"""
+    skill_level, user_index, seed = task
+    with pipeline_metrics.stage('transform'):
+        rounds = expand_user(_worker_base_rounds, skill_level, user_index, seed)
+    return rounds, pipeline_metrics.drain()
+
+
+def _iter_parallel(base_rounds, tasks, workers):
+    """작업을 프로세스 풀에 분배하고 결과를 작업 순서대로 반환 (진행 중 작업 수 제한)"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(base_rounds, pipeline_metrics.active() is not None)) as executor:
+        pending = deque()
+        task_iter = iter(tasks)
+        for task in task_iter:
+            pending.append(executor.submit(_expand_user_task, task))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            rounds, metrics = pending.popleft().result()
+            pipeline_metrics.merge(metrics)
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(executor.submit(_expand_user_task, next_task))
+            yield rounds
+
+
+def level_counts(users_per_level):
+    """정수(모든 레벨 같은 수) 또는 {레벨: 사용자 수} → 레벨 순서의 {레벨: 사용자 수}"""
+    if isinstance(users_per_level, int):
+        return {skill_level: users_per_level for skill_level in LEVEL_ORDER}
+    return {skill_level: users_per_level.get(skill_level, 0) for skill_level in LEVEL_ORDER}
+
+
+def iter_expanded_rounds(base_rounds, users_per_level, seed=None, workers=1, existing=None):
+    """
+    실력 레벨 × 사용자 × 원본 라운드 순서로 변형 라운드를 하나씩 생성 (제너레이터)
+
+    Args:
+        base_rounds: 원본 라운드 리스트
+        users_per_level: 실력 레벨당 사용자 수 (정수 또는 {레벨: 수})
+        seed: 마스터 시드 (None이면 전역 random 사용)
+        workers: 병렬 프로세스 수 (1이면 현재 프로세스에서 실행)
+        existing: {레벨: 이미 만든 사용자 수} - 주면 그 다음 번호부터 users_per_level까지만 생성 (append)
+    """
+    targets = level_counts(users_per_level)
+    existing = existing or {}
+    tasks = [
+        (skill_level, user_index, seed)
+        for skill_level in LEVEL_ORDER
+        for user_index in range(existing.get(skill_level, 0) + 1, targets[skill_level] + 1)
+    ]
+    
+    # 병렬이면 메인 프로세스는 결과를 기다리는 시간, 작업 프로세스가 'transform' 시간을 기록
+    if workers > 1:
+        results = pipeline_metrics.timed('wait_workers', _iter_parallel(base_rounds, tasks, workers))
+    else:
+        results = pipeline_metrics.timed('transform', (expand_user(base_rounds, *task) for task in tasks))
+    
+    # 병렬 실행이어도 작업 순서대로 병합되므로 출력 순서는 항상 같음
+    for (skill_level, user_index, _), rounds in zip(tasks, results):
+        if user_index == existing.get(skill_level, 0) + 1:
+            print(f"\n   [{SKILL_LEVELS[skill_level]['name']}] 데이터 생성 중...")
+        yield from rounds
+        print(f"      사용자 {user_index}/{targets[skill_level]} 완료")
+
+
+def manifest_path(output_file):
+    """확장 데이터 파일 옆 매니페스트 경로"""
+    return f"{output_file}{MANIFEST_SUFFIX}"
+
+
+def load_manifest(output_file, input_file):
+    """
+    --append 기준이 되는 기존 출력의 매니페스트 읽기 및 확인
+
+    매니페스트가 없거나, 출력 파일 크기가 기록 당시와 다르거나(다른 도구가 수정 / 이어 쓰기 중단),
+    원본 파일 내용이 바뀌었으면 ValueError (이어 쓰면 사용자 구성이 섞이므로 전체 재생성 필요)
+    """
+    path = manifest_path(output_file)
+    if not os.path.exists(path):
+        raise ValueError(f"매니페스트가 없습니다: {path} (--append 없이 전체 생성 필요)")
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전: {manifest.get('version')}")
+    if not os.path.exists(output_file) or os.path.getsize(output_file) != manifest['size']:
+        raise ValueError(f"출력 파일이 매니페스트 기록 이후 바뀌었습니다: {output_file}")
+    if file_sha256(input_file) != manifest['input_sha256']:
+        raise ValueError(f"원본 파일이 매니페스트의 원본과 다릅니다: {input_file}")
+    return manifest
+
+
+def write_manifest(output_file, input_file, base_rounds, counts, seed, output_format, layout, index,
+                   total_rounds, previous=None):
+    """확장 결과 매니페스트 기록 (previous가 있으면 생성 시각은 유지하고 갱신 시각만 바꿈)"""
+    now = datetime.now().isoformat(timespec='seconds')
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'generated_at': previous['generated_at'] if previous else now,
+        'updated_at': now,
+        'data_file': os.path.basename(output_file),
+        'format': output_format,
+        'layout': layout,
+        'index': index,
+        'seed': seed,
+        'input_file': os.path.basename(input_file),
+        'input_sha256': file_sha256(input_file),
+        'base_rounds': len(base_rounds),
+        # 사용자 번호는 레벨마다 1부터 연속이므로 max_user_index = 사용자 수
+        'levels': {
+            skill_level: {'users': count, 'max_user_index': count}
+            for skill_level, count in counts.items()
+        },
+        'rounds': total_rounds,
+        'size': os.path.getsize(output_file),
+    }
+    path = manifest_path(output_file)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def expand_sample_data(input_file, output_file, users_per_level=10, output_format=None,
+                       seed=None, workers=1, columnar_dir=None, columnar_format='parquet', layout='flat',
+                       index=False, levels=LEVEL_ORDER, manifest=None):
     """
     샘플 데이터 확장
     
@@ -240,50 +435,70 @@ def expand_sample_data(input_file, output_file, users_per_level=10):
         input_file: 원본 데이터 파일 경로
         output_file: 출력 파일 경로
         users_per_level: 실력 레벨당 생성할 사용자 수
+        output_format: 'json' 또는 'jsonl' (None이면 출력 파일 확장자로 판별)
+        seed: 마스터 시드 (사용자별 난수 스트림의 기준)
+        workers: 병렬 프로세스 수
+        columnar_dir: 지정하면 rounds/holes/shots 컬럼형 테이블도 이 디렉터리에 기록
+        columnar_format: 'parquet' 또는 'arrow'
+        layout: 샷 배치 'flat' / 'ranged' / 'nested' (round_io 참고)
+        index: True면 <출력>.idx.json 사용자 인덱스도 기록 (jsonl 전용)
+        levels: users_per_level을 적용할 실력 레벨 (나머지 레벨은 기존 사용자 수 유지, 새로 만들면 0명)
+        manifest: 기존 출력의 매니페스트(load_manifest). 주면 레벨별로 기존 사용자 다음 번호부터
+                  users_per_level까지만 만들어 출력 파일 끝에 덧붙임 (기존 라운드는 다시 직렬화하지 않음)
     """
+    output_format = output_format or detect_format(output_file)
+    existing = {}
+    if manifest is not None:
+        existing = {skill_level: info['users'] for skill_level, info in manifest['levels'].items()}
+    # 사용자는 줄이지 않음 (목표가 기존보다 작으면 그대로)
+    counts = {
+        skill_level: max(existing.get(skill_level, 0), users_per_level if skill_level in levels else 0)
+        for skill_level in LEVEL_ORDER
+    }
+    new_users = sum(counts[skill_level] - existing.get(skill_level, 0) for skill_level in LEVEL_ORDER)
+
     print("=" * 60)
     print("골프 샘플 데이터 확장 스크립트")
     print("=" * 60)
     
     # 원본 데이터 로드
     print(f"\n1. 원본 데이터 로딩: {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        base_rounds = json.load(f)
+    with pipeline_metrics.stage('read_input'):
+        base_rounds = [flatten_shots(round_data) for round_data in read_rounds(input_file)]
     
     print(f"   ✓ 원본 라운드 수: {len(base_rounds)}개")
     
-    # 확장 데이터 생성
-    print(f"\n2. 데이터 확장 중...")
+    # 확장 데이터 생성 - 라운드를 하나씩 만들어 바로 기록 (메모리 사용량 일정)
+    print(f"\n2. 데이터 확장 및 {'이어 쓰기' if manifest else '저장'} 중: {output_file}")
     print(f"   - 실력 레벨: 3단계 (초급/중급/상급)")
-    print(f"   - 레벨당 사용자: {users_per_level}명")
-    print(f"   - 예상 총 라운드: {len(base_rounds) * 3 * users_per_level}개")
-    
-    expanded_rounds = []
-    user_counter = {'beginner': 1, 'intermediate': 1, 'advanced': 1}
+    for skill_level in LEVEL_ORDER:
+        before = existing.get(skill_level, 0)
+        added = f" (기존 {before}명 + {counts[skill_level] - before}명)" if manifest else ""
+        print(f"   - {SKILL_LEVELS[skill_level]['name']} 사용자: {counts[skill_level]}명{added}")
+    print(f"   - 예상 {'추가 ' if manifest else '총 '}라운드: {len(base_rounds) * new_users}개")
+    if workers > 1:
+        if seed is None:
+            # 병렬 실행은 항상 사용자별 스트림을 쓰므로, 시드가 없으면 하나 정해서 알려줌
+            seed = random.SystemRandom().randrange(2 ** 32)
+        print(f"   - 병렬 프로세스: {workers}개")
+    if seed is not None:
+        print(f"   - 시드: {seed}")
+    
+    rounds = with_layout(iter_expanded_rounds(base_rounds, counts, seed=seed, workers=workers, existing=existing),
+                         layout)
+    if columnar_dir:
+        # 같은 라운드 스트림을 JSON과 컬럼형 테이블에 동시에 기록
+        with ColumnarWriter(columnar_dir, fmt=columnar_format) as columnar:
+            written = write_rounds(columnar.tee(rounds), output_file, fmt=output_format, index=index)
+    else:
+        written = write_rounds(rounds, output_file, fmt=output_format, index=index, append=manifest is not None)
+    total_rounds = written + (manifest['rounds'] if manifest else 0)
+    # 이어 쓰기의 seed는 매니페스트 값이고, 시드 없는 매니페스트에 병렬로 덧붙이면 위에서 정한 시드를 기록
+    written_manifest = write_manifest(output_file, input_file, base_rounds, counts, seed, output_format, layout,
+                                      index, total_rounds, previous=manifest)
     
-    for skill_level in ['beginner', 'intermediate', 'advanced']:
-        level_name = SKILL_LEVELS[skill_level]['name']
-        print(f"\n   [{level_name}] 데이터 생성 중...")
-        
-        for user_idx in range(users_per_level):
-            for round_data in base_rounds:
-                new_round = transform_round(
-                    round_data,
-                    skill_level,
-                    user_counter[skill_level]
-                )
-                expanded_rounds.append(new_round)
-            
-            user_counter[skill_level] += 1
-            print(f"      사용자 {user_idx + 1}/{users_per_level} 완료")
-    
-    print(f"\n   ✓ 총 생성된 라운드: {len(expanded_rounds)}개")
-    print(f"   ✓ 총 사용자 수: {sum(user_counter.values()) - 3}명")
-    
-    # 데이터 저장
-    print(f"\n3. 데이터 저장 중: {output_file}")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(expanded_rounds, f, ensure_ascii=False, indent=2)
+    print(f"\n   ✓ {'새로 덧붙인' if manifest else '총 생성된'} 라운드: {written}개")
+    print(f"   ✓ 총 사용자 수: {sum(counts.values())}명")
     
     # 파일 크기 확인
     file_size = Path(output_file).stat().st_size / (1024 * 1024)
@@ -294,13 +509,20 @@ def expand_sample_data(input_file, output_file, users_per_level=10):
     print("생성 완료!")
     print("=" * 60)
     print(f"\n📊 통계 요약:")
-    print(f"   - 초급 사용자: {users_per_level}명 × {len(base_rounds)}라운드 = {users_per_level * len(base_rounds)}개")
-    print(f"   - 중급 사용자: {users_per_level}명 × {len(base_rounds)}라운드 = {users_per_level * len(base_rounds)}개")
-    print(f"   - 상급 사용자: {users_per_level}명 × {len(base_rounds)}라운드 = {users_per_level * len(base_rounds)}개")
-    print(f"   - 총계: {len(expanded_rounds)}개 라운드")
+    for skill_level in LEVEL_ORDER:
+        count = counts[skill_level]
+        print(f"   - {SKILL_LEVELS[skill_level]['name']} 사용자: {count}명 × {len(base_rounds)}라운드 = "
+              f"{count * len(base_rounds)}개")
+    print(f"   - 총계: {total_rounds}개 라운드")
     
     print(f"\n📁 출력 파일: {output_file}")
     print(f"   파일 크기: {file_size:.2f} MB")
+    print(f"   매니페스트: {manifest_path(output_file)} (시드 {written_manifest['seed']})")
+    if index:
+        print(f"   사용자 인덱스: {index_path(output_file)}")
+    if columnar_dir:
+        for path in columnar.paths.values():
+            print(f"   {path}: {Path(path).stat().st_size / (1024 * 1024):.2f} MB")
     
     print("\n✅ 다음 단계:")
     print("   1. 기존 파일 백업:")
@@ -309,23 +531,105 @@ def expand_sample_data(input_file, output_file, users_per_level=10):
     print("      mv assets/data/all_sample_rounds_expanded.json assets/data/all_sample_rounds.json")
 
 
+def parse_args(project_root):
+    parser = argparse.ArgumentParser(description="골프 샘플 데이터 확장")
+    parser.add_argument("--input", type=Path,
+                        default=project_root / "assets" / "data" / "all_sample_rounds.json",
+                        help="원본 라운드 파일 (.json 또는 .jsonl)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="출력 파일 (기본: assets/data/all_sample_rounds_expanded.<format>)")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="출력 포맷 (기본: 출력 파일 확장자, 없으면 json)")
+    # users_per_level을 조정하여 데이터 양 조절 가능 (기본: 10명)
+    parser.add_argument("--users-per-level", type=int, default=10,
+                        help="실력 레벨당 사용자 수 (기본: 10명 = 총 30명)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="마스터 시드 (같은 시드면 --workers 값과 무관하게 같은 결과, ID는 엔티티 경로의 uuid5)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="병렬 프로세스 수 (기본: 1)")
+    parser.add_argument("--layout", choices=LAYOUTS, default=None,
+                        help="샷 배치: flat(기본) / ranged(홀별 shot_start~shot_end) / nested(홀 안에 샷)")
+    parser.add_argument("--index", action="store_true",
+                        help="<출력>.idx.json 사용자 인덱스(user_id → played_at 순 바이트 오프셋)도 기록 (jsonl 전용)")
+    parser.add_argument("--levels", default=",".join(LEVEL_ORDER), metavar="LEVEL[,LEVEL...]",
+                        help="--users-per-level을 적용할 실력 레벨 (기본: beginner,intermediate,advanced)")
+    parser.add_argument("--append", action="store_true",
+                        help="<출력>.manifest.json 기준으로 레벨별 부족한 사용자만 생성해 기존 출력 끝에 덧붙임 "
+                             "(시드 · 포맷 · 배치는 매니페스트 값 사용)")
+    parser.add_argument("--columnar", type=Path, default=None, metavar="DIR",
+                        help="rounds/holes/shots 컬럼형 테이블도 함께 기록할 디렉터리 (pyarrow 필요)")
+    parser.add_argument("--columnar-format", choices=COLUMNAR_FORMATS, default="parquet",
+                        help="컬럼형 테이블 포맷: parquet 또는 arrow(IPC)")
+    pipeline_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    args.levels = tuple(level.strip() for level in args.levels.split(",") if level.strip())
+    unknown = [level for level in args.levels if level not in SKILL_LEVELS]
+    if unknown:
+        parser.error(f"알 수 없는 실력 레벨: {', '.join(unknown)} (선택: {', '.join(LEVEL_ORDER)})")
+    if args.append and args.columnar:
+        parser.error("--append는 --columnar와 함께 쓸 수 없습니다 (컬럼형 테이블은 전체 생성으로 다시 기록)")
+    pipeline_metrics.enable_from_args(parser, args)
+    return args
+
+
 if __name__ == "__main__":
     # 파일 경로 설정
     script_dir = Path(__file__).parent
     project_root = script_dir.parent.parent
+    args = parse_args(project_root)
     
-    input_file = project_root / "assets" / "data" / "all_sample_rounds.json"
-    output_file = project_root / "assets" / "data" / "all_sample_rounds_expanded.json"
+    input_file = args.input
+    output_format = args.format or (detect_format(args.output) if args.output else 'json')
+    output_file = args.output or (
+        project_root / "assets" / "data" / f"all_sample_rounds_expanded.{output_format}"
+    )
     
     # 파일 존재 확인
     if not input_file.exists():
         print(f"❌ 오류: 입력 파일을 찾을 수 없습니다: {input_file}")
         exit(1)
     
+    # 이어 쓰기: 시드 / 포맷 / 배치 / 인덱스는 기존 출력의 매니페스트를 따름 (다르게 지정하면 오류)
+    manifest = None
+    seed = args.seed
+    layout = args.layout or 'flat'
+    index = args.index
+    if args.append:
+        try:
+            manifest = load_manifest(str(output_file), str(input_file))
+        except ValueError as e:
+            print(f"❌ 오류: {e}")
+            exit(1)
+        conflicts = [
+            f"{name} {value} (매니페스트: {manifest[key]})"
+            for name, key, value in (('--seed', 'seed', args.seed), ('--format', 'format', args.format),
+                                     ('--layout', 'layout', args.layout))
+            if value is not None and value != manifest[key]
+        ]
+        if conflicts:
+            print(f"❌ 오류: 기존 출력과 다른 설정으로 이어 쓸 수 없습니다: {', '.join(conflicts)}")
+            exit(1)
+        seed, output_format, layout = manifest['seed'], manifest['format'], manifest['layout']
+        index = index or manifest['index']
+    
+    if index and output_format != 'jsonl':
+        print("❌ 오류: --index는 jsonl 출력에서만 사용할 수 있습니다 (--format jsonl)")
+        exit(1)
+    
     # 데이터 확장 실행
-    # users_per_level을 조정하여 데이터 양 조절 가능 (기본: 10명)
     expand_sample_data(
         input_file=str(input_file),
         output_file=str(output_file),
-        users_per_level=10  # 레벨당 10명 = 총 30명
+        users_per_level=args.users_per_level,
+        output_format=output_format,
+        seed=seed,
+        workers=args.workers,
+        columnar_dir=str(args.columnar) if args.columnar else None,
+        columnar_format=args.columnar_format,
+        layout=layout,
+        index=index,
+        levels=args.levels,
+        manifest=manifest,
     )
+    if args.metrics:
+        pipeline_metrics.finish(args.metrics)
@@ -0,0 +1,418 @@
+"""
+벤치마크 통계 사전 계산 스크립트
+
+생성된 라운드 파일을 한 번 스트리밍으로 읽어 benchmark_stats.json을 만듭니다.
+앱의 BenchmarkRepository.calculateBenchmark가 화면 로딩마다 전체 라운드로 계산하던
+overall / top10 / bottom10 집계와 분포를 미리 계산해 두므로, 앱은 수 KB 파일만 읽으면 됩니다.
+
+계산 방식은 BenchmarkRepository와 같습니다.
+    - top10 / bottom10: 스코어 순 정렬 후 ceil(라운드 수 × 10%)개
+    - fairwayAccuracy / girPercentage: 라운드별 비율(%)의 평균
+    - driverDistance: 멀리건이 아닌 CLUB_D 샷의 TOTAL 평균
+    - threePuttRate: 3퍼트 이상 홀 / (라운드 수 × 18)
+    - puttingByDistance: putt_length 구간(≤1, ≤3, ≤5, ≤10, 그 이상)별 성공률
+분포는 전체 값 목록 대신 고정 구간 히스토그램으로 저장합니다.
+
+라운드마다 집계에 필요한 합계를 한 행(ROUND_SUM_FIELDS)으로 만들어 두고,
+어떤 라운드 묶음의 통계든 행 합계 하나로 계산합니다 (NumPy 벡터 연산).
+
+함께 만드는 benchmark_score_bands.json은 정수 스코어마다의 합계 행과 분포를
+누적합(prefix sum)으로 저장합니다. calculateBenchmarkForScoreRange처럼
+"목표 스코어 ± 허용치" 구간의 벤치마크가 필요할 때, 라운드를 다시 거르지 않고
+누적합 두 행의 차이로 구간 합계를 얻습니다 (query_score_range).
+이때 top10 / bottom10은 경계 스코어를 비율로 나눈 근사값입니다 (tailApproximate).
+
+benchmark_sketches.json에는 지표별 KLL 분위수 스케치(quantile_sketch.py)를 저장합니다.
+샤드별로 만든 파일은 `quantile_sketch.py merge`로 합칠 수 있고, 전체 값 목록 없이
+수 KB 상태로 퍼센타일 순위를 계산합니다.
+
+사용법:
+    python generate_benchmark_data.py [--input ../../assets/data/all_sample_rounds.json] [--output ...]
+    python generate_benchmark_data.py --query 88 5   # 저장된 스코어 구간 파일로 88±5 벤치마크 조회
+"""
+
+import json
+import math
+import time
+import argparse
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+from round_io import FORMATS, flatten_shots, iter_rounds
+from quantile_sketch import DEFAULT_K, KLLSketch, save_sketches
+
+DRIVER_CLUB = 'CLUB_D'
+
+# 퍼팅 거리 구간 (상한 포함, 마지막 구간은 10m 초과)
+PUTT_BINS = ['0-1m', '1-3m', '3-5m', '5-10m', '10m+']
+PUTT_EDGES = np.array([1.0, 3.0, 5.0, 10.0])
+
+# 라운드별 합계 행의 컬럼
+ROUND_SUM_FIELDS = (
+    ['rounds', 'score', 'fairway_pct', 'gir_pct', 'putts', 'three_putt_holes', 'driver_sum', 'driver_count']
+    + [f'putt_attempts_{i}' for i in range(len(PUTT_BINS))]
+    + [f'putt_made_{i}' for i in range(len(PUTT_BINS))]
+)
+_COL = {name: i for i, name in enumerate(ROUND_SUM_FIELDS)}
+_PUTT_ATTEMPTS = _COL['putt_attempts_0']
+_PUTT_MADE = _COL['putt_made_0']
+
+# 분포 히스토그램 구간: (시작값, 구간 폭, 구간 수). 범위 밖 값은 양 끝 구간에 포함
+HISTOGRAM_BINS = {
+    'score': (50, 1, 100),
+    'fairway': (0, 5, 21),
+    'gir': (0, 5, 21),
+    'putts': (10, 1, 50),
+    'driver': (100, 5, 60),
+}
+
+# 스코어 구간별 통계 폭 (70-79, 80-89, ...)
+SCORE_BAND_WIDTH = 10
+
+HOLES_PER_ROUND = 18
+
+
+def load_round_columns(input_file, fmt=None):
+    """
+    라운드 파일을 스트리밍으로 읽어 라운드별 합계 행렬과 분포용 값을 만듭니다.
+
+    Returns:
+        {
+            'sums': (라운드 수, len(ROUND_SUM_FIELDS)) float64 행렬,
+            'score' / 'fairway' / 'gir' / 'putts': 라운드별 값,
+            'driver': CLUB_D 샷 TOTAL 값 (분포용, BenchmarkRepository처럼 멀리건 포함),
+            'driver_round': driver 값의 라운드 인덱스,
+            'users': 사용자 수,
+        }
+    """
+    scores, fairways_hit, fairways_attempted, girs, putts, three_putts = [], [], [], [], [], []
+    putt_round, putt_length, putt_made = [], [], []
+    driver_round, driver_total, driver_counted = [], [], []
+    users = set()
+
+    for index, round_data in enumerate(iter_rounds(input_file, fmt)):
+        round_data = flatten_shots(round_data)
+        users.add(round_data.get('user_id'))
+        scores.append(round_data['total_score'])
+        fairways_hit.append(round_data['fairways_hit'])
+        fairways_attempted.append(round_data['fairways_attempted'])
+        girs.append(round_data['greens_in_regulation'])
+        putts.append(round_data['total_putts'])
+        three_putts.append(sum(1 for hole in round_data['holes'] if hole['putts'] >= 3))
+
+        for shot in round_data['shots']:
+            if shot['is_putt'] and shot.get('putt_length') is not None:
+                putt_round.append(index)
+                putt_length.append(shot['putt_length'])
+                putt_made.append(bool(shot.get('putt_made')))
+            elif shot['club_type'] == DRIVER_CLUB and shot.get('TOTAL') is not None:
+                driver_round.append(index)
+                driver_total.append(shot['TOTAL'])
+                driver_counted.append(not shot['is_mulligan'])
+
+    n = len(scores)
+    score = np.array(scores, dtype=np.float64)
+    fairways_attempted = np.array(fairways_attempted, dtype=np.float64)
+    fairway = np.divide(np.array(fairways_hit, dtype=np.float64) * 100, fairways_attempted,
+                        out=np.zeros(n), where=fairways_attempted > 0)
+    gir = np.array(girs, dtype=np.float64) / HOLES_PER_ROUND * 100
+    putts = np.array(putts, dtype=np.float64)
+
+    sums = np.zeros((n, len(ROUND_SUM_FIELDS)))
+    sums[:, _COL['rounds']] = 1
+    sums[:, _COL['score']] = score
+    sums[:, _COL['fairway_pct']] = fairway
+    sums[:, _COL['gir_pct']] = gir
+    sums[:, _COL['putts']] = putts
+    sums[:, _COL['three_putt_holes']] = three_putts
+
+    driver_round = np.array(driver_round, dtype=np.int64)
+    driver_total = np.array(driver_total, dtype=np.float64)
+    counted = np.array(driver_counted, dtype=bool)
+    sums[:, _COL['driver_sum']] = np.bincount(driver_round[counted], weights=driver_total[counted], minlength=n)
+    sums[:, _COL['driver_count']] = np.bincount(driver_round[counted], minlength=n)
+
+    # (라운드, 거리 구간) 쌍을 평탄화한 인덱스로 한 번에 집계
+    putt_round = np.array(putt_round, dtype=np.int64)
+    putt_bin = np.searchsorted(PUTT_EDGES, np.array(putt_length, dtype=np.float64), side='left')
+    flat = putt_round * len(PUTT_BINS) + putt_bin
+    size = n * len(PUTT_BINS)
+    attempts = np.bincount(flat, minlength=size).reshape(n, len(PUTT_BINS))
+    made = np.bincount(flat, weights=np.array(putt_made, dtype=np.float64), minlength=size)
+    sums[:, _PUTT_ATTEMPTS:_PUTT_ATTEMPTS + len(PUTT_BINS)] = attempts
+    sums[:, _PUTT_MADE:_PUTT_MADE + len(PUTT_BINS)] = made.reshape(n, len(PUTT_BINS))
+
+    return {
+        'sums': sums,
+        'score': score,
+        'fairway': fairway,
+        'gir': gir,
+        'putts': putts,
+        'driver': driver_total,
+        'driver_round': driver_round,
+        'users': len(users),
+    }
+
+
+def _ratio(numerator, denominator, scale=1.0):
+    return round(float(numerator) / float(denominator) * scale, 4) if denominator else 0.0
+
+
+def stats_from_sums(total):
+    """합계 행(여러 라운드를 더한 것)에서 AggregateStats 필드 계산"""
+    rounds = total[_COL['rounds']]
+    if not rounds:
+        return {
+            'averageScore': 0.0, 'fairwayAccuracy': 0.0, 'girPercentage': 0.0, 'averagePutts': 0.0,
+            'driverDistance': 0.0, 'threePuttRate': 0.0, 'puttingByDistance': {},
+        }
+    return {
+        'averageScore': _ratio(total[_COL['score']], rounds),
+        'fairwayAccuracy': _ratio(total[_COL['fairway_pct']], rounds),
+        'girPercentage': _ratio(total[_COL['gir_pct']], rounds),
+        'averagePutts': _ratio(total[_COL['putts']], rounds),
+        'driverDistance': _ratio(total[_COL['driver_sum']], total[_COL['driver_count']]),
+        'threePuttRate': _ratio(total[_COL['three_putt_holes']], rounds * HOLES_PER_ROUND, 100),
+        'puttingByDistance': {
+            name: _ratio(total[_PUTT_MADE + i], total[_PUTT_ATTEMPTS + i], 100)
+            for i, name in enumerate(PUTT_BINS)
+        },
+    }
+
+
+def _bin_index(values, spec):
+    start, width, bins = spec
+    return np.clip(np.floor((np.asarray(values) - start) / width).astype(np.int64), 0, bins - 1)
+
+
+def histogram(values, spec):
+    """고정 구간 히스토그램 (범위 밖 값은 양 끝 구간으로)"""
+    start, width, bins = spec
+    return {'start': start, 'width': width, 'counts': np.bincount(_bin_index(values, spec), minlength=bins).tolist()}
+
+
+def _histogram_dict(spec, counts):
+    start, width, _ = spec
+    return {'start': start, 'width': width, 'counts': [int(c) for c in counts]}
+
+
+def _tail_sums(rows, count):
+    """
+    스코어 순으로 놓인 구간 합계 행에서 앞쪽 count개 라운드의 합계
+
+    경계 스코어 구간은 라운드 수 비율만큼만 더합니다. 스코어별 합계만 있어 같은 스코어 라운드 중
+    어느 것이 들어가는지 알 수 없으므로 구간 평균으로 근사합니다.
+
+    Returns:
+        (합계 행, 경계 구간을 비율로 나눴는지 여부)
+    """
+    total = np.zeros(rows.shape[1])
+    remaining = count
+    for row in rows:
+        rounds = row[_COL['rounds']]
+        if not rounds:
+            continue
+        if rounds >= remaining:
+            return total + row * (remaining / rounds), rounds > remaining
+        total += row
+        remaining -= rounds
+    return total, False
+
+
+def build_benchmark_stats(columns):
+    """load_round_columns 결과로 benchmark_stats.json 내용 구성"""
+    sums = columns['sums']
+    score = columns['score']
+    n = len(score)
+
+    # 스코어 오름차순 (같은 스코어는 파일 순서 유지)
+    order = np.argsort(score, kind='stable')
+    tail = math.ceil(n * 0.1)
+
+    distributions = {
+        name: histogram(columns[name], spec) for name, spec in HISTOGRAM_BINS.items()
+    }
+
+    score_bands = []
+    if n:
+        band = (score // SCORE_BAND_WIDTH).astype(np.int64)
+        for value in np.unique(band).tolist():
+            mask = band == value
+            score_bands.append({
+                'scoreMin': value * SCORE_BAND_WIDTH,
+                'scoreMax': value * SCORE_BAND_WIDTH + SCORE_BAND_WIDTH - 1,
+                'roundCount': int(mask.sum()),
+                'stats': stats_from_sums(sums[mask].sum(axis=0)),
+            })
+
+    return {
+        'lastUpdated': date.today().isoformat(),
+        'sampleSize': n,
+        'userCount': columns['users'],
+        'overall': stats_from_sums(sums.sum(axis=0)),
+        'top10': stats_from_sums(sums[order[:tail]].sum(axis=0)),
+        'bottom10': stats_from_sums(sums[order[::-1][:tail]].sum(axis=0)),
+        'distributions': distributions,
+        'scoreBands': score_bands,
+    }
+
+
+def build_score_band_table(columns):
+    """
+    정수 스코어별 합계 행과 분포를 누적합으로 저장한 테이블 (benchmark_score_bands.json)
+
+    cumulative[i]는 scoreMin + i 미만 스코어 라운드의 합계이므로,
+    [lo, hi] 구간 합계는 cumulative[hi - scoreMin + 1] - cumulative[lo - scoreMin]입니다.
+    분포(histograms)도 같은 방식으로 누적합니다.
+    """
+    score = columns['score'].astype(np.int64)
+    if not len(score):
+        return {'scoreMin': 0, 'scoreMax': -1, 'fields': ROUND_SUM_FIELDS, 'cumulative': [[0.0] * len(ROUND_SUM_FIELDS)],
+                'histogramBins': {}, 'histograms': {}}
+
+    score_min, score_max = int(score.min()), int(score.max())
+    offset = score - score_min
+    size = score_max - score_min + 1
+
+    per_score = np.zeros((size, len(ROUND_SUM_FIELDS)))
+    np.add.at(per_score, offset, columns['sums'])
+    cumulative = np.vstack([np.zeros(len(ROUND_SUM_FIELDS)), np.cumsum(per_score, axis=0)])
+
+    histograms = {}
+    for name, spec in HISTOGRAM_BINS.items():
+        if name == 'score':
+            continue  # 스코어 분포는 per_score의 rounds 열과 같음
+        bins = spec[2]
+        # 샷 단위 값(driver)은 해당 샷이 속한 라운드의 스코어 구간으로
+        owner = offset[columns['driver_round']] if name == 'driver' else offset
+        counts = np.bincount(owner * bins + _bin_index(columns[name], spec), minlength=size * bins)
+        histograms[name] = np.vstack([np.zeros(bins, dtype=np.int64),
+                                      np.cumsum(counts.reshape(size, bins), axis=0)]).tolist()
+
+    return {
+        'scoreMin': score_min,
+        'scoreMax': score_max,
+        'fields': ROUND_SUM_FIELDS,
+        'cumulative': cumulative.tolist(),
+        'histogramBins': {name: list(spec) for name, spec in HISTOGRAM_BINS.items() if name != 'score'},
+        'histograms': histograms,
+    }
+
+
+def query_score_range(table, target_score, tolerance):
+    """
+    |total_score - target_score| <= tolerance 인 라운드의 벤치마크 (calculateBenchmarkForScoreRange)
+
+    누적합 두 행의 차이로 구간 합계를 구하므로 라운드 수와 무관하게 O(구간 폭)입니다.
+    구간에 라운드가 없으면 앱과 같이 전체 라운드 기준으로 계산합니다.
+
+    top10 / bottom10은 근사값입니다. 테이블에는 스코어별 합계만 있으므로 경계 스코어의 라운드는
+    라운드 수 비율만큼 나눠 더합니다. build_benchmark_stats는 같은 스코어를 파일 순서대로 통째로
+    고르므로, 같은 구간이라도 averageScore 외 지표는 benchmark_stats.json과 다를 수 있습니다.
+    경계를 나눈 경우 결과의 tailApproximate가 True입니다.
+    """
+    if table['scoreMax'] < table['scoreMin']:
+        return None
+    score_min, score_max = table['scoreMin'], table['scoreMax']
+    cumulative = np.array(table['cumulative'])
+
+    lo = max(math.ceil(target_score - tolerance), score_min)
+    hi = min(math.floor(target_score + tolerance), score_max)
+    if lo > hi or not (cumulative[hi - score_min + 1] - cumulative[lo - score_min])[_COL['rounds']]:
+        lo, hi = score_min, score_max
+    start, end = lo - score_min, hi - score_min + 1
+
+    rows = cumulative[start + 1:end + 1] - cumulative[start:end]  # 스코어별 합계 (오름차순)
+    window = cumulative[end] - cumulative[start]
+    tail = math.ceil(window[_COL['rounds']] * 0.1)
+
+    distributions = {'score': _histogram_dict(
+        HISTOGRAM_BINS['score'],
+        np.bincount(_bin_index(np.arange(lo, hi + 1), HISTOGRAM_BINS['score']),
+                    weights=rows[:, _COL['rounds']], minlength=HISTOGRAM_BINS['score'][2]),
+    )}
+    for name, cum in table['histograms'].items():
+        cum = np.array(cum)
+        distributions[name] = _histogram_dict(table['histogramBins'][name], cum[end] - cum[start])
+
+    top, top_split = _tail_sums(rows, tail)
+    bottom, bottom_split = _tail_sums(rows[::-1], tail)
+    return {
+        'scoreRange': [lo, hi],
+        'sampleSize': int(window[_COL['rounds']]),
+        'overall': stats_from_sums(window),
+        'top10': stats_from_sums(top),
+        'bottom10': stats_from_sums(bottom),
+        'tailApproximate': bool(top_split or bottom_split),
+        'distributions': distributions,
+    }
+
+
+def build_sketches(columns, k=DEFAULT_K):
+    """분포 지표별 KLL 스케치 (_createDistributions와 같은 값)"""
+    sketches = {}
+    for name in HISTOGRAM_BINS:
+        sketch = KLLSketch(k)
+        sketch.update_many(columns[name])
+        sketches[name] = sketch
+    return sketches
+
+
+def parse_args(project_root):
+    parser = argparse.ArgumentParser(description="벤치마크 통계 사전 계산 (benchmark_stats.json)")
+    parser.add_argument("--input", type=Path,
+                        default=project_root / "assets" / "data" / "all_sample_rounds.json",
+                        help="라운드 파일 (.json 또는 .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="입력 포맷 (기본: 확장자로 판별)")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="출력 파일 (기본: 입력 파일과 같은 폴더의 benchmark_stats.json)")
+    parser.add_argument("--bands-output", type=Path, default=None,
+                        help="스코어 구간 누적합 파일 (기본: 입력 파일과 같은 폴더의 benchmark_score_bands.json)")
+    parser.add_argument("--sketch-output", type=Path, default=None,
+                        help="분위수 스케치 파일 (기본: 입력 파일과 같은 폴더의 benchmark_sketches.json)")
+    parser.add_argument("--sketch-k", type=int, default=DEFAULT_K,
+                        help="KLL 스케치 크기 k (클수록 정확, 오차 약 1.65%% × 200/k)")
+    parser.add_argument("--query", nargs=2, type=float, metavar=("TARGET", "TOLERANCE"), default=None,
+                        help="라운드를 다시 읽지 않고 스코어 구간 파일에서 TARGET±TOLERANCE 벤치마크 조회")
+    return parser.parse_args()
+
+
+def main():
+    project_root = Path(__file__).parent.parent.parent
+    args = parse_args(project_root)
+    output_file = args.output or args.input.with_name('benchmark_stats.json')
+    bands_file = args.bands_output or args.input.with_name('benchmark_score_bands.json')
+    sketch_file = args.sketch_output or args.input.with_name('benchmark_sketches.json')
+
+    if args.query:
+        with open(bands_file, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+        result = query_score_range(table, *args.query)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+
+    print(f"라운드 읽는 중: {args.input}")
+    start = time.perf_counter()
+    columns = load_round_columns(args.input, args.format)
+    loaded = time.perf_counter()
+    stats = build_benchmark_stats(columns)
+    built = time.perf_counter()
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, ensure_ascii=False, indent=2)
+    with open(bands_file, 'w', encoding='utf-8') as f:
+        json.dump(build_score_band_table(columns), f, ensure_ascii=False, separators=(',', ':'))
+    save_sketches(build_sketches(columns, args.sketch_k), sketch_file)
+
+    print(f"  라운드: {stats['sampleSize']}개, 사용자: {stats['userCount']}명")
+    print(f"  읽기 {loaded - start:.2f}초, 집계 {(built - loaded) * 1000:.1f}ms")
+    print(f"✅ 저장: {output_file} ({Path(output_file).stat().st_size / 1024:.1f} KB)")
+    print(f"✅ 저장: {bands_file} ({Path(bands_file).stat().st_size / 1024:.1f} KB)")
+    print(f"✅ 저장: {sketch_file} ({Path(sketch_file).stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,645 @@
+"""
+분포 기반 가상 사용자 집단 생성 스크립트
+
+expand_sample_data.py는 원본 라운드를 복제해 변형하므로 모든 사용자가 같은 라운드의
+변형본이 됩니다. 이 스크립트는 사용자마다 핸디캡을 뽑고, 핸디캡에서 파생된 실력 모수
+(페어웨이 · GIR 확률, 드라이버 거리, 거리별 퍼팅 성공률, 온그린 실패 시 추가 타수)로
+홀 · 샷을 직접 시뮬레이션합니다 (비교데이터_생성방안.md의 generate_benchmark_stats 방식).
+
+    - 스코어, 퍼팅 수, GIR, 페어웨이는 시뮬레이션한 샷에서 계산되므로 항상 서로 일치
+    - 마지막 어프로치의 FROM_PIN = 첫 퍼트 거리, 실패한 퍼트의 FROM_PIN = 다음 퍼트 거리
+    - 사용자 청크 단위로 NumPy 벡터 연산 후 청크 파일(population_00000.jsonl ...)로 기록
+    - 청크마다 (seed, 청크 번호)로 난수 스트림을 만들므로 --workers 값과 무관하게 같은 결과
+    - 플레이 날짜는 --end-date(기본: 오늘) 기준이므로 시드와 함께 지정하면 실행 날짜와 무관하게 같은 결과
+
+사용법:
+    python generate_population.py --users 100000 --rounds-per-user 5 --workers 8 --seed 1
+    python validate_data.py population/population_00000.jsonl
+
+출력:
+    - <output-dir>/population_NNNNN.<format> (청크당 --chunk-users명의 라운드)
+    - <output-dir>/population_manifest.json (시드, 청크 파일 목록, 라운드 수)
+    - (--index) 청크마다 population_NNNNN.jsonl.idx.json 사용자 인덱스 (round_io.IndexedRounds로 조회)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+import pipeline_metrics
+from records import Hole, Round, Shot, bulk_records
+from round_io import FORMATS, LAYOUTS, with_layout, write_rounds
+from generate_sample_data import (
+    KIND_TEE_LONG, KIND_TEE_SHORT, KIND_APPROACH, KIND_PUTT, SHOT_COLUMN_SPECS, SPEC_LOW, SPEC_HIGH,
+    generate_uuid_batch, load_golf_courses, materialize_shots,
+)
+
+OUTPUT_DIR = "golf_stats_app/assets/data/population"
+MANIFEST_FILE = "population_manifest.json"
+
+# 핸디캡 분포와 핸디캡 → 실력 모수 (h = 핸디캡, 모수마다 사용자별 정규 잡음 추가)
+# 평균 핸디캡 20 근처에서 평균 스코어 약 92 (비교데이터_생성방안.md 1.2 표 기준)
+SKILL_MODEL = {
+    'handicap': {'mean': 20.0, 'std': 6.5, 'min': 0.0, 'max': 40.0},
+    'fairway': {'base': 0.72, 'per_hcp': -0.008, 'noise': 0.06, 'min': 0.15, 'max': 0.90},
+    'gir': {'base': 0.72, 'per_hcp': -0.017, 'noise': 0.05, 'min': 0.02, 'max': 0.85},
+    # 온그린 실패 홀의 추가 타수 ~ Poisson(per_hcp × h)
+    'extra_strokes': {'base': 0.0, 'per_hcp': 0.04, 'noise': 0.05, 'min': 0.0, 'max': 2.0},
+    'driver': {'base': 262.0, 'per_hcp': -1.6, 'noise': 12.0, 'min': 140.0, 'max': 320.0},
+    # 퍼팅 성공 확률 = 1 / (1 + (거리 / d50) ^ exponent), d50 = 성공률 50%인 거리 (m)
+    'putt_d50': {'base': 2.4, 'per_hcp': -0.025, 'noise': 0.2, 'min': 0.8, 'max': 3.5},
+    'putt_exponent': {'base': 2.4, 'per_hcp': -0.02, 'noise': 0.0, 'min': 1.2, 'max': 3.0},
+}
+
+# 페어웨이 적중/실패 시 GIR 확률 배수 (파4 이상)
+GIR_FAIRWAY_MULT = (0.8, 1.15)
+
+# 드라이버 샷 거리의 라운드 내 표준편차 (m)
+DRIVER_SHOT_STD = 15.0
+
+# 첫 퍼트 거리 (로그정규 중앙값 m, 핸디캡당 증가율, 로그 표준편차)
+FIRST_PUTT_GIR = (6.5, 0.015, 0.6)
+FIRST_PUTT_CHIP = (2.2, 0.03, 0.7)
+
+# 실패한 퍼트가 남기는 거리 = 퍼트 거리 × 로그정규(중앙값 base + per_hcp × h) + 0.2m
+PUTT_LEAVE = (0.05, 0.0015, 0.5)
+MAX_PUTTS = 4
+
+# 핸디캡 구간 → user_id 접두어 (validate_data.LEVELS와 같은 이름)
+LEVEL_PREFIXES = [(10.0, 'advanced'), (22.0, 'inter'), (float('inf'), 'beginner')]
+
+# 칩샷 기준 (데이터 정의서 2.3.2: 핀까지 30m 이하면 SHOT_C)
+CHIP_DISTANCE = 30.0
+# 남은 거리(m) 상한별 어프로치 클럽
+CLUB_BY_DISTANCE = [
+    (90, 'CLUB_AW'), (105, 'CLUB_PW'), (118, 'CLUB_I9'), (130, 'CLUB_I8'), (142, 'CLUB_I7'),
+    (154, 'CLUB_I6'), (166, 'CLUB_I5'), (180, 'CLUB_U'), (195, 'CLUB_W5'), (float('inf'), 'CLUB_W3'),
+]
+_CLUB_EDGES = np.array([edge for edge, _ in CLUB_BY_DISTANCE[:-1]])
+_CLUB_NAMES = np.array([club for _, club in CLUB_BY_DISTANCE], dtype=object)
+
+# 엑셀 코스가 없을 때 쓰는 가상 코스 (파72 표준 배치)
+SYNTHETIC_PARS = [4, 4, 3, 5, 4, 4, 3, 4, 5, 4, 4, 3, 5, 4, 4, 3, 4, 5]
+SYNTHETIC_DISTANCE = {3: (130, 190), 4: (300, 400), 5: (440, 520)}
+SYNTHETIC_COURSES = 20
+
+# 라운드 기간 (오늘 기준 최근 N일, 티오프 06:00~17:00)
+PLAY_DAYS = 365
+TEE_TIME_HOURS = (6, 17)
+
+
+def _param(rng, spec, handicap):
+    value = spec['base'] + spec['per_hcp'] * handicap
+    if spec['noise']:
+        value = value + rng.normal(0.0, spec['noise'], size=len(handicap))
+    return np.clip(value, spec['min'], spec['max'])
+
+
+def sample_users(rng, count):
+    """핸디캡과 실력 모수를 사용자 count명분 배열로 추출"""
+    spec = SKILL_MODEL['handicap']
+    handicap = np.clip(rng.normal(spec['mean'], spec['std'], size=count), spec['min'], spec['max'])
+    users = {'handicap': np.round(handicap, 1)}
+    for name, spec in SKILL_MODEL.items():
+        if name != 'handicap':
+            users[name] = _param(rng, spec, users['handicap'])
+    return users
+
+
+def level_prefix(handicap):
+    for limit, prefix in LEVEL_PREFIXES:
+        if handicap < limit:
+            return prefix
+    return LEVEL_PREFIXES[-1][1]
+
+
+def population_user_id(handicap, index):
+    """실력 구간 접두어가 붙은 사용자 ID (예: inter.pop000123)"""
+    return f"{level_prefix(handicap)}.pop{index:06d}"
+
+
+def load_course_table(use_cache=True):
+    """
+    라운드 생성용 코스 목록 (18홀이 모두 있는 코스만)
+
+    엑셀 코스 마스터를 읽지 못하면 SYNTHETIC_PARS 배치의 가상 코스를 사용합니다.
+    """
+    courses_df, course_index = load_golf_courses(use_cache=use_cache)
+    courses = []
+    if courses_df is not None:
+        for course in courses_df.drop_duplicates(subset=['cc_id', 'course_id']).to_dict('records'):
+            holes = course_index['holes_by_course'].get((course['cc_id'], course['course_id']))
+            if holes is not None:
+                courses.append({**course, 'holes': [dict(hole) for hole in holes]})
+    if courses:
+        return courses
+
+    print("[WARN] 18홀 코스 정보가 없어 가상 코스를 사용합니다.")
+    return synthetic_courses()
+
+
+def synthetic_courses(count=SYNTHETIC_COURSES, seed=0):
+    """SYNTHETIC_PARS 배치의 가상 코스 count개 (엑셀 없이 쓰는 고정 코스, load_course_table과 같은 형식)"""
+    rng = np.random.default_rng(seed)
+    courses = []
+    for c in range(1, count + 1):
+        holes = [
+            {'hole_id': f"SYN{c:02d}_{no}", 'hole_no': no, 'par': par,
+             'distance': int(rng.integers(*SYNTHETIC_DISTANCE[par]))}
+            for no, par in enumerate(SYNTHETIC_PARS, start=1)
+        ]
+        courses.append({'cc_id': f"SYN{c:02d}", 'cc_name': f"가상 CC {c}",
+                        'course_id': f"SYN{c:02d}_A", 'course_name': "A코스", 'holes': holes})
+    return courses
+
+
+def _course_arrays(courses):
+    """코스 목록 → (코스 수 × 18) par / distance 배열"""
+    pars = np.array([[hole.get('par', 4) for hole in course['holes']] for course in courses])
+    distances = np.array([[hole.get('distance') or 350 for hole in course['holes']] for course in courses], dtype=float)
+    return pars, distances
+
+
+def simulate_holes(rng, users, hole_user, pars, distances):
+    """
+    홀 단위 시뮬레이션 (모든 라운드의 홀을 한 번에)
+
+    Args:
+        users: sample_users 결과
+        hole_user: 홀별 사용자 인덱스
+        pars / distances: 홀별 파 / 전장
+
+    Returns:
+        홀 단위 배열 dict - fairway_hit, gir, approach(퍼트 전 타수, 티샷 포함),
+        putts, putt_length / putt_made / putt_leave (홀 × MAX_PUTTS)
+    """
+    n = len(pars)
+    handicap = users['handicap'][hole_user]
+    long_hole = pars > 3
+
+    fairway_hit = long_hole & (rng.random(n) < users['fairway'][hole_user])
+    gir_prob = users['gir'][hole_user] * np.where(
+        long_hole, np.where(fairway_hit, GIR_FAIRWAY_MULT[1], GIR_FAIRWAY_MULT[0]), 1.0)
+    gir = rng.random(n) < np.minimum(gir_prob, 0.95)
+    extra = rng.poisson(users['extra_strokes'][hole_user])
+    approach = np.where(gir, pars - 2, pars - 1 + extra)
+
+    # 첫 퍼트 거리: 레귤러 온이면 길고, 칩샷 후면 짧음
+    median = np.where(gir, FIRST_PUTT_GIR[0] * (1 + FIRST_PUTT_GIR[1] * handicap),
+                      FIRST_PUTT_CHIP[0] * (1 + FIRST_PUTT_CHIP[1] * handicap))
+    sigma = np.where(gir, FIRST_PUTT_GIR[2], FIRST_PUTT_CHIP[2])
+    distance = np.clip(median * rng.lognormal(0.0, sigma), 0.3, 30.0)
+
+    d50 = users['putt_d50'][hole_user]
+    exponent = users['putt_exponent'][hole_user]
+    leave_median = PUTT_LEAVE[0] + PUTT_LEAVE[1] * handicap
+    putt_length = np.zeros((n, MAX_PUTTS))
+    putt_made = np.zeros((n, MAX_PUTTS), dtype=bool)
+    putt_leave = np.zeros((n, MAX_PUTTS))
+    putts = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+    for k in range(MAX_PUTTS):
+        distance = np.round(distance, 2)
+        made = rng.random(n) < 1.0 / (1.0 + (distance / d50) ** exponent)
+        if k == MAX_PUTTS - 1:
+            made[:] = True
+        leave = np.round(distance * leave_median * rng.lognormal(0.0, PUTT_LEAVE[2], size=n) + 0.2, 2)
+        putt_length[active, k] = distance[active]
+        putt_made[active, k] = made[active]
+        putt_leave[active, k] = np.where(made, 0.0, leave)[active]
+        putts += active
+        active &= ~made
+        distance = leave
+
+    return {
+        'fairway_hit': fairway_hit,
+        'gir': gir,
+        'approach': approach,
+        'putts': putts,
+        'putt_length': putt_length,
+        'putt_made': putt_made,
+        'putt_leave': putt_leave,
+    }
+
+
+def build_shot_columns(rng, users, hole_user, pars, distances, sim):
+    """
+    시뮬레이션 결과를 materialize_shots용 샷 컬럼으로 변환
+
+    티샷 → 어프로치/칩 → 퍼트 순서이며, 각 샷의 FROM_PIN이 다음 샷 시작 거리와 이어집니다.
+    """
+    approach, putts = sim['approach'], sim['putts']
+    shots_per_hole = approach + putts
+    hole_idx = np.repeat(np.arange(len(pars)), shots_per_hole)
+    hole_start = np.cumsum(shots_per_hole) - shots_per_hole
+    shot_no = np.arange(len(hole_idx)) - hole_start[hole_idx] + 1
+    putt_no = shot_no - approach[hole_idx]
+    is_putt = putt_no >= 1
+    hole_par = pars[hole_idx]
+    kinds = np.full(len(hole_idx), KIND_APPROACH)
+    kinds[shot_no == 1] = np.where(hole_par[shot_no == 1] > 3, KIND_TEE_LONG, KIND_TEE_SHORT)
+    kinds[is_putt] = KIND_PUTT
+    n = len(hole_idx)
+
+    # 홀별 거리 흐름: 티샷 후 남은 거리 → (어프로치) → 첫 퍼트 거리
+    first_putt = sim['putt_length'][:, 0]
+    drive = np.maximum(rng.normal(users['driver'][hole_user], DRIVER_SHOT_STD), 100.0)
+    drive = np.minimum(drive, distances - 20.0)
+    tee_total = np.where(pars > 3, drive, distances * rng.uniform(0.92, 1.02, size=len(pars)))
+    after_tee = np.where(
+        approach == 1, first_putt,
+        np.where(pars > 3, distances - tee_total, first_putt + 12.0 * rng.lognormal(0.0, 0.5, size=len(pars))),
+    )
+    after_tee = np.maximum(after_tee, np.where(approach == 1, 0.0, first_putt + 5.0))
+
+    # 어프로치 j (1..k): 남은 거리가 첫 퍼트 거리로 수렴 (k = 티샷 제외 어프로치 수)
+    k = np.maximum(approach - 1, 1)[hole_idx]
+    j = (shot_no - 1).astype(float)
+    start_left = after_tee[hole_idx]
+    end_left = first_putt[hole_idx]
+    remaining_after = end_left + (start_left - end_left) * np.clip((k - j) / k, 0, 1) ** 2
+    remaining_before = end_left + (start_left - end_left) * np.clip((k - j + 1) / k, 0, 1) ** 2
+    remaining_after = np.where(shot_no == 1, start_left, remaining_after)
+
+    columns = {
+        "hole_index": hole_idx,
+        "shot_number": shot_no,
+        "kind": kinds,
+        "gap_seconds": rng.integers(120, 301, size=n),
+    }
+    metrics = np.round(rng.uniform(SPEC_LOW[kinds], SPEC_HIGH[kinds]), 2)
+    for col, name in enumerate(SHOT_COLUMN_SPECS):
+        columns[name] = metrics[:, col]
+
+    tee = shot_no == 1
+    approach_rows = (kinds == KIND_APPROACH)
+    total = np.where(tee, tee_total[hole_idx], np.maximum(remaining_before - remaining_after, 1.0))
+    columns["TOTAL"] = np.where(is_putt, columns["TOTAL"], np.round(total, 2))
+    columns["CARRY"] = np.where(is_putt, columns["CARRY"],
+                                np.round(columns["TOTAL"] * rng.uniform(0.86, 0.94, size=n), 2))
+    columns["FROM_PIN"] = np.where(is_putt, columns["FROM_PIN"], np.round(remaining_after, 2))
+
+    # 드라이버: 볼 스피드 ∝ 거리, 클럽 스피드 = 볼 스피드 / 스매시 팩터
+    driver_rows = kinds == KIND_TEE_LONG
+    ball_speed = np.round(columns["TOTAL"] * 0.29 + rng.normal(0.0, 1.0, size=n), 2)
+    columns["BALL_SPEED"] = np.where(driver_rows, ball_speed, columns["BALL_SPEED"])
+    columns["CLUB_SPEED"][driver_rows] = np.round(ball_speed[driver_rows] / columns["SMASH_FAC"][driver_rows], 2)
+
+    # 어프로치 클럽/종류/라이: 남은 거리 30m 이하는 칩샷, 페어웨이를 놓친 세컨샷은 러프
+    chip = approach_rows & (remaining_before <= CHIP_DISTANCE)
+    clubs = _CLUB_NAMES[np.searchsorted(_CLUB_EDGES, remaining_before)]
+    clubs[chip] = 'CLUB_SW'
+    columns["club_type"] = clubs
+    shot_type = np.where(tee, 'SHOT_T', np.where(is_putt, 'SHOT_P', np.where(chip, 'SHOT_C', 'SHOT_A'))).astype(object)
+    lie = np.full(n, 'LIE_FAIR', dtype=object)
+    lie[tee] = 'LIE_TEE'
+    lie[is_putt] = 'LIE_GREEN'
+    missed_fairway = (hole_par > 3) & ~sim['fairway_hit'][hole_idx] & (shot_no == 2) & approach_rows
+    lie[missed_fairway] = 'LIE_ROUGH'
+    lie[chip & ~missed_fairway] = np.where(rng.random(int((chip & ~missed_fairway).sum())) < 0.5,
+                                           'LIE_FRINGE', 'LIE_ROUGH')
+    columns["shot_type"] = shot_type
+    columns["lie"] = lie
+
+    # 퍼트: putt_length = 시작 거리, 실패 시 FROM_PIN = 다음 퍼트 거리
+    putt_k = np.clip(putt_no - 1, 0, MAX_PUTTS - 1)
+    length = sim['putt_length'][hole_idx, putt_k]
+    made = sim['putt_made'][hole_idx, putt_k] & is_putt
+    leave = sim['putt_leave'][hole_idx, putt_k]
+    overshoot = rng.random(n) < 0.4
+    roll = np.where(made, length, np.where(overshoot, length + leave, np.maximum(length - leave, 0.1)))
+    columns["putt_length"] = np.where(is_putt, length, 0.0)
+    columns["putt_made"] = made
+    columns["TOTAL"] = np.where(is_putt, np.round(roll, 2), columns["TOTAL"])
+    columns["FROM_PIN"] = np.where(is_putt, leave, columns["FROM_PIN"])
+    return columns
+
+
+def generate_chunk(chunk_index, first_user, user_count, rounds_per_user, seed, courses, end_date=None):
+    """
+    사용자 user_count명의 라운드를 생성 (청크 단위 작업)
+
+    end_date(YYYY-MM-DD)는 플레이 날짜 범위의 끝 (기본: 오늘)
+
+    Returns:
+        라운드 레코드(records.Round) 리스트 (사용자 순서, 사용자 내에서는 played_at 순서)
+    """
+    rng = np.random.default_rng([seed, chunk_index])
+    users = sample_users(rng, user_count)
+    user_ids = [population_user_id(h, first_user + i) for i, h in enumerate(users['handicap'].tolist())]
+
+    # 라운드 수: 1 + Poisson(평균 - 1), 사용자별 자주 가는 코스 3곳 중에서 선택
+    round_counts = 1 + rng.poisson(max(rounds_per_user - 1, 0), size=user_count)
+    round_user = np.repeat(np.arange(user_count), round_counts)
+    num_rounds = len(round_user)
+    home_courses = rng.integers(0, len(courses), size=(user_count, 3))
+    round_course = home_courses[round_user, rng.integers(0, 3, size=num_rounds)]
+
+    course_pars, course_distances = _course_arrays(courses)
+    pars = course_pars[round_course].ravel()
+    distances = course_distances[round_course].ravel()
+    hole_user = np.repeat(round_user, 18)
+
+    sim = simulate_holes(rng, users, hole_user, pars, distances)
+    columns = build_shot_columns(rng, users, hole_user, pars, distances, sim)
+
+    # 시작 시각: end_date 이전 PLAY_DAYS일, 사용자별로 시간순 정렬
+    today = datetime.fromisoformat(end_date or date.today().isoformat())
+    day_offsets = rng.integers(1, PLAY_DAYS + 1, size=num_rounds)
+    seconds = rng.integers(TEE_TIME_HOURS[0] * 3600, TEE_TIME_HOURS[1] * 3600, size=num_rounds)
+    start_offsets = seconds - day_offsets * 86400
+    order = np.lexsort((start_offsets, round_user))
+
+    round_ids = generate_uuid_batch(rng, num_rounds)
+    hole_score_ids = generate_uuid_batch(rng, num_rounds * 18)
+    shot_ids = generate_uuid_batch(rng, len(columns["kind"]))
+
+    shots_per_hole = sim['approach'] + sim['putts']
+    hole_shot_end = np.cumsum(shots_per_hole)
+    round_shot_end = hole_shot_end[17::18].tolist()
+    strokes = shots_per_hole.tolist()
+    putts = sim['putts'].tolist()
+    gir = sim['gir'].tolist()
+    fairway = sim['fairway_hit'].tolist()
+    first_putt_distance = sim['putt_length'][:, 0].tolist()
+    first_putt_made = (sim['putts'] == 1).tolist()
+    pars_list = pars.tolist()
+
+    rounds = []
+    for r in order.tolist():
+        shot_start = round_shot_end[r - 1] if r else 0
+        shot_end = round_shot_end[r]
+        round_columns = {name: values[shot_start:shot_end] for name, values in columns.items()}
+        round_columns["hole_index"] = round_columns["hole_index"] - r * 18
+        start_time = today + timedelta(seconds=int(start_offsets[r]))
+        user_id = user_ids[round_user[r]]
+        round_hole_ids = hole_score_ids[r * 18:(r + 1) * 18]
+        shots, end_time = materialize_shots(round_columns, round_hole_ids, user_id, start_time,
+                                            shot_ids[shot_start:shot_end], record=Shot)
+
+        course = courses[round_course[r]]
+        holes = []
+        for h, hole in enumerate(course['holes']):
+            i = r * 18 + h
+            par = pars_list[i]
+            holes.append(Hole(
+                hole_score_id=round_hole_ids[h],
+                round_id=round_ids[r],
+                hole_number=hole.get('hole_no'),
+                hole_id=hole.get('hole_id'),
+                par=par,
+                distance=hole.get('distance'),
+                strokes=strokes[i],
+                putts=putts[i],
+                fairway_hit=fairway[i] if par > 3 else None,
+                green_in_regulation=gir[i],
+                penalties=0,
+                penalty_details=[],
+                first_putt_distance=first_putt_distance[i],
+                first_putt_made=first_putt_made[i],
+            ))
+
+        rounds.append(_round_record(round_ids[r], user_id, course, holes, shots, start_time, end_time))
+    return rounds, users
+
+
+def _round_record(round_id, user_id, course, holes, shots, start_time, end_time):
+    """라운드 레코드 (to_dict()가 generate_sample_data.iter_round_data와 같은 키 순서)"""
+    scores = {'birdies_or_better': 0, 'pars': 0, 'bogeys': 0, 'double_bogey_or_worse': 0}
+    for hole in holes:
+        diff = hole.strokes - hole.par
+        if diff <= -1:
+            scores['birdies_or_better'] += 1
+        elif diff == 0:
+            scores['pars'] += 1
+        elif diff == 1:
+            scores['bogeys'] += 1
+        else:
+            scores['double_bogey_or_worse'] += 1
+    long_holes = [hole for hole in holes if hole.par > 3]
+    return Round(
+        game_session_id=None,
+        game_mode="SINGLE",
+        game_rule="RULE_STROKE",
+        simulator_id=None,
+        round_id=round_id,
+        user_id=user_id,
+        team_id=None,
+        played_at=start_time.isoformat(),
+        cc_id=course['cc_id'],
+        cc_name=course.get('cc_name'),
+        course_id=course['course_id'],
+        course_name=course.get('course_name'),
+        tee_box="TB_WHITE",
+        total_par=sum(hole.par for hole in holes),
+        total_score=sum(hole.strokes for hole in holes),
+        rank=1,
+        ranking_eligible=True,
+        total_putts=sum(hole.putts for hole in holes),
+        fairways_hit=sum(1 for hole in long_holes if hole.fairway_hit),
+        fairways_attempted=len(long_holes),
+        greens_in_regulation=sum(1 for hole in holes if hole.green_in_regulation),
+        mulligans_used=0,
+        **scores,
+        play_end_time=end_time.isoformat(),
+        holes=holes,
+        shots=shots,
+    )
+
+
+def chunk_path(output_dir, chunk_index, fmt):
+    return os.path.join(output_dir, f"population_{chunk_index:05d}.{fmt}")
+
+
+def write_chunk(task, courses):
+    """청크 하나를 생성해 파일로 기록하고 요약 반환"""
+    chunk_index, first_user, user_count, rounds_per_user, seed, output_dir, fmt, layout, index, end_date = task
+    path = chunk_path(output_dir, chunk_index, fmt)
+    with bulk_records():
+        with pipeline_metrics.stage('generate'):
+            rounds, users = generate_chunk(chunk_index, first_user, user_count, rounds_per_user, seed, courses,
+                                           end_date)
+        # 청크 전체는 슬롯 레코드로 들고 있다가 기록하는 라운드만 JSON 키 dict로 변환
+        count = write_rounds(with_layout((record.to_dict() for record in rounds), layout), path, fmt=fmt,
+                             index=index)
+
+    levels = {}
+    for record in rounds:
+        prefix = record.user_id.split('.', 1)[0]
+        total, n = levels.get(prefix, (0, 0))
+        levels[prefix] = (total + record.total_score, n + 1)
+    return {
+        'file': os.path.basename(path),
+        'users': user_count,
+        'rounds': count,
+        'score_sums': levels,
+        'mean_handicap': float(users['handicap'].mean()),
+    }
+
+
+# 작업 프로세스별 코스 목록 (initializer에서 한 번만 전달)
+_worker_courses = None
+
+
+def _init_worker(courses, collect_metrics=False):
+    global _worker_courses
+    _worker_courses = courses
+    pipeline_metrics.init_worker(collect_metrics)
+
+
+def _write_chunk_task(task):
+    result = write_chunk(task, _worker_courses)
+    result['metrics'] = pipeline_metrics.drain()
+    return result
+
+
+def _iter_parallel(courses, tasks, workers):
+    """청크 작업을 프로세스 풀에 분배하고 결과를 작업 순서대로 반환 (진행 중 작업 수 제한)"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(courses, pipeline_metrics.active() is not None)) as executor:
+        pending = deque()
+        task_iter = iter(tasks)
+        for task in task_iter:
+            pending.append(executor.submit(_write_chunk_task, task))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(executor.submit(_write_chunk_task, next_task))
+            yield result
+
+
+def generate_population(output_dir, users, rounds_per_user=5, chunk_users=1000, fmt='jsonl',
+                        seed=None, workers=1, layout='flat', use_cache=True, index=False, end_date=None):
+    """
+    users명의 가상 사용자 라운드를 청크 파일로 생성 (index=True면 청크마다 .idx.json 사용자 인덱스)
+
+    end_date(YYYY-MM-DD)는 한 번만 정해 모든 청크에 전달 (자정을 넘겨 실행돼도 청크끼리 같은 기준)
+
+    Returns:
+        매니페스트 dict (population_manifest.json에도 기록)
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    end_date = end_date or date.today().isoformat()
+    os.makedirs(output_dir, exist_ok=True)
+    courses = load_course_table(use_cache=use_cache)
+
+    tasks = [
+        (chunk_index, first_user, min(chunk_users, users - first_user), rounds_per_user, seed, output_dir, fmt,
+         layout, index, end_date)
+        for chunk_index, first_user in enumerate(range(0, users, chunk_users))
+    ]
+    print(f"사용자 {users:,}명, 사용자당 평균 {rounds_per_user}라운드, 청크 {len(tasks)}개 "
+          f"(청크당 {chunk_users}명), 코스 {len(courses)}개, 시드 {seed}")
+    if workers > 1:
+        print(f"병렬 프로세스: {workers}개")
+
+    start = time.perf_counter()
+    if workers > 1:
+        results = pipeline_metrics.timed('wait_workers', _iter_parallel(courses, tasks, workers))
+    else:
+        results = (write_chunk(task, courses) for task in tasks)
+    chunks = []
+    level_sums = {}
+    for result in results:
+        # 작업 프로세스 계측은 메인 프로세스 집계에 합산 (매니페스트에는 넣지 않음)
+        pipeline_metrics.merge(result.pop('metrics', None))
+        chunks.append(result)
+        for prefix, (total, n) in result.pop('score_sums').items():
+            old_total, old_n = level_sums.get(prefix, (0, 0))
+            level_sums[prefix] = (old_total + total, old_n + n)
+        done = len(chunks)
+        if done == len(tasks) or done % max(1, len(tasks) // 20) == 0:
+            print(f"  청크 {done}/{len(tasks)} 완료 ({time.perf_counter() - start:.1f}초)")
+    elapsed = time.perf_counter() - start
+
+    total_rounds = sum(chunk['rounds'] for chunk in chunks)
+    manifest = {
+        'seed': seed,
+        'end_date': end_date,
+        'users': users,
+        'rounds_per_user': rounds_per_user,
+        'chunk_users': chunk_users,
+        'format': fmt,
+        'layout': layout,
+        'index': index,
+        'skill_model': SKILL_MODEL,
+        'total_rounds': total_rounds,
+        'chunks': chunks,
+    }
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"\n총 라운드: {total_rounds:,}개 ({elapsed:.1f}초, {total_rounds / max(elapsed, 1e-9):,.0f} 라운드/초)")
+    for _, prefix in LEVEL_PREFIXES:
+        total, n = level_sums.get(prefix, (0, 0))
+        if n:
+            print(f"  {prefix}: {n:,}개 라운드, 평균 스코어 {total / n:.1f}")
+    print(f"✅ 매니페스트: {manifest_path}")
+    return manifest
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="분포 기반 가상 사용자 집단 라운드 생성")
+    parser.add_argument("--users", type=int, default=1000, help="생성할 사용자 수")
+    parser.add_argument("--rounds-per-user", type=float, default=5,
+                        help="사용자당 평균 라운드 수 (1 + Poisson(평균 - 1))")
+    parser.add_argument("--chunk-users", type=int, default=1000, help="청크 파일 하나에 담을 사용자 수")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="청크 파일과 매니페스트를 기록할 디렉터리")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl", help="청크 파일 포맷 (기본: jsonl)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="flat",
+                        help="샷 배치: flat(기본) / ranged(홀별 shot_start~shot_end) / nested(홀 안에 샷)")
+    parser.add_argument("--index", action="store_true",
+                        help="청크마다 .idx.json 사용자 인덱스(user_id → played_at 순 바이트 오프셋)도 기록 (jsonl 전용)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="마스터 시드 (같은 시드면 --workers 값과 무관하게 같은 결과)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="플레이 날짜 범위의 끝 (기본: 오늘, 매니페스트에 기록)")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 프로세스 수 (기본: 1)")
+    parser.add_argument("--no-cache", action="store_true", help="코스 마스터 캐시를 사용하지 않고 엑셀을 직접 파싱")
+    pipeline_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    pipeline_metrics.enable_from_args(parser, args)
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.users < 1 or args.chunk_users < 1:
+        print("❌ --users와 --chunk-users는 1 이상이어야 합니다.")
+        return 1
+    if args.index and args.format != 'jsonl':
+        print("❌ --index는 jsonl 포맷에서만 사용할 수 있습니다.")
+        return 1
+    generate_population(
+        output_dir=args.output_dir,
+        users=args.users,
+        rounds_per_user=args.rounds_per_user,
+        chunk_users=args.chunk_users,
+        fmt=args.format,
+        seed=args.seed,
+        workers=args.workers,
+        layout=args.layout,
+        use_cache=not args.no_cache,
+        index=args.index,
+        end_date=args.end_date.isoformat() if args.end_date else None,
+    )
+    if args.metrics:
+        pipeline_metrics.finish(args.metrics)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 import os
-import json
 import uuid
 import random
+import argparse
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+
+import pipeline_metrics
+from entity_rng import entity_rng, entity_uuid, entity_uuids
+from round_io import FORMATS, LAYOUTS, file_sha256, with_layout, write_rounds
+from columnar_export import COLUMNAR_FORMATS, ColumnarWriter
 
 # --- 설정 ---
 OUTPUT_DIR = "golf_stats_app/assets/data"
@@ -40,132 +46,198 @@ SCENARIOS = [
 
 # --- 유틸리티 함수 ---
 
-def load_golf_courses():
-    """Excel 파일에서 골프장 및 홀 정보를 읽어옵니다."""
+# read_course_master 출력 형식이 바뀌면 올려서 기존 캐시를 무효화
+COURSE_LOADER_VERSION = 1
+
+# 정규화된 코스/홀 테이블 컬럼
+COURSE_COLUMNS = ['cc_id', 'cc_name', 'course_id', 'course_name']
+HOLE_COLUMNS = ['hole_id', 'cc_id', 'course_id', 'hole_no', 'par', 'distance']
+
+def find_col(df, candidates):
+    """후보 이름 중 df에 존재하는 첫 번째 컬럼명을 반환합니다."""
+    for col in candidates:
+        if col in df.columns:
+            return col
+    return None
+
+def _parse_sheet(xl, sheet_name):
+    """이미 열어 둔 ExcelFile에서 시트를 파싱하고 컬럼명을 소문자로 맞춥니다."""
+    df = xl.parse(sheet_name)
+    df.columns = [str(c).lower() for c in df.columns]
+    return df
+
+def _column_or_default(df, col, default):
+    """컬럼이 있으면 해당 Series, 없으면 기본값으로 채운 Series"""
+    if col is None:
+        return pd.Series([default] * len(df), index=df.index, dtype=object)
+    return df[col]
+
+def read_course_master(file_path):
+    """
+    코스 마스터 엑셀을 한 번 파싱하여 정규화된 컬럼형 테이블로 변환합니다.
+
+    Hole_Master → Course_Master → CC_Master 순으로 벡터 병합하며,
+    시트/컬럼명은 find_col 후보 목록으로 찾습니다.
+
+    Returns:
+        (courses_df, holes_df) - 컬럼은 COURSE_COLUMNS / HOLE_COLUMNS.
+        필요한 시트나 컬럼이 없으면 (None, None)
+    """
+    xl = pd.ExcelFile(file_path)
+    print(f"[INFO] Sheets: {xl.sheet_names}")
+
+    # 시트 이름 정규화 (공백 제거)
+    sheet_map = {name.strip(): name for name in xl.sheet_names}
+    print(f"[DEBUG] Normalized Sheets: {list(sheet_map.keys())}")
+
+    # 1. CC Master 읽기
+    if 'CC_Master' not in sheet_map:
+        print("[ERROR] 'CC_Master' sheet not found")
+        return None, None
+    df_cc = _parse_sheet(xl, sheet_map['CC_Master'])
+    print(f"[INFO] CC Columns: {list(df_cc.columns)}")
+
+    # 2. Course Master 읽기
+    if 'Course_Master' not in sheet_map:
+        print("[ERROR] 'Course_Master' sheet not found")
+        return None, None
+    df_course = _parse_sheet(xl, sheet_map['Course_Master'])
+    print(f"[INFO] Course Columns: {list(df_course.columns)}")
+
+    # 3. Hole Master 읽기
+    # Hole_Master 시트명이 'Hole_Master ' 처럼 공백이 있을 수 있음
+    if 'Hole_Master' in sheet_map:
+        df_hole = _parse_sheet(xl, sheet_map['Hole_Master'])
+        print(f"[INFO] Hole Columns: {list(df_hole.columns)}")
+    else:
+        # 혹시 다른 이름일 수 있으니 확인
+        possible_names = [s for s in sheet_map.keys() if 'Hole' in s]
+        if not possible_names:
+            print("[ERROR] 'Hole_Master' sheet not found")
+            return None, None
+        print(f"[WARN] 'Hole_Master' not found, trying: {possible_names[0]}")
+        df_hole = _parse_sheet(xl, sheet_map[possible_names[0]])
+
+    # CC ID 컬럼 찾기
+    cc_id_col = find_col(df_cc, ['cc_seq', 'cc_id', 'id', 'no'])
+    cc_name_col = find_col(df_cc, ['cc_name_ko', 'cc_name', 'name', 'title'])
+
+    if not cc_id_col:
+        print(f"[ERROR] Cannot find CC ID column in {df_cc.columns}")
+        return None, None
+
+    # Course ID 컬럼 찾기
+    course_id_col = find_col(df_course, ['course_seq', 'course_id', 'id'])
+    course_cc_id_col = find_col(df_course, ['cc_seq', 'cc_id', 'parent_id'])
+    course_name_col = find_col(df_course, ['course_name_ko', 'course_name', 'name'])
+
+    if not course_id_col or not course_cc_id_col:
+        print(f"[ERROR] Cannot find Course ID columns in {df_course.columns}")
+        return None, None
+
+    # 홀 컬럼 찾기
+    hole_course_id_col = find_col(df_hole, ['course_seq', 'course_id', 'parent_id'])
+    hole_seq_col = find_col(df_hole, ['hole_seq', 'hole_id', 'id'])
+    hole_no_col = find_col(df_hole, ['hole_no', 'no', 'number'])
+    hole_par_col = find_col(df_hole, ['par'])
+    hole_dist_col = find_col(df_hole, ['distance_m', 'distance', 'dist'])
+
+    if not hole_course_id_col:
+        print(f"[ERROR] Cannot find Hole's Course ID column in {df_hole.columns}")
+        return None, None
+
+    # Course → CC 병합 (타입 불일치 방지를 위해 키는 문자열로 변환)
+    print(f"[DEBUG] Merging on {cc_id_col} (CC) and {course_cc_id_col} (Course)")
+    cc = pd.DataFrame({
+        'cc_id': df_cc[cc_id_col].astype(str),
+        'cc_name': _column_or_default(df_cc, cc_name_col, 'Unknown CC'),
+    })
+    courses_df = pd.DataFrame({
+        'cc_id': df_course[course_cc_id_col].astype(str),
+        'course_id': df_course[course_id_col].astype(str),
+        'course_name': _column_or_default(df_course, course_name_col, 'Unknown Course'),
+    }).merge(cc, on='cc_id', how='left')[COURSE_COLUMNS]
+
+    # Hole → Course 병합으로 cc_id 결정 (코스가 중복되면 첫 번째 행 기준)
+    course_cc = courses_df[['course_id', 'cc_id']].drop_duplicates(subset='course_id', keep='first')
+    holes_df = pd.DataFrame({
+        'hole_id': (df_hole[hole_seq_col].astype(str) if hole_seq_col
+                    else pd.Series([generate_uuid() for _ in range(len(df_hole))], index=df_hole.index)),
+        'course_id': df_hole[hole_course_id_col].astype(str),
+        'hole_no': _column_or_default(df_hole, hole_no_col, 0),
+        'par': _column_or_default(df_hole, hole_par_col, 4),
+        'distance': _column_or_default(df_hole, hole_dist_col, 350),
+    }).merge(course_cc, on='course_id', how='left')
+    holes_df['cc_id'] = holes_df['cc_id'].fillna("UNKNOWN")
+    holes_df = holes_df[HOLE_COLUMNS]
+
+    return courses_df, holes_df
+
+def course_cache_path(file_path):
+    """엑셀 파일 옆에 두는 파싱 결과 캐시 경로"""
+    return f"{file_path}.course_cache.pkl"
+
+def read_course_master_cached(file_path, use_cache=True, rebuild_cache=False):
+    """
+    read_course_master 결과를 엑셀 옆 pickle 캐시에서 읽거나, 없으면 파싱 후 저장합니다.
+
+    캐시 키는 (엑셀 내용 해시, COURSE_LOADER_VERSION)이며, 엑셀이 바뀌거나 로더 출력 형식이
+    바뀌면 자동으로 다시 파싱합니다.
+
+    Args:
+        use_cache: False면 캐시를 읽지도 쓰지도 않음 (--no-cache)
+        rebuild_cache: True면 기존 캐시를 무시하고 다시 파싱해 저장 (--rebuild-cache)
+    """
+    if not use_cache:
+        return read_course_master(file_path)
+
+    cache_file = course_cache_path(file_path)
+    cache_key = {'sha256': file_sha256(file_path), 'loader_version': COURSE_LOADER_VERSION}
+
+    if not rebuild_cache and os.path.exists(cache_file):
+        try:
+            cached = pd.read_pickle(cache_file)
+            if cached.get('key') == cache_key:
+                print(f"[INFO] Loaded course master from cache: {cache_file}")
+                return cached['courses'], cached['holes']
+            print("[INFO] Course cache is stale, re-parsing Excel.")
+        except Exception as e:
+            print(f"[WARN] Cannot read course cache ({e}), re-parsing Excel.")
+
+    courses_df, holes_df = read_course_master(file_path)
+    if courses_df is not None:
+        # 임시 파일에 쓴 뒤 교체하여 중단 시에도 깨진 캐시가 남지 않게 함
+        tmp_file = f"{cache_file}.tmp"
+        pd.to_pickle({'key': cache_key, 'courses': courses_df, 'holes': holes_df}, tmp_file)
+        os.replace(tmp_file, cache_file)
+        print(f"[INFO] Saved course cache: {cache_file}")
+    return courses_df, holes_df
+
+def load_golf_courses(use_cache=True, rebuild_cache=False):
+    """
+    Excel 파일에서 골프장 및 홀 정보를 읽어옵니다.
+
+    파싱 결과는 엑셀 옆에 캐시되며 (read_course_master_cached), 엑셀이 바뀌면 다시 파싱합니다.
+
+    Returns:
+        (courses_df, course_index) - course_index는 build_course_index 참고
+    """
     file_path = os.path.join(EXAMPLES_DIR, EXCEL_FILE)
     if not os.path.exists(file_path):
         print(f"[ERROR] Excel file not found: {file_path}")
         return None, None
 
     try:
-        xl = pd.ExcelFile(file_path)
-        print(f"[INFO] Sheets: {xl.sheet_names}")
-        
-        # 시트 이름 정규화 (공백 제거)
-        sheet_map = {name.strip(): name for name in xl.sheet_names}
-        print(f"[DEBUG] Normalized Sheets: {list(sheet_map.keys())}")
-
-        # 1. CC Master 읽기
-        if 'CC_Master' in sheet_map:
-            df_cc = pd.read_excel(file_path, sheet_name=sheet_map['CC_Master'])
-            df_cc.columns = [c.lower() for c in df_cc.columns]
-            print(f"[INFO] CC Columns: {list(df_cc.columns)}")
-        else:
-            print("[ERROR] 'CC_Master' sheet not found")
+        with pipeline_metrics.stage('excel_load'):
+            courses_df, holes_df = read_course_master_cached(file_path, use_cache, rebuild_cache)
+        if courses_df is None:
             return None, None
 
-        # 2. Course Master 읽기
-        if 'Course_Master' in sheet_map:
-            df_course = pd.read_excel(file_path, sheet_name=sheet_map['Course_Master'])
-            df_course.columns = [c.lower() for c in df_course.columns]
-            print(f"[INFO] Course Columns: {list(df_course.columns)}")
-        else:
-            print("[ERROR] 'Course_Master' sheet not found")
-            return None, None
-            
-        # 3. Hole Master 읽기
-        # Hole_Master 시트명이 'Hole_Master ' 처럼 공백이 있을 수 있음
-        if 'Hole_Master' in sheet_map:
-            df_hole = pd.read_excel(file_path, sheet_name=sheet_map['Hole_Master'])
-            df_hole.columns = [c.lower() for c in df_hole.columns]
-            print(f"[INFO] Hole Columns: {list(df_hole.columns)}")
-        else:
-            # 혹시 다른 이름일 수 있으니 확인
-            possible_names = [s for s in sheet_map.keys() if 'Hole' in s]
-            if possible_names:
-                print(f"[WARN] 'Hole_Master' not found, trying: {possible_names[0]}")
-                df_hole = pd.read_excel(file_path, sheet_name=sheet_map[possible_names[0]])
-                df_hole.columns = [c.lower() for c in df_hole.columns]
-            else:
-                print("[ERROR] 'Hole_Master' sheet not found")
-                return None, None
-
-        # 컬럼 찾기 헬퍼 함수
-        def find_col(df, candidates):
-            for col in candidates:
-                if col in df.columns:
-                    return col
-            return None
-
-        # CC ID 컬럼 찾기
-        cc_id_col = find_col(df_cc, ['cc_seq', 'cc_id', 'id', 'no'])
-        cc_name_col = find_col(df_cc, ['cc_name_ko', 'cc_name', 'name', 'title'])
-        
-        if not cc_id_col:
-            print(f"[ERROR] Cannot find CC ID column in {df_cc.columns}")
-            return None, None
-            
-        # Course ID 컬럼 찾기
-        course_id_col = find_col(df_course, ['course_seq', 'course_id', 'id'])
-        course_cc_id_col = find_col(df_course, ['cc_seq', 'cc_id', 'parent_id'])
-        course_name_col = find_col(df_course, ['course_name_ko', 'course_name', 'name'])
-        
-        if not course_id_col or not course_cc_id_col:
-            print(f"[ERROR] Cannot find Course ID columns in {df_course.columns}")
-            return None, None
-
-        # 데이터프레임 병합
-        print(f"[DEBUG] Merging on {cc_id_col} (CC) and {course_cc_id_col} (Course)")
-        
-        # 타입 불일치 방지를 위해 문자열로 변환
-        df_cc[cc_id_col] = df_cc[cc_id_col].astype(str)
-        df_course[course_cc_id_col] = df_course[course_cc_id_col].astype(str)
-        
-        courses_df = pd.merge(df_course, df_cc, left_on=course_cc_id_col, right_on=cc_id_col, how='left')
-        
-        # 필요한 컬럼만 추출하여 딕셔너리 리스트로 변환
-        courses = []
-        for _, row in courses_df.iterrows():
-            courses.append({
-                'cc_id': str(row.get(cc_id_col)),
-                'cc_name': row.get(cc_name_col, 'Unknown CC'),
-                'course_id': str(row.get(course_id_col)),
-                'course_name': row.get(course_name_col, 'Unknown Course')
-            })
-            
-        # 홀 정보도 매핑 준비
-        hole_course_id_col = find_col(df_hole, ['course_seq', 'course_id', 'parent_id'])
-        hole_seq_col = find_col(df_hole, ['hole_seq', 'hole_id', 'id'])
-        hole_no_col = find_col(df_hole, ['hole_no', 'no', 'number'])
-        hole_par_col = find_col(df_hole, ['par'])
-        hole_dist_col = find_col(df_hole, ['distance_m', 'distance', 'dist'])
-
-        if not hole_course_id_col:
-             print(f"[ERROR] Cannot find Hole's Course ID column in {df_hole.columns}")
-             return None, None
-
-        holes = []
-        for _, row in df_hole.iterrows():
-            # cc_id를 찾기 위해 course_seq로 courses_df 참조
-            course_val = row.get(hole_course_id_col)
-            course_info = courses_df[courses_df[course_id_col] == course_val]
-            
-            if not course_info.empty:
-                cc_id = str(course_info.iloc[0][cc_id_col])
-            else:
-                cc_id = "UNKNOWN"
-                
-            holes.append({
-                'hole_id': str(row.get(hole_seq_col)) if hole_seq_col else generate_uuid(),
-                'cc_id': cc_id,
-                'course_id': str(course_val),
-                'hole_no': row.get(hole_no_col, 0),
-                'par': row.get(hole_par_col, 4),
-                'distance': row.get(hole_dist_col, 350)
-            })
-            
-        print(f"[INFO] Loaded {len(courses)} courses and {len(holes)} holes.")
-        return courses, holes
+        with pipeline_metrics.stage('course_index'):
+            course_index = build_course_index(courses_df, holes_df)
+        print(f"[INFO] Loaded {len(courses_df)} courses and {len(holes_df)} holes "
+              f"({len(course_index['holes_by_course'])} courses with 18 holes).")
+        return courses_df, course_index
 
     except Exception as e:
         print(f"[ERROR] Failed to load Excel: {e}")
@@ -173,7 +245,41 @@ def load_golf_courses():
         traceback.print_exc()
         return None, None
 
-def generate_uuid():
+def build_course_index(courses_df, holes_df):
+    """
+    라운드 생성용 코스 인덱스를 한 번만 구성합니다.
+
+    Returns:
+        {
+            'holes_by_course': {(cc_id, course_id): 홀 번호 순 18홀 tuple},
+            'cc_by_course': {course_id: cc_id},
+        }
+        18홀 미만인 코스는 holes_by_course에 넣지 않습니다 (라운드 생성 시 가상 홀 사용).
+    """
+    keys = ['cc_id', 'course_id']
+    ordered = holes_df.sort_values(keys + ['hole_no'], kind='stable')
+    sizes = ordered.groupby(keys, sort=False)['hole_id'].transform('size')
+    ordered = ordered[sizes >= 18].groupby(keys, sort=False).head(18)
+
+    # 컬럼 단위로 파이썬 기본 타입으로 변환 (JSON 직렬화 시 numpy 타입 방지)
+    records = [
+        dict(zip(HOLE_COLUMNS, values))
+        for values in zip(*(ordered[col].tolist() for col in HOLE_COLUMNS))
+    ]
+
+    holes_by_course = {}
+    for start in range(0, len(records), 18):
+        course_holes = tuple(records[start:start + 18])
+        holes_by_course[(course_holes[0]['cc_id'], course_holes[0]['course_id'])] = course_holes
+
+    course_cc = courses_df.drop_duplicates(subset='course_id', keep='first')
+    cc_by_course = dict(zip(course_cc['course_id'].tolist(), course_cc['cc_id'].tolist()))
+
+    return {'holes_by_course': holes_by_course, 'cc_by_course': cc_by_course}
+
+def generate_uuid(rng=None):
+    if rng is not None:
+        return generate_uuid_batch(rng, 1)[0]
     return str(uuid.uuid4())
 
 def random_date(start_date, end_date):
@@ -341,169 +447,538 @@ def generate_shot_data(hole_score_id, user_id, par, strokes, start_time):
         
     return shots, putts, current_time, first_putt_dist, first_putt_made
 
-def generate_round_data(scenario, courses, all_holes):
-    """시나리오에 따른 라운드 데이터를 생성합니다."""
-    rounds_data = []
+# --- 배치(컬럼) 샷 생성 ---
+# generate_shot_data와 동일한 분포/스키마를 유지하면서, 여러 홀의 샷을 한 번에
+# NumPy 컬럼 배열로 뽑고 dict는 직렬화 직전에만 만듭니다.
+
+# 샷 종류: 티샷(파4 이상), 티샷(파3), 세컨/서드 샷, 퍼팅
+KIND_TEE_LONG, KIND_TEE_SHORT, KIND_APPROACH, KIND_PUTT = range(4)
+
+# 샷 종류별 고정 필드 (club_type은 어프로치만 랜덤)
+SHOT_KIND_FIELDS = (
+    {"club_type": "CLUB_D", "shot_type": "SHOT_T", "lie": "LIE_TEE", "is_putt": False},
+    {"club_type": "CLUB_I7", "shot_type": "SHOT_T", "lie": "LIE_TEE", "is_putt": False},
+    {"club_type": None, "shot_type": "SHOT_A", "lie": "LIE_FAIR", "is_putt": False},
+    {"club_type": "CLUB_P", "shot_type": "SHOT_P", "lie": "LIE_GREEN", "is_putt": True},
+)
+APPROACH_CLUBS = np.array(["CLUB_I5", "CLUB_I7", "CLUB_I9", "CLUB_PW"])
+
+# 센서 컬럼별 샷 종류 순서대로의 (low, high) 범위 또는 고정값.
+# None은 종류별로 별도 계산되는 값 (CARRY/TOTAL/FROM_PIN 파생값)
+SHOT_COLUMN_SPECS = {
+    "TOTAL":        ((200, 250), (130, 180), (100, 150), None),
+    "CARRY":        (None, None, (90, 140), 0),
+    "HEIGHT":       ((20, 30), (20, 30), (15, 25), 0),
+    "LAND_ANG":     ((30, 45), (30, 45), (40, 50), 0),
+    "SIDE":         ((-10, 10), (-10, 10), (-5, 5), (-0.1, 0.1)),
+    "SIDE_TOT":     ((-15, 15), (-15, 15), (-10, 10), (-0.1, 0.1)),
+    "HANG_TIME":    ((5, 7), (5, 7), (4, 6), 0),
+    "FROM_PIN":     ((100, 200), (5, 15), (10, 150), None),
+    # 센서 데이터 (Ball)
+    "BALL_SPEED":   ((60, 75), (60, 75), (40, 60), (2, 5)),
+    "LAUNCH_ANG":   ((10, 15), (10, 15), (15, 25), 0),
+    "LAUNCH_DIR":   ((-2, 2), (-2, 2), (-2, 2), (-1, 1)),
+    "SPIN_RATE":    ((2000, 3000), (2000, 3000), (4000, 7000), (10, 50)),
+    "SPIN_AXIS":    ((-5, 5), (-5, 5), (-5, 5), 0),
+    "BACK_SPIN":    ((2000, 3000), (2000, 3000), (4000, 7000), (10, 50)),
+    "SIDE_SPIN":    ((-500, 500), (-500, 500), (-300, 300), 0),
+    "SMASH_FAC":    ((1.4, 1.5), (1.4, 1.5), (1.3, 1.4), 1.0),
+    # 센서 데이터 (Club)
+    "ATTACK_ANG":   ((-2, 2), (-2, 2), (-4, -1), 0),
+    "CLUB_PATH":    ((-3, 3), (-3, 3), (-2, 2), (-1, 1)),
+    "DYN_LOFT":     ((10, 15), (10, 15), (20, 30), 3),
+    "SPIN_LOFT":    ((10, 15), (10, 15), (20, 30), 3),
+    "FACE_ANG":     ((-2, 2), (-2, 2), (-2, 2), (-1, 1)),
+    "FACE_TO_PATH": ((-2, 2), (-2, 2), (-2, 2), 0),
+    "CLUB_SPEED":   ((40, 50), (40, 50), (30, 40), (1, 3)),
+}
+
+# 샷 종류 × 컬럼 범위 테이블 (고정/파생값은 0~0)
+SPEC_LOW, SPEC_HIGH = (
+    np.array([
+        [spec[bound] if isinstance(spec, tuple) else 0.0 for spec in (specs[kind] for specs in SHOT_COLUMN_SPECS.values())]
+        for kind in range(len(SHOT_KIND_FIELDS))
+    ])
+    for bound in (0, 1)
+)
+
+# 샷 JSON 키 순서 (generate_shot_data와 동일)
+SHOT_KEYS = (
+    "shot_id", "hole_score_id", "user_id", "shot_number", "club_type", "shot_type", "lie",
+    "is_putt", "putt_made", "putt_length", "is_mulligan", "shot_at",
+) + tuple(SHOT_COLUMN_SPECS)
+
+
+def generate_uuid_batch(rng, count):
+    """rng에서 UUID4 형식의 ID를 count개 생성합니다 (시드 고정 시 재현 가능)."""
+    raw = np.frombuffer(rng.bytes(16 * count), dtype=np.uint8).reshape(count, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hexes = raw.tobytes().hex()
+    return [
+        f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        for h in (hexes[i:i + 32] for i in range(0, 32 * count, 32))
+    ]
+
+
+def generate_shot_columns(rng, pars, strokes):
+    """
+    여러 홀의 샷 데이터를 컬럼 단위로 한 번에 생성합니다.
+
+    홀 하나, 라운드(18홀) 또는 시나리오 전체의 홀을 넘길 수 있으며,
+    분포는 generate_shot_data와 동일합니다.
+
+    Returns:
+        (columns, hole_stats) - columns는 샷 단위 NumPy 배열 dict,
+        hole_stats는 홀 단위 putts / first_putt_distance / first_putt_made 배열
+    """
+    pars = np.asarray(pars)
+    strokes = np.asarray(strokes)
+    num_holes = len(pars)
+
+    putts = rng.integers(1, 4, size=num_holes)  # 1~3 퍼트
+    real_strokes = np.maximum(strokes - putts, 1)
+    shots_per_hole = real_strokes + putts
+
+    # 샷 단위 레이아웃: 홀 번호, 홀 내 순번, 종류
+    hole_idx = np.repeat(np.arange(num_holes), shots_per_hole)
+    hole_start = np.cumsum(shots_per_hole) - shots_per_hole
+    shot_no = np.arange(len(hole_idx)) - hole_start[hole_idx] + 1
+    putt_no = shot_no - real_strokes[hole_idx]  # 1부터 시작하면 퍼팅
+    kinds = np.full(len(hole_idx), KIND_APPROACH)
+    kinds[shot_no == 1] = np.where(pars[hole_idx][shot_no == 1] > 3, KIND_TEE_LONG, KIND_TEE_SHORT)
+    kinds[putt_no >= 1] = KIND_PUTT
+    is_putt = kinds == KIND_PUTT
+    is_last = shot_no == shots_per_hole[hole_idx]
+
+    columns = {
+        "hole_index": hole_idx,
+        "shot_number": shot_no,
+        "kind": kinds,
+        "gap_seconds": rng.integers(120, 301, size=len(hole_idx)),  # 샷 간격 (약 2~5분)
+        "club_type": APPROACH_CLUBS[rng.integers(0, len(APPROACH_CLUBS), size=len(hole_idx))],
+        "putt_made": is_putt & is_last,
+    }
+
+    # 모든 센서 컬럼을 (샷 수 × 컬럼 수) 행렬로 한 번에 추출
+    metrics = np.round(rng.uniform(SPEC_LOW[kinds], SPEC_HIGH[kinds]), 2)
+    for col, name in enumerate(SHOT_COLUMN_SPECS):
+        columns[name] = metrics[:, col]
+
+    # 파생 컬럼
+    tee = (kinds == KIND_TEE_LONG) | (kinds == KIND_TEE_SHORT)
+    columns["CARRY"][tee] = np.round(columns["TOTAL"][tee] * 0.9, 2)
+
+    first_putt = is_putt & (putt_no == 1)
+    putt_length = np.round(np.where(
+        first_putt, rng.uniform(1.0, 15.0, size=len(hole_idx)), rng.uniform(0.1, 2.0, size=len(hole_idx))
+    ), 2)
+    putt_roll = np.round(putt_length - rng.uniform(0.1, 1.0, size=len(hole_idx)), 2)
+    putt_left = np.round(rng.uniform(0.1, 1.5, size=len(hole_idx)), 2)
+    columns["putt_length"] = np.where(is_putt, putt_length, 0.0)
+    columns["TOTAL"] = np.where(is_putt, np.where(is_last, putt_length, putt_roll), columns["TOTAL"])
+    columns["FROM_PIN"] = np.where(is_putt, np.where(is_last, 0.0, putt_left), columns["FROM_PIN"])
+
+    hole_stats = {
+        "putts": putts,
+        "first_putt_distance": putt_length[first_putt],
+        "first_putt_made": putts == 1,
+    }
+    return columns, hole_stats
+
+
+def materialize_shots(columns, hole_score_ids, user_id, start_time, shot_ids, record=None):
+    """
+    컬럼 배열을 기존 JSON 스키마와 동일한 샷 dict 리스트로 변환합니다.
+
+    record에 records.Shot을 넘기면 dict 대신 슬롯 레코드로 만듭니다 (필드 순서가 SHOT_KEYS와 같음).
+
+    Returns:
+        (shots, end_time) - end_time은 마지막 샷 시각 (다음 홀/라운드 시작 기준)
+    """
+    n = len(columns["kind"])
+    if n == 0:
+        return [], start_time
+
+    offsets = np.cumsum(columns["gap_seconds"])
+    # 초 단위 간격이라 마이크로초는 라운드 내내 start_time과 같음 (isoformat 표기 유지)
+    unit = 'us' if start_time.microsecond else 's'
+    shot_times = np.datetime_as_string(
+        np.datetime64(start_time.replace(tzinfo=None), 'us') + offsets.astype('timedelta64[s]'), unit=unit
+    ).tolist()
+    if start_time.tzinfo is not None:
+        offset_str = start_time.isoformat()[26 if start_time.microsecond else 19:]
+        shot_times = [t + offset_str for t in shot_times]
+
+    kinds = columns["kind"]
+    kind_rows = [np.flatnonzero(kinds == kind).tolist() for kind in range(len(SHOT_KIND_FIELDS))]
+    clubs = columns["club_type"].astype(object)
+    for kind, fixed in enumerate(SHOT_KIND_FIELDS):
+        if fixed["club_type"]:
+            clubs[kinds == kind] = fixed["club_type"]
+
+    # shot_type / lie 컬럼이 있으면 종류별 고정값 대신 사용 (generate_population의 칩샷/러프 등)
+    shot_types = (columns["shot_type"] if "shot_type" in columns
+                  else np.array([f["shot_type"] for f in SHOT_KIND_FIELDS], dtype=object)[kinds]).tolist()
+    lies = (columns["lie"] if "lie" in columns
+            else np.array([f["lie"] for f in SHOT_KIND_FIELDS], dtype=object)[kinds]).tolist()
+    putt_flags = (kinds == KIND_PUTT).tolist()
+    putt_made = columns["putt_made"].tolist()
+
+    # 센서 컬럼: 고정값은 원래 타입(int/float) 그대로 유지
+    metric_values = []
+    for name, specs in SHOT_COLUMN_SPECS.items():
+        values = columns[name].tolist()
+        for kind, spec in enumerate(specs):
+            if spec is not None and not isinstance(spec, tuple):
+                for i in kind_rows[kind]:
+                    values[i] = spec
+        metric_values.append(values)
+    from_pin = metric_values[list(SHOT_COLUMN_SPECS).index("FROM_PIN")]
+    for i in kind_rows[KIND_PUTT]:
+        if putt_made[i]:
+            from_pin[i] = 0
+
+    hole_ids = [hole_score_ids[i] for i in columns["hole_index"].tolist()]
+    base_rows = zip(
+        shot_ids,
+        hole_ids,
+        [user_id] * n,
+        columns["shot_number"].tolist(),
+        clubs.tolist(),
+        shot_types,
+        lies,
+        putt_flags,
+        putt_made,
+        columns["putt_length"].tolist(),
+        [False] * n,
+        shot_times,
+        *metric_values,
+    )
+    if record is None:
+        shots = [dict(zip(SHOT_KEYS, row)) for row in base_rows]
+    else:
+        shots = [record(*row) for row in base_rows]
+
+    end_time = start_time + timedelta(seconds=int(offsets[-1]))
+    return shots, end_time
+
+def generate_holes_batch(rng, target_holes, player, start_time, id_key=None):
+    """
+    한 라운드(18홀)의 스코어와 샷을 배치로 생성합니다.
+
+    id_key=(seed, *경로)를 넘기면 홀/샷 ID를 rng 대신 경로 기반 uuid5로 만듭니다.
+
+    Returns:
+        (hole_results, shots, end_time) - hole_results는 홀별
+        (hole_score_id, strokes, putts, fairway_hit, first_putt_distance, first_putt_made)
+    """
+    pars = [hole.get('par', 4) for hole in target_holes]
+    strokes = (np.asarray(pars) + rng.integers(-1, 4, size=len(pars))).tolist()
+    if id_key is None:
+        hole_score_ids = generate_uuid_batch(rng, len(pars))
+    else:
+        hole_score_ids = entity_uuids(id_key[0], id_key[1:] + ('hole',), [(i + 1,) for i in range(len(pars))])
+    fairway_draws = (rng.random(len(pars)) < 0.5).tolist()
+
+    columns, hole_stats = generate_shot_columns(rng, pars, strokes)
+    if id_key is None:
+        shot_ids = generate_uuid_batch(rng, len(columns["kind"]))
+    else:
+        shot_ids = entity_uuids(id_key[0], id_key[1:] + ('shot',),
+                                zip((columns["hole_index"] + 1).tolist(), columns["shot_number"].tolist()))
+    shots, end_time = materialize_shots(columns, hole_score_ids, player, start_time, shot_ids)
+
+    hole_results = list(zip(
+        hole_score_ids,
+        strokes,
+        hole_stats["putts"].tolist(),
+        [hit if par > 3 else None for par, hit in zip(pars, fairway_draws)],
+        hole_stats["first_putt_distance"].tolist(),
+        hole_stats["first_putt_made"].tolist(),
+    ))
+    return hole_results, shots, end_time
+
+# 시드 생성 시 플레이 날짜 범위 (end_date 이전 일수)와 티오프 시간대
+SEEDED_PLAY_DAYS = 90
+SEEDED_TEE_HOURS = (6, 18)
+
+def default_holes(cc_id, course_id, pars):
+    """코스 마스터에 홀 정보가 없는 코스의 기본 18홀"""
+    return [
+        {'hole_id': f"{cc_id}_{course_id}_{h_no}", 'hole_no': h_no, 'par': par, 'distance': 350}
+        for h_no, par in zip(range(1, 19), pars)
+    ]
+
+def build_round_record(scenario, course, target_holes, player, round_id, game_session_id, simulator_id,
+                       round_start_time, hole_results, shots_data, end_time):
+    """홀 결과와 샷으로 라운드 레코드(홀 목록, 라운드 집계 포함)를 만듭니다."""
+    # 통계 집계 변수
+    total_score = 0
+    total_putts = 0
+    fairways_hit = 0
+    fairways_attempted = 0
+    greens_in_regulation = 0
+    mulligans_used = 0
+    birdies_or_better = 0
+    pars_count = 0
+    bogeys = 0
+    double_bogey_or_worse = 0
+    
+    holes_data = []
     
+    for hole, (hole_score_id, strokes, hole_putts, is_fairway_hit, f_putt_dist, f_putt_made) in zip(target_holes, hole_results):
+        par = hole.get('par', 4)
+        
+        # 홀 통계 계산
+        is_gir = (strokes - hole_putts) <= (par - 2)
+        
+        holes_data.append({
+            "hole_score_id": hole_score_id,
+            "round_id": round_id,
+            "hole_number": hole.get('hole_no'),
+            "hole_id": hole.get('hole_id'),
+            "par": par,
+            "distance": hole.get('distance'),
+            "strokes": strokes,
+            "putts": hole_putts,
+            "fairway_hit": is_fairway_hit,
+            "green_in_regulation": is_gir,
+            "penalties": 0, # 단순화
+            "penalty_details": [],
+            "first_putt_distance": f_putt_dist,
+            "first_putt_made": f_putt_made
+        })
+        
+        # 라운드 통계 누적
+        total_score += strokes
+        total_putts += hole_putts
+        if par > 3:
+            fairways_attempted += 1
+            if is_fairway_hit: fairways_hit += 1
+        if is_gir: greens_in_regulation += 1
+        
+        if strokes <= par - 1: birdies_or_better += 1
+        elif strokes == par: pars_count += 1
+        elif strokes == par + 1: bogeys += 1
+        else: double_bogey_or_worse += 1
+    
+    return {
+        "game_session_id": game_session_id,
+        "game_mode": scenario['game_mode'],
+        "game_rule": scenario['game_rule'],
+        "simulator_id": simulator_id,
+        "round_id": round_id,
+        "user_id": player,
+        "team_id": None, # 개인전 가정
+        "played_at": round_start_time.isoformat(),
+        "cc_id": course['cc_id'],
+        "cc_name": course.get('cc_name'),
+        "course_id": course['course_id'],
+        "course_name": course.get('course_name'),
+        "tee_box": "TB_WHITE",
+        "total_par": sum(h.get('par', 4) for h in target_holes),
+        "total_score": total_score,
+        "rank": 1, # 임시
+        "ranking_eligible": True,
+        "total_putts": total_putts,
+        "fairways_hit": fairways_hit,
+        "fairways_attempted": fairways_attempted,
+        "greens_in_regulation": greens_in_regulation,
+        "mulligans_used": mulligans_used,
+        "birdies_or_better": birdies_or_better,
+        "pars": pars_count,
+        "bogeys": bogeys,
+        "double_bogey_or_worse": double_bogey_or_worse,
+        "play_end_time": end_time.isoformat(),
+        "holes": holes_data,
+        "shots": shots_data
+    }
+
+def generate_seeded_round(scenario, round_index, courses, course_index, seed, end_date):
+    """
+    시나리오의 round_index번째 라운드(플레이어별 레코드 목록)를 시드만으로 생성합니다.
+
+    코스 선택은 (시나리오), 코스/시작 시각/세션은 (시나리오, 라운드),
+    홀/샷은 (시나리오, 라운드, 플레이어) 경로의 독립 스트림에서 뽑고 ID는 경로의 uuid5이므로,
+    다른 라운드를 생성하지 않고도 이 라운드만 다시 만들 수 있습니다.
+    """
+    name = scenario['name']
+    scenario_rng = entity_rng(seed, name)
+    picks = scenario_rng.choice(len(courses), size=min(scenario['num_courses'], len(courses)), replace=False)
+    selected_courses = [courses[i] for i in picks.tolist()]
+
+    round_rng = entity_rng(seed, name, round_index)
+    course = selected_courses[int(round_rng.integers(len(selected_courses)))]
+    target_holes = course_index['holes_by_course'].get((course['cc_id'], course['course_id']))
+    if target_holes is None:
+        target_holes = default_holes(course['cc_id'], course['course_id'],
+                                     round_rng.choice([3, 4, 4, 4, 4, 4, 4, 5, 5], size=18).tolist())
+
+    # end_date 이전 90일 중 하루, 06~18시 사이 시작
+    day = int(round_rng.integers(SEEDED_PLAY_DAYS))
+    second = int(round_rng.integers(SEEDED_TEE_HOURS[0] * 3600, SEEDED_TEE_HOURS[1] * 3600))
+    round_start_time = end_date - timedelta(days=SEEDED_PLAY_DAYS - day, seconds=-second)
+
+    game_session_id = entity_uuid(seed, name, round_index, 'session') if len(scenario['players']) > 1 else None
+    simulator_id = "SIM_001" if scenario['game_mode'] != 'SINGLE' else None
+
+    records = []
+    for player in scenario['players']:
+        key = (name, round_index, player)
+        hole_results, shots_data, end_time = generate_holes_batch(
+            entity_rng(seed, *key), target_holes, player, round_start_time, id_key=(seed,) + key
+        )
+        records.append(build_round_record(
+            scenario, course, target_holes, player, entity_uuid(seed, *key, 'round'), game_session_id,
+            simulator_id, round_start_time, hole_results, shots_data, end_time,
+        ))
+    return records
+
+def generate_round_data(scenario, courses, course_index, rng=None):
+    """시나리오에 따른 라운드 데이터를 리스트로 생성합니다."""
+    return list(iter_round_data(scenario, courses, course_index, rng=rng))
+
+def iter_round_data(scenario, courses, course_index, rng=None, seed=None, end_date=None):
+    """
+    시나리오에 따른 라운드 데이터를 하나씩 생성합니다 (제너레이터).
+
+    rng(numpy Generator)를 넘기면 홀/샷을 배치 모드로 생성합니다.
+    seed를 넘기면 라운드마다 generate_seeded_round로 생성합니다 (rng는 사용하지 않음).
+    end_date: 플레이 날짜 범위의 끝 (기본: 현재 시각)
+    """
+    if seed is not None:
+        end_date = end_date or datetime.combine(date.today(), datetime.min.time())
+        for i in range(scenario['num_rounds']):
+            yield from generate_seeded_round(scenario, i, courses, course_index, seed, end_date)
+        return
+
     selected_courses = random.sample(courses, min(scenario['num_courses'], len(courses)))
     
-    start_date = datetime.now() - timedelta(days=90)
-    end_date = datetime.now()
+    end_date = end_date or datetime.now()
+    start_date = end_date - timedelta(days=90)
     
     for i in range(scenario['num_rounds']):
         course = random.choice(selected_courses)
         cc_id = course['cc_id']
         course_id = course['course_id']
         
-        target_holes = [h for h in all_holes if h.get('cc_id') == cc_id and h.get('course_id') == course_id]
+        target_holes = course_index['holes_by_course'].get((cc_id, course_id))
         
-        if len(target_holes) < 18:
-            target_holes = []
-            for h_no in range(1, 19):
-                target_holes.append({
-                    'hole_id': f"{cc_id}_{course_id}_{h_no}",
-                    'hole_no': h_no,
-                    'par': random.choice([3, 4, 4, 4, 4, 4, 4, 5, 5]),
-                    'distance': 350
-                })
-        else:
-            target_holes = target_holes[:18]
+        if target_holes is None:
+            target_holes = default_holes(cc_id, course_id,
+                                         [random.choice([3, 4, 4, 4, 4, 4, 4, 5, 5]) for _ in range(18)])
             
-        game_session_id = generate_uuid() if len(scenario['players']) > 1 else None
+        game_session_id = generate_uuid(rng) if len(scenario['players']) > 1 else None
         simulator_id = "SIM_001" if scenario['game_mode'] != 'SINGLE' else None
         
         round_start_time = random_date(start_date, end_date)
         
         for player in scenario['players']:
-            round_id = generate_uuid()
-            
-            # 통계 집계 변수
-            total_score = 0
-            total_putts = 0
-            fairways_hit = 0
-            fairways_attempted = 0
-            greens_in_regulation = 0
-            mulligans_used = 0
-            birdies_or_better = 0
-            pars_count = 0
-            bogeys = 0
-            double_bogey_or_worse = 0
-            
-            holes_data = []
-            shots_data = []
+            round_id = generate_uuid(rng)
             
             current_hole_time = round_start_time
             
-            for hole in target_holes:
-                par = hole.get('par', 4)
-                score_diff = random.randint(-1, 3)
-                strokes = par + score_diff
-                
-                hole_score_id = generate_uuid()
-                
-                # 샷 데이터 생성
-                hole_shots, hole_putts, next_time_val, f_putt_dist, f_putt_made = generate_shot_data(hole_score_id, player, par, strokes, current_hole_time)
-                current_hole_time = next_time_val # 다음 홀 시작 시간 업데이트
-                
-                shots_data.extend(hole_shots)
-                
-                # 홀 통계 계산
-                is_fairway_hit = random.choice([True, False]) if par > 3 else None
-                is_gir = (strokes - hole_putts) <= (par - 2)
-                
-                holes_data.append({
-                    "hole_score_id": hole_score_id,
-                    "round_id": round_id,
-                    "hole_number": hole.get('hole_no'),
-                    "hole_id": hole.get('hole_id'),
-                    "par": par,
-                    "distance": hole.get('distance'),
-                    "strokes": strokes,
-                    "putts": hole_putts,
-                    "fairway_hit": is_fairway_hit,
-                    "green_in_regulation": is_gir,
-                    "penalties": 0, # 단순화
-                    "penalty_details": [],
-                    "first_putt_distance": f_putt_dist,
-                    "first_putt_made": f_putt_made
-                })
-                
-                # 라운드 통계 누적
-                total_score += strokes
-                total_putts += hole_putts
-                if par > 3:
-                    fairways_attempted += 1
-                    if is_fairway_hit: fairways_hit += 1
-                if is_gir: greens_in_regulation += 1
-                
-                if strokes <= par - 1: birdies_or_better += 1
-                elif strokes == par: pars_count += 1
-                elif strokes == par + 1: bogeys += 1
-                else: double_bogey_or_worse += 1
-            
-            round_record = {
-                "game_session_id": game_session_id,
-                "game_mode": scenario['game_mode'],
-                "game_rule": scenario['game_rule'],
-                "simulator_id": simulator_id,
-                "round_id": round_id,
-                "user_id": player,
-                "team_id": None, # 개인전 가정
-                "played_at": round_start_time.isoformat(),
-                "cc_id": cc_id,
-                "cc_name": course.get('cc_name'),
-                "course_id": course_id,
-                "course_name": course.get('course_name'),
-                "tee_box": "TB_WHITE",
-                "total_par": sum(h.get('par', 4) for h in target_holes),
-                "total_score": total_score,
-                "rank": 1, # 임시
-                "ranking_eligible": True,
-                "total_putts": total_putts,
-                "fairways_hit": fairways_hit,
-                "fairways_attempted": fairways_attempted,
-                "greens_in_regulation": greens_in_regulation,
-                "mulligans_used": mulligans_used,
-                "birdies_or_better": birdies_or_better,
-                "pars": pars_count,
-                "bogeys": bogeys,
-                "double_bogey_or_worse": double_bogey_or_worse,
-                "play_end_time": current_hole_time.isoformat(),
-                "holes": holes_data,
-                "shots": shots_data
-            }
-            rounds_data.append(round_record)
+            if rng is not None:
+                hole_results, shots_data, current_hole_time = generate_holes_batch(rng, target_holes, player, current_hole_time)
+            else:
+                hole_results = []
+                shots_data = []
+                for hole in target_holes:
+                    par = hole.get('par', 4)
+                    score_diff = random.randint(-1, 3)
+                    strokes = par + score_diff
+                    
+                    hole_score_id = generate_uuid()
+                    
+                    # 샷 데이터 생성
+                    hole_shots, hole_putts, next_time_val, f_putt_dist, f_putt_made = generate_shot_data(hole_score_id, player, par, strokes, current_hole_time)
+                    current_hole_time = next_time_val # 다음 홀 시작 시간 업데이트
+                    
+                    shots_data.extend(hole_shots)
+                    
+                    is_fairway_hit = random.choice([True, False]) if par > 3 else None
+                    hole_results.append((hole_score_id, strokes, hole_putts, is_fairway_hit, f_putt_dist, f_putt_made))
             
-    return rounds_data
+            yield build_round_record(
+                scenario, course, target_holes, player, round_id, game_session_id, simulator_id,
+                round_start_time, hole_results, shots_data, current_hole_time,
+            )
+
+def iter_all_rounds(courses, course_index, rng=None, seed=None, end_date=None):
+    """모든 시나리오의 라운드를 순서대로 생성합니다 (제너레이터)."""
+    for scenario in SCENARIOS:
+        print(f"Processing scenario: {scenario['name']}")
+        yield from iter_round_data(scenario, courses, course_index, rng=rng, seed=seed, end_date=end_date)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="골프 샘플 라운드 데이터 생성")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="난수 시드 (지정 시 (시나리오, 라운드, 플레이어)별 독립 스트림과 uuid5 ID로 생성)")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None, metavar="YYYY-MM-DD",
+                        help="플레이 날짜 범위의 끝 (기본: 오늘). --seed와 함께 지정하면 실행 날짜와 무관하게 같은 결과")
+    parser.add_argument("--legacy-shots", action="store_true",
+                        help="배치 생성 대신 기존 샷 단위 생성 경로 사용")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="출력 포맷: json(배열) 또는 jsonl(JSON Lines)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="flat",
+                        help="샷 배치: flat(기본) / ranged(홀별 shot_start~shot_end) / nested(홀 안에 샷)")
+    parser.add_argument("--index", action="store_true",
+                        help="<출력>.idx.json 사용자 인덱스(user_id → played_at 순 바이트 오프셋)도 기록 (jsonl 전용)")
+    parser.add_argument("--columnar", metavar="DIR", default=None,
+                        help="rounds/holes/shots 컬럼형 테이블도 함께 기록할 디렉터리 (pyarrow 필요)")
+    parser.add_argument("--columnar-format", choices=COLUMNAR_FORMATS, default="parquet",
+                        help="컬럼형 테이블 포맷: parquet 또는 arrow(IPC)")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true",
+                       help="코스 마스터 캐시를 사용하지 않고 엑셀을 직접 파싱")
+    cache.add_argument("--rebuild-cache", action="store_true",
+                       help="코스 마스터 캐시를 강제로 다시 생성")
+    pipeline_metrics.add_arguments(parser)
+    args = parser.parse_args()
+    pipeline_metrics.enable_from_args(parser, args)
+    if args.index and args.format != 'jsonl':
+        parser.error("--index는 --format jsonl과 함께 사용해야 합니다")
+    return args
 
 def main():
+    args = parse_args()
     print("Generating sample data...")
     
     if not os.path.exists(OUTPUT_DIR):
         os.makedirs(OUTPUT_DIR)
         
-    courses, holes = load_golf_courses()
-    if not courses:
+    courses_df, course_index = load_golf_courses(
+        use_cache=not args.no_cache, rebuild_cache=args.rebuild_cache
+    )
+    if courses_df is None:
         print("[ERROR] Cannot generate data without course info.")
         return
+    courses = courses_df.to_dict('records')
 
-    all_rounds = []
-    
-    for scenario in SCENARIOS:
-        print(f"Processing scenario: {scenario['name']}")
-        scenario_rounds = generate_round_data(scenario, courses, holes)
-        all_rounds.extend(scenario_rounds)
-        
-        # 시나리오별 파일 저장 (선택사항)
-        # with open(os.path.join(OUTPUT_DIR, f"{scenario['name']}.json"), 'w', encoding='utf-8') as f:
-        #     json.dump(scenario_rounds, f, indent=2, ensure_ascii=False)
-            
-    # 전체 데이터 통합 저장
-    output_file = os.path.join(OUTPUT_DIR, "all_sample_rounds.json")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_rounds, f, indent=2, ensure_ascii=False)
+    if args.seed is not None:
+        random.seed(args.seed)
+    rng = None if args.legacy_shots else np.random.default_rng(args.seed)
+    # 배치 경로에서 시드를 주면 라운드 단위로 독립 생성 (legacy 경로는 전역 random 시드만 사용)
+    seed = None if args.legacy_shots else args.seed
+    end_date = datetime.combine(args.end_date, datetime.min.time()) if args.end_date else None
+
+    # 라운드를 하나씩 생성하여 바로 파일에 기록 (전체를 메모리에 모으지 않음)
+    output_file = os.path.join(OUTPUT_DIR, f"all_sample_rounds.{args.format}")
+    rounds = pipeline_metrics.timed(
+        'generate', with_layout(iter_all_rounds(courses, course_index, rng=rng, seed=seed, end_date=end_date), args.layout)
+    )
+    if args.columnar:
+        # 같은 라운드 스트림을 JSON과 컬럼형 테이블에 동시에 기록
+        with ColumnarWriter(args.columnar, fmt=args.columnar_format) as columnar:
+            count = write_rounds(columnar.tee(rounds), output_file, fmt=args.format, index=args.index)
+        print(f"[INFO] Columnar tables: {', '.join(columnar.paths.values())}")
+    else:
+        count = write_rounds(rounds, output_file, fmt=args.format, index=args.index)
         
-    print(f"\n[SUCCESS] Generated {len(all_rounds)} rounds in {output_file}")
+    print(f"\n[SUCCESS] Generated {count} rounds in {output_file}")
+    if args.metrics:
+        pipeline_metrics.finish(args.metrics)
 
 if __name__ == "__main__":
     main()
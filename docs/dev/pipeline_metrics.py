@@ -0,0 +1,267 @@
+"""
+생성 파이프라인 단계별 계측 (opt-in)
+
+스크립트에 --metrics FILE을 주면 단계(엑셀 로드, 코스 인덱스, 라운드 생성, 변형, 직렬화, 기록)별
+시간 · 호출 수 · 순증가 메모리 블록 수와 카운터(라운드 수, 기록 바이트)를 JSON 요약으로 남깁니다.
+--profile cprofile|tracemalloc을 함께 주면 함수별 프로파일 또는 할당 위치별 메모리도 기록합니다.
+계측을 켜지 않으면 stage()는 아무것도 하지 않는 공용 객체를 돌려주므로 비용이 거의 없습니다.
+
+단계는 중첩될 수 있고 시간은 자기 시간(self)으로 집계합니다. 예를 들어 write_rounds 안에서
+생성기를 당기는 시간은 'generate'에, json.dumps는 'serialize'에, 파일 쓰기는 'write'에 들어갑니다.
+병렬 작업 프로세스의 단계는 작업마다 drain()으로 넘겨받아 merge()로 합산합니다 (프로세스 시간 합).
+
+    metrics = pipeline_metrics.enable(profile='tracemalloc')
+    with pipeline_metrics.stage('excel_load'):
+        ...
+    for round_data in pipeline_metrics.timed('generate', rounds):
+        ...
+    pipeline_metrics.finish('metrics.json')
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from datetime import datetime
+
+METRICS_VERSION = 1
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+
+# 요약에 넣는 프로파일 / 할당 위치 상위 항목 수
+TOP_ENTRIES = 20
+
+_active = None
+
+
+class _NullStage:
+    """계측이 꺼져 있을 때 쓰는 빈 컨텍스트"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.metrics._push(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics._pop()
+        return False
+
+
+class PipelineMetrics:
+    """단계별 자기 시간 / 호출 수 / 메모리 블록 순증가와 카운터 누적"""
+
+    def __init__(self, profile=None):
+        if profile not in (None,) + PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일 모드: {profile}")
+        self.profile = profile
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        # [이름, 재개 시각, 재개 시 블록 수, 재개 시 추적 바이트]
+        self._stack = []
+        self._profiler = None
+        if profile == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif profile == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _snapshot(self):
+        traced = tracemalloc.get_traced_memory()[0] if self.profile == 'tracemalloc' else 0
+        return time.perf_counter(), sys.getallocatedblocks(), traced
+
+    def _accumulate(self, frame, now, blocks, traced):
+        stats = self.stages.setdefault(frame[0], {'seconds': 0.0, 'calls': 0, 'allocated_blocks': 0,
+                                                  'traced_bytes': 0})
+        stats['seconds'] += now - frame[1]
+        stats['allocated_blocks'] += blocks - frame[2]
+        stats['traced_bytes'] += traced - frame[3]
+
+    def _push(self, name):
+        now, blocks, traced = self._snapshot()
+        if self._stack:
+            self._accumulate(self._stack[-1], now, blocks, traced)
+        self._stack.append([name, now, blocks, traced])
+
+    def _pop(self):
+        now, blocks, traced = self._snapshot()
+        frame = self._stack.pop()
+        self._accumulate(frame, now, blocks, traced)
+        self.stages[frame[0]]['calls'] += 1
+        if self._stack:
+            self._stack[-1][1:] = [now, blocks, traced]
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def timed(self, name, iterable):
+        """이터러블에서 다음 항목을 꺼내는 시간만 name 단계로 집계 (생성기 스트리밍용)"""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def drain(self):
+        """지금까지의 단계/카운터를 꺼내고 비움 (작업 프로세스 → 메인 프로세스 전달용)"""
+        snapshot = {'stages': self.stages, 'counters': self.counters}
+        self.stages, self.counters = {}, {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """drain() 결과를 합산"""
+        for name, stats in snapshot['stages'].items():
+            total = self.stages.setdefault(name, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                total[key] = total.get(key, 0) + value
+        for name, value in snapshot['counters'].items():
+            self.count(name, value)
+
+    def summary(self, profile_file=None):
+        """JSON 요약 dict (profile_file은 cProfile 통계 저장 경로)"""
+        wall = time.perf_counter() - self._start
+        stages = {
+            name: {
+                'seconds': round(stats['seconds'], 4),
+                'share': round(stats['seconds'] / wall, 4) if wall else 0.0,
+                'calls': stats['calls'],
+                'allocated_blocks': stats['allocated_blocks'],
+                **({'traced_bytes': stats['traced_bytes']} if self.profile == 'tracemalloc' else {}),
+            }
+            for name, stats in sorted(self.stages.items(), key=lambda item: -item[1]['seconds'])
+        }
+        summary = {
+            'version': METRICS_VERSION,
+            'script': os.path.basename(sys.argv[0]),
+            'argv': sys.argv[1:],
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_seconds': round(wall, 4),
+            # 병렬 실행이면 작업 프로세스 시간이 합산되므로 음수일 수 있음
+            'unattributed_seconds': round(wall - sum(stats['seconds'] for stats in self.stages.values()), 4),
+            'stages': stages,
+            'counters': self.counters,
+        }
+        if self.profile == 'tracemalloc':
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:TOP_ENTRIES]
+            summary['memory'] = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_allocations': [
+                    {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                     'bytes': stat.size, 'blocks': stat.count}
+                    for stat in top
+                ],
+            }
+        elif self._profiler is not None:
+            self._profiler.disable()
+            if profile_file:
+                self._profiler.dump_stats(profile_file)
+            text = io.StringIO()
+            pstats.Stats(self._profiler, stream=text).sort_stats('cumulative').print_stats(TOP_ENTRIES)
+            summary['profile'] = {'file': profile_file, 'top_cumulative': text.getvalue().splitlines()}
+        return summary
+
+
+def enable(profile=None):
+    """전역 계측 시작 (이미 켜져 있으면 그대로 반환)"""
+    global _active
+    if _active is None:
+        _active = PipelineMetrics(profile)
+    return _active
+
+
+def active():
+    return _active
+
+
+def init_worker(collect):
+    """
+    작업 프로세스 초기화 (ProcessPoolExecutor initializer에서 호출)
+
+    fork로 물려받은 메인 프로세스의 집계와 tracemalloc을 버리고, collect면 빈 계측을 새로 시작합니다.
+    작업 프로세스에서는 단계 시간만 모으고 cProfile / tracemalloc은 켜지 않습니다.
+    """
+    global _active
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _active = PipelineMetrics() if collect else None
+
+
+def stage(name):
+    """name 단계 컨텍스트 (계측이 꺼져 있으면 빈 컨텍스트)"""
+    return _NULL_STAGE if _active is None else _active.stage(name)
+
+
+def timed(name, iterable):
+    return iterable if _active is None else _active.timed(name, iterable)
+
+
+def count(name, value=1):
+    if _active is not None:
+        _active.count(name, value)
+
+
+def drain():
+    return None if _active is None else _active.drain()
+
+
+def merge(snapshot):
+    if _active is not None and snapshot:
+        _active.merge(snapshot)
+
+
+def finish(output_file):
+    """요약을 output_file(JSON)에 기록하고 계측 종료 (cProfile 통계는 <output_file>.prof)"""
+    global _active
+    if _active is None:
+        return None
+    profile_file = f"{output_file}.prof" if _active.profile == 'cprofile' else None
+    summary = _active.summary(profile_file)
+    if _active.profile == 'tracemalloc':
+        tracemalloc.stop()
+    _active = None
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    top = ', '.join(f"{name} {stats['seconds']:.2f}초" for name, stats in list(summary['stages'].items())[:4])
+    print(f"📊 단계별 계측: {output_file} ({top})")
+    return summary
+
+
+def add_arguments(parser):
+    """--metrics / --profile 옵션 추가"""
+    parser.add_argument("--metrics", metavar="FILE", default=None,
+                        help="단계별 시간 · 메모리 블록 · 카운터 요약을 기록할 JSON 파일")
+    parser.add_argument("--profile", choices=PROFILE_MODES, default=None,
+                        help="--metrics와 함께: cprofile(<FILE>.prof + 상위 함수) 또는 tracemalloc(할당 위치별 메모리)")
+
+
+def enable_from_args(parser, args):
+    """--metrics가 있으면 계측 시작 (--profile만 있으면 parser.error)"""
+    if args.profile and not args.metrics:
+        parser.error("--profile은 --metrics FILE과 함께 사용해야 합니다")
+    return enable(args.profile) if args.metrics else None
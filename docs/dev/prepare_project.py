@@ -5,6 +5,7 @@
 """
 import os
 import sys
+import argparse
 
 try:
     import pandas as pd
@@ -43,7 +44,7 @@ def check_excel_files():
             
             # 각 시트의 구조 확인
             for sheet_name in xl_file.sheet_names[:3]:  # 최대 3개 시트만 확인
-                df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=5)
+                df = xl_file.parse(sheet_name, nrows=5)
                 print(f"\n  Sheet: {sheet_name}")
                 print(f"  - Columns: {len(df.columns)}")
                 print(f"  - Column names: {list(df.columns)[:10]}...")  # 처음 10개만
@@ -54,12 +55,49 @@ def check_excel_files():
     
     print("\n" + "=" * 60)
 
+def check_course_cache(rebuild_cache=False):
+    """샘플 데이터 생성에 쓰는 코스 마스터 캐시 상태 확인 (필요 시 생성)"""
+    from generate_sample_data import (
+        COURSE_LOADER_VERSION, EXAMPLES_DIR, EXCEL_FILE,
+        course_cache_path, file_sha256, read_course_master_cached,
+    )
+
+    file_path = os.path.join(EXAMPLES_DIR, EXCEL_FILE)
+    if not os.path.exists(file_path):
+        print(f"[WARNING] Course master not found: {file_path}")
+        return
+
+    cache_file = course_cache_path(file_path)
+    expected_key = {'sha256': file_sha256(file_path), 'loader_version': COURSE_LOADER_VERSION}
+    valid = False
+    if os.path.exists(cache_file):
+        try:
+            valid = pd.read_pickle(cache_file).get('key') == expected_key
+        except Exception:
+            valid = False
+    print(f"\n[INFO] Course cache: {cache_file} ({'valid' if valid else 'missing or stale'})")
+
+    if rebuild_cache or not valid:
+        courses_df, holes_df = read_course_master_cached(file_path, rebuild_cache=True)
+        if courses_df is not None:
+            print(f"[INFO] Cached {len(courses_df)} courses and {len(holes_df)} holes")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Excel structure check and course cache preparation")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--no-cache", action="store_true",
+                       help="Skip course master cache check")
+    cache.add_argument("--rebuild-cache", action="store_true",
+                       help="Re-parse the course master and rewrite the cache")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Golf Statistics Service - Project Preparation Script")
     print("=" * 60)
     
     check_excel_files()
+    if not args.no_cache:
+        check_course_cache(rebuild_cache=args.rebuild_cache)
     
     print("\n[SUCCESS] Excel file structure check completed")
     print("\nNext steps:")
@@ -0,0 +1,261 @@
+"""
+병합 가능한 분위수 스케치 (KLL)
+
+BenchmarkRepository._createDistributions는 퍼센타일 계산을 위해 지표별 전체 값 목록을
+유지합니다. 수십만 명 규모에서는 값 목록 대신 KLL 스케치를 사용합니다.
+
+    - 크기: 값 개수와 무관하게 약 3k개 (기본 k=200 → 지표당 수 KB)
+    - 병합: 샤드별로 따로 만든 스케치를 merge로 합쳐도 같은 오차 보장
+    - 오차: 순위(rank) 오차가 k=200에서 99% 신뢰도로 약 1.65% 이하
+            (n에 무관, 퍼센타일 값으로는 ±1.65 퍼센타일 포인트)
+
+레벨 h의 값은 가중치 2^h를 가지며, 레벨이 용량을 넘으면 정렬 후 홀/짝 중 하나를
+무작위로 골라 절반만 다음 레벨로 올립니다(compaction). 난수는 seed로 고정되므로
+같은 입력 · 같은 순서면 항상 같은 스케치가 만들어집니다.
+
+사용법:
+    python quantile_sketch.py merge shard1.json shard2.json --output merged.json
+    python quantile_sketch.py self-check    # 정확한 퍼센타일과 비교해 오차 한계 확인
+"""
+
+import sys
+import json
+import math
+import argparse
+
+import numpy as np
+
+SKETCH_VERSION = 1
+DEFAULT_K = 200
+
+# k=200 기준 순위 오차 한계 (99% 신뢰도, Karnin-Lang-Liberty / DataSketches 실측치)
+RANK_ERROR_K200 = 0.0165
+
+# 레벨별 용량 감소 비율
+_CAPACITY_DECAY = 2 / 3
+
+
+def rank_error_bound(k):
+    """k에 대한 순위 오차 한계 (오차는 대략 1/k에 비례)"""
+    return RANK_ERROR_K200 * DEFAULT_K / k
+
+
+class KLLSketch:
+    """KLL 분위수 스케치. update_many로 배치 추가, merge로 병합"""
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k = k
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * _CAPACITY_DECAY ** depth))
+
+    def update(self, value):
+        self.update_many([value])
+
+    def update_many(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.n += len(values)
+        low, high = float(values.min()), float(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """다른 스케치를 이 스케치에 합치기 (k가 같아야 함)"""
+        if other.k != self.k:
+            raise ValueError(f"k가 다른 스케치는 병합할 수 없습니다: {self.k} != {other.k}")
+        if not other.n:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        """보관 값이 전체 용량을 넘는 동안, 용량을 넘은 가장 낮은 레벨을 compaction"""
+        while self.retained() > sum(self._capacity(level) for level in range(len(self.levels))):
+            level = next(h for h in range(len(self.levels)) if len(self.levels[h]) >= self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # 개수가 홀수면 하나를 남겨 가중치 합을 보존
+            keep = items[:1] if len(items) % 2 else items[:0]
+            pairs = items[len(keep):]
+            promoted = pairs[self._rng.integers(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _weighted(self):
+        """(정렬된 값, 누적 가중치)"""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], np.cumsum(weights[order])
+
+    def rank(self, value, inclusive=True):
+        """value 이하(inclusive=False면 미만) 값의 비율 추정 (0~1)"""
+        if not self.n:
+            return 0.0
+        values, cumulative = self._weighted()
+        index = np.searchsorted(values, value, side='right' if inclusive else 'left')
+        return float(cumulative[index - 1] / cumulative[-1]) if index else 0.0
+
+    def quantile(self, q):
+        """q 분위수(0~1) 추정"""
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs):
+        if not self.n:
+            return [None] * len(qs)
+        values, cumulative = self._weighted()
+        targets = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(values) - 1)
+        result = values[index]
+        result[np.asarray(qs) <= 0] = self.min
+        result[np.asarray(qs) >= 1] = self.max
+        return result.tolist()
+
+    def percentile_rank(self, value, lower_is_better=False):
+        """
+        BenchmarkRepository.calculatePercentile과 같은 정의의 0~100 퍼센타일
+
+        higher is better: value보다 작은 값의 비율, lower is better: value보다 큰 값의 비율
+        """
+        if not self.n:
+            return 50
+        better = 1.0 - self.rank(value, inclusive=True) if lower_is_better else self.rank(value, inclusive=False)
+        return round(better * 100)
+
+    def retained(self):
+        return sum(len(items) for items in self.levels)
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'n': self.n,
+            'min': self.min,
+            'max': self.max,
+            'levels': [items.tolist() for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data, seed=0):
+        sketch = cls(data['k'], seed=seed)
+        sketch.n = data['n']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in data['levels']] or [np.empty(0)]
+        return sketch
+
+
+def save_sketches(sketches, path):
+    """{지표 이름: KLLSketch}를 JSON으로 저장"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': SKETCH_VERSION,
+            'rankErrorBound': rank_error_bound(next(iter(sketches.values())).k) if sketches else None,
+            'metrics': {name: sketch.to_dict() for name, sketch in sketches.items()},
+        }, f, separators=(',', ':'))
+
+
+def load_sketches(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != SKETCH_VERSION:
+        raise ValueError(f"지원하지 않는 스케치 버전: {data.get('version')}")
+    return {name: KLLSketch.from_dict(item) for name, item in data['metrics'].items()}
+
+
+def merge_files(paths):
+    """여러 샤드 스케치 파일을 지표별로 병합"""
+    merged = {}
+    for path in paths:
+        for name, sketch in load_sketches(path).items():
+            if name in merged:
+                merged[name].merge(sketch)
+            else:
+                merged[name] = sketch
+    return merged
+
+
+def self_check(k=DEFAULT_K, n=200_000, shards=8, seed=0):
+    """
+    정확한 퍼센타일과 비교해 순위 오차가 한계 이내인지 확인
+
+    여러 분포를 샤드로 나눠 스케치를 만들고 병합한 뒤, 1~99 퍼센타일 지점에서
+    추정 순위와 실제 순위의 차이를 측정합니다.
+    """
+    rng = np.random.default_rng(seed)
+    datasets = {
+        'score (정규분포)': np.round(rng.normal(92, 8, n)),
+        'driver (정규분포)': rng.normal(225, 25, n),
+        'putts (포아송)': rng.poisson(33, n).astype(np.float64),
+        'fairway (균등, 중복 많음)': np.round(rng.uniform(0, 100, n) / 7.14) * 7.14,
+        'lognormal (긴 꼬리)': rng.lognormal(3, 1, n),
+    }
+    bound = rank_error_bound(k)
+    probes = np.arange(1, 100) / 100
+    passed = True
+
+    print(f"KLL self-check: k={k}, n={n:,}, 샤드 {shards}개, 오차 한계 {bound:.2%}")
+    for name, values in datasets.items():
+        sketch = KLLSketch(k, seed=seed)
+        for index, shard in enumerate(np.array_split(values, shards)):
+            part = KLLSketch(k, seed=seed + index + 1)
+            part.update_many(shard)
+            sketch.merge(part)
+
+        exact = np.sort(values)
+        estimates = np.asarray(sketch.quantiles(probes))
+        # 추정 분위수 값의 실제 순위 구간 [미만 비율, 이하 비율]과 목표 순위의 거리
+        below = np.searchsorted(exact, estimates, side='left') / n
+        at_or_below = np.searchsorted(exact, estimates, side='right') / n
+        error = np.maximum(np.maximum(below - probes, probes - at_or_below), 0).max()
+
+        ok = error <= bound and sketch.n == n
+        passed &= ok
+        print(f"  {'✅' if ok else '❌'} {name}: 최대 순위 오차 {error:.3%}, "
+              f"보관 값 {sketch.retained()}개 ({sketch.retained() / n:.2%})")
+
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KLL 분위수 스케치 병합 / 자체 검증")
+    commands = parser.add_subparsers(dest="command", required=True)
+    merge = commands.add_parser("merge", help="샤드별 스케치 파일을 하나로 병합")
+    merge.add_argument("inputs", nargs="+", help="스케치 파일 (generate_benchmark_data.py 출력)")
+    merge.add_argument("--output", required=True, help="병합 결과 파일")
+    check = commands.add_parser("self-check", help="정확한 퍼센타일과 비교해 오차 한계 검증")
+    check.add_argument("--k", type=int, default=DEFAULT_K)
+    check.add_argument("--n", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if args.command == "merge":
+        merged = merge_files(args.inputs)
+        save_sketches(merged, args.output)
+        for name, sketch in merged.items():
+            print(f"  {name}: n={sketch.n:,}, 보관 값 {sketch.retained()}개")
+        print(f"✅ 저장: {args.output}")
+        return 0
+
+    return 0 if self_check(args.k, args.n) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
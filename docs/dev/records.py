@@ -0,0 +1,275 @@
+"""
+Round / Hole / Shot 컴팩트 레코드 (lib/models/round.dart, hole.dart, shot.dart 대응)
+
+샷 하나를 35개 키의 dict로 들고 있으면 키 해시 테이블이 값보다 큰 메모리를 차지합니다.
+여기의 레코드는 __slots__ 클래스라 인스턴스마다 값 슬롯만 두며, 속성 이름은 Dart 모델 필드를
+snake_case로 옮긴 것입니다 (totalDistance → total_distance). JSON 키는 기록 직전에 to_dict()로만 붙이고,
+키 순서와 값 타입(int/float/None)을 그대로 유지하므로 dict로 만든 출력과 바이트 단위로 같습니다.
+
+    record = Round.from_dict(round_data)       # ranged / nested 배치도 flat으로 읽음
+    record.shots[0].total_distance
+    write_rounds((r.to_dict() for r in records), 'rounds.jsonl')
+
+from_dict는 모델의 키가 모두 있어야 하며(없으면 KeyError), 모델에 없는 키는 버립니다.
+Python 3.10의 dataclass(slots=True)와 같은 클래스를 3.7에서도 만들도록 _record 데코레이터로 __slots__를 붙입니다.
+
+사용법:
+    python records.py compare FILE    # dict vs 레코드 메모리 · 속성 접근 시간 비교 (왕복 일치 확인 포함)
+"""
+
+import gc
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from operator import attrgetter, itemgetter
+from typing import List, Optional
+
+from round_io import iter_rounds, flatten_shots
+
+
+def _json(key):
+    """속성 이름과 JSON 키가 다른 필드 (Dart의 @JsonKey(name: ...))"""
+    return field(metadata={'json': key})
+
+
+class _Record:
+    """레코드 공통 메서드 (_record가 _ATTRS / JSON_KEYS / _values / _from_keys를 채움)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(*cls._from_keys(data))
+
+    def to_dict(self):
+        return dict(zip(self.JSON_KEYS, self._values(self)))
+
+    def __reduce__(self):
+        # 기본 pickle은 슬롯 이름 dict를 함께 저장하므로 값 튜플만 넘김 (병렬 작업 결과 전달용)
+        return type(self), self._values(self)
+
+
+def _record(cls):
+    """dataclass로 __init__ / __repr__ / __eq__를 만든 뒤 같은 필드의 __slots__ 클래스로 다시 생성"""
+    cls = dataclass(cls)
+    attrs = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = attrs
+    cls = type(cls.__name__, (_Record,), namespace)
+    cls._ATTRS = attrs
+    cls.JSON_KEYS = tuple(f.metadata.get('json', f.name) for f in fields(cls))
+    cls._values = attrgetter(*attrs)
+    cls._from_keys = itemgetter(*cls.JSON_KEYS)
+    return cls
+
+
+@_record
+class Shot:
+    shot_id: str
+    hole_score_id: str
+    user_id: str
+    shot_number: int
+    club_type: str
+    shot_type: str
+    lie: str
+    is_putt: bool
+    putt_made: Optional[bool]
+    putt_length: Optional[float]
+    is_mulligan: bool
+    shot_at: Optional[str]
+    # 센서 측정값
+    total_distance: Optional[float] = _json('TOTAL')
+    carry_distance: Optional[float] = _json('CARRY')
+    height: Optional[float] = _json('HEIGHT')
+    land_angle: Optional[float] = _json('LAND_ANG')
+    side_deviation: Optional[float] = _json('SIDE')
+    side_total: Optional[float] = _json('SIDE_TOT')
+    hang_time: Optional[float] = _json('HANG_TIME')
+    from_pin: Optional[float] = _json('FROM_PIN')
+    ball_speed: Optional[float] = _json('BALL_SPEED')
+    launch_angle: Optional[float] = _json('LAUNCH_ANG')
+    launch_direction: Optional[float] = _json('LAUNCH_DIR')
+    spin_rate: Optional[float] = _json('SPIN_RATE')
+    spin_axis: Optional[float] = _json('SPIN_AXIS')
+    back_spin: Optional[float] = _json('BACK_SPIN')
+    side_spin: Optional[float] = _json('SIDE_SPIN')
+    smash_factor: Optional[float] = _json('SMASH_FAC')
+    attack_angle: Optional[float] = _json('ATTACK_ANG')
+    club_path: Optional[float] = _json('CLUB_PATH')
+    dynamic_loft: Optional[float] = _json('DYN_LOFT')
+    spin_loft: Optional[float] = _json('SPIN_LOFT')
+    face_angle: Optional[float] = _json('FACE_ANG')
+    face_to_path: Optional[float] = _json('FACE_TO_PATH')
+    club_speed: Optional[float] = _json('CLUB_SPEED')
+
+
+@_record
+class Hole:
+    hole_score_id: str
+    round_id: str
+    hole_number: int
+    hole_id: str
+    par: int
+    distance: int
+    strokes: int
+    putts: int
+    fairway_hit: Optional[bool]
+    green_in_regulation: Optional[bool]
+    penalties: int
+    penalty_details: Optional[List[str]]
+    first_putt_distance: Optional[float]
+    first_putt_made: Optional[bool]
+
+
+@_record
+class Round:
+    game_session_id: Optional[str]
+    game_mode: str
+    game_rule: str
+    simulator_id: Optional[str]
+    round_id: str
+    user_id: str
+    team_id: Optional[str]
+    played_at: str
+    cc_id: str
+    cc_name: Optional[str]
+    course_id: str
+    course_name: Optional[str]
+    tee_box: str
+    total_par: int
+    total_score: int
+    rank: Optional[int]
+    ranking_eligible: Optional[bool]
+    total_putts: int
+    fairways_hit: int
+    fairways_attempted: int
+    greens_in_regulation: int
+    mulligans_used: int
+    birdies_or_better: int
+    pars: int
+    bogeys: int
+    double_bogey_or_worse: int
+    play_end_time: Optional[str]
+    holes: List[Hole]
+    shots: List[Shot]
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls(*cls._from_keys(flatten_shots(data)))
+        record.holes = [Hole.from_dict(hole) for hole in record.holes]
+        # JSON 파서는 값 문자열을 샷마다 새로 만들므로 라운드 안에서 반복되는 ID / 코드 값은 한 객체로 공유
+        shared = {}
+        record.shots = [
+            Shot(*[shared.setdefault(value, value) if share else value
+                   for value, share in zip(Shot._from_keys(shot), _SHARED_SHOT_FIELDS)])
+            for shot in record.shots
+        ]
+        return record
+
+    def to_dict(self):
+        data = dict(zip(self.JSON_KEYS, self._values(self)))
+        data['holes'] = [hole.to_dict() for hole in self.holes]
+        data['shots'] = [shot.to_dict() for shot in self.shots]
+        return data
+
+
+# 라운드 안에서 값이 반복되는 샷 필드 (Round.from_dict에서 공유)
+_SHARED_SHOT_FIELDS = tuple(attr in ('hole_score_id', 'user_id', 'club_type', 'shot_type', 'lie')
+                            for attr in Shot._ATTRS)
+
+
+@contextmanager
+def bulk_records():
+    """
+    레코드를 대량으로 만들어 들고 있는 구간에서 순환 GC 일시 중지
+
+    원자 값만 담은 dict는 GC 추적에서 빠지지만 슬롯 레코드는 항상 추적 대상이라, 청크 하나 분량
+    (샷 수십만 개)이 살아 있는 동안 세대 GC가 반복해서 전체를 훑습니다. 레코드끼리는 순환 참조가
+    없으므로 GC를 꺼도 구간이 끝나면 참조 카운트로 바로 해제됩니다.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _traced(load):
+    """load()가 만든 객체가 차지하는 메모리 (tracemalloc 순증가 바이트, 소요 시간)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = load()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return result, used, time.perf_counter() - start
+
+
+def compare(input_file):
+    """라운드 파일을 dict 목록 / 레코드 목록으로 각각 메모리에 올려 크기와 샷 속성 접근 시간 비교"""
+    dicts, dict_bytes, _ = _traced(lambda: list(iter_rounds(input_file)))
+    records, record_bytes, _ = _traced(lambda: [Round.from_dict(round_data) for round_data in iter_rounds(input_file)])
+    shot_count = sum(len(record.shots) for record in records)
+
+    mismatches = sum(
+        json.dumps(record.to_dict(), ensure_ascii=False) != json.dumps(flatten_shots(round_data), ensure_ascii=False)
+        for record, round_data in zip(records, dicts)
+    )
+
+    dict_shots = [shot for round_data in dicts for shot in flatten_shots(round_data)['shots']]
+    record_shots = [shot for record in records for shot in record.shots]
+    start = time.perf_counter()
+    sum(shot['TOTAL'] or 0 for shot in dict_shots if not shot['is_putt'])
+    dict_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    sum(shot.total_distance or 0 for shot in record_shots if not shot.is_putt)
+    record_seconds = time.perf_counter() - start
+
+    result = {
+        'rounds': len(records),
+        'shots': shot_count,
+        'dict_mb': round(dict_bytes / 1e6, 2),
+        'record_mb': round(record_bytes / 1e6, 2),
+        'dict_bytes_per_shot': round(dict_bytes / shot_count) if shot_count else 0,
+        'record_bytes_per_shot': round(record_bytes / shot_count) if shot_count else 0,
+        'dict_access_ms': round(dict_seconds * 1000, 1),
+        'record_access_ms': round(record_seconds * 1000, 1),
+        'round_trip_mismatches': mismatches,
+    }
+    print(f"📊 {input_file}: 라운드 {result['rounds']:,}개, 샷 {result['shots']:,}개")
+    print(f"   dict   {result['dict_mb']:>9.2f} MB (샷당 {result['dict_bytes_per_shot']:,} B), "
+          f"샷 속성 접근 {result['dict_access_ms']:.1f} ms")
+    print(f"   레코드 {result['record_mb']:>9.2f} MB (샷당 {result['record_bytes_per_shot']:,} B), "
+          f"샷 속성 접근 {result['record_access_ms']:.1f} ms")
+    if record_bytes:
+        print(f"   메모리 {dict_bytes / record_bytes:.2f}배 절감")
+    if result['round_trip_mismatches']:
+        print(f"❌ to_dict 왕복 불일치: {result['round_trip_mismatches']}개 라운드")
+    else:
+        print("✅ to_dict 왕복 일치 (flat 배치 기준 JSON 동일)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round / Hole / Shot 컴팩트 레코드")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compare_parser = sub.add_parser("compare", help="dict vs 레코드 메모리 · 속성 접근 시간 비교")
+    compare_parser.add_argument("input", help="라운드 파일 (.json / .jsonl)")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        result = compare(args.input)
+        return 1 if result['round_trip_mismatches'] else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,482 @@
+"""
+라운드 데이터 입출력 유틸리티
+
+전체 라운드를 리스트로 모으지 않고 하나씩 기록/읽기하여, 데이터셋 크기와 무관하게
+메모리 사용량을 라운드 1개 수준으로 유지합니다.
+
+지원 포맷:
+    - json  : 기존 all_sample_rounds.json과 바이트 단위로 같은 JSON 배열 (indent=2)
+    - jsonl : 한 줄에 라운드 하나 (JSON Lines)
+
+읽기(iter_rounds)도 두 포맷 모두 라운드 단위로 스트리밍합니다.
+
+샷 배치(layout):
+    - flat   : 라운드의 shots 배열 하나 (기본, 앱 모델과 같은 형태)
+    - ranged : flat + 홀마다 shots 배열의 [shot_start, shot_end) 구간
+    - nested : 홀마다 자기 샷을 hole['shots']로 포함 (라운드 shots 없음)
+ranged / nested에서는 홀별 샷 조회가 전체 샷을 훑지 않고 O(1) 슬라이스가 됩니다.
+hole_shots / iter_hole_shots는 세 배치를 모두 읽고, flatten_shots는 flat으로 되돌립니다.
+
+사용자 인덱스 (jsonl 전용):
+    write_rounds(..., index=True) 또는 build_index로 <파일>.idx.json을 함께 만들면
+    user_id → played_at 순 [played_at, 바이트 오프셋, 길이] 목록이 기록됩니다.
+    IndexedRounds는 데이터 파일을 mmap으로 열어 필요한 라운드의 바이트만 파싱하므로
+    "사용자 X의 최근 10라운드" 조회 비용이 전체 데이터 크기와 무관합니다.
+
+    python round_io.py index rounds.jsonl
+    python round_io.py query rounds.jsonl --user inter.pop000123 --limit 10
+"""
+
+import os
+import sys
+import json
+import mmap
+import hashlib
+import argparse
+
+import pipeline_metrics
+
+FORMATS = ('json', 'jsonl')
+LAYOUTS = ('flat', 'ranged', 'nested')
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx.json'
+
+
+# 홀에서 다시 계산하는 라운드 집계 필드 (expand_sample_data 변형, validate_data 검증 공용)
+AGGREGATE_FIELDS = [
+    'total_score', 'total_putts', 'fairways_hit', 'fairways_attempted', 'greens_in_regulation',
+    'birdies_or_better', 'pars', 'bogeys', 'double_bogey_or_worse',
+]
+
+
+def summarize_holes(holes):
+    """홀 목록에서 라운드 집계값 재계산 (generate_round_data와 같은 기준)"""
+    summary = dict.fromkeys(AGGREGATE_FIELDS, 0)
+    for hole in holes:
+        par, strokes = hole['par'], hole['strokes']
+        summary['total_score'] += strokes
+        summary['total_putts'] += hole['putts']
+        if par > 3:
+            summary['fairways_attempted'] += 1
+            if hole.get('fairway_hit'):
+                summary['fairways_hit'] += 1
+        if hole.get('green_in_regulation'):
+            summary['greens_in_regulation'] += 1
+        if strokes <= par - 1:
+            summary['birdies_or_better'] += 1
+        elif strokes == par:
+            summary['pars'] += 1
+        elif strokes == par + 1:
+            summary['bogeys'] += 1
+        else:
+            summary['double_bogey_or_worse'] += 1
+    return summary
+
+
+def file_sha256(file_path):
+    """파일 내용 해시 (캐시 키 · 매니페스트 원본 확인용)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def detect_format(path):
+    """파일 확장자로 포맷 판별 (.jsonl이면 JSON Lines, 그 외는 JSON 배열)"""
+    return 'jsonl' if str(path).endswith('.jsonl') else 'json'
+
+
+def index_path(data_file):
+    """데이터 파일 옆 사용자 인덱스 경로"""
+    return f"{data_file}{INDEX_SUFFIX}"
+
+
+def write_rounds(rounds, output_file, fmt=None, index=False, append=False):
+    """
+    라운드 이터러블을 스트리밍으로 파일에 기록
+
+    Args:
+        rounds: 라운드 dict 이터러블 (제너레이터 권장)
+        output_file: 출력 파일 경로
+        fmt: 'json' 또는 'jsonl' (None이면 확장자로 판별)
+        index: True면 <output_file>.idx.json 사용자 인덱스도 기록 (jsonl 전용)
+        append: True면 기존 파일 끝에 덧붙임 (기존 라운드는 다시 직렬화하지 않음).
+                json은 배열 끝의 ']'만 떼고 이어 쓰며, 인덱스는 기존 인덱스(없거나 오래됐으면 파일 재스캔)에 합침
+
+    Returns:
+        기록한 라운드 수 (append면 새로 덧붙인 라운드 수)
+    """
+    fmt = fmt or detect_format(output_file)
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 포맷: {fmt}")
+    if index and fmt != 'jsonl':
+        raise ValueError("사용자 인덱스는 jsonl 포맷에서만 만들 수 있습니다")
+
+    append = append and os.path.exists(output_file)
+    count = 0
+    if fmt == 'jsonl':
+        # 바이트 단위로 기록해 오프셋을 그대로 인덱스에 사용 (OS와 무관하게 줄바꿈은 \n)
+        start = os.path.getsize(output_file) if append else 0
+        entries = None
+        if index:
+            entries = _existing_index_entries(output_file, start) if append else []
+        offset = start
+        with open(output_file, 'ab' if append else 'wb') as f:
+            for round_data in rounds:
+                with pipeline_metrics.stage('serialize'):
+                    line = (json.dumps(round_data, ensure_ascii=False) + '\n').encode('utf-8')
+                with pipeline_metrics.stage('write'):
+                    f.write(line)
+                if entries is not None:
+                    entries.append((round_data.get('user_id'), round_data.get('played_at'), offset, len(line)))
+                offset += len(line)
+                count += 1
+        if entries is not None:
+            with pipeline_metrics.stage('index'):
+                _write_index(output_file, entries, offset)
+        _count_written(count, offset - start)
+        return count
+
+    # 이어 쓰기면 기존 배열의 닫는 괄호를 떼고, 기존 요소가 있었으면 첫 요소 앞에도 ','를 붙임
+    start = 0
+    has_items = False
+    if append:
+        start, has_items = _reopen_json_array(output_file)
+    with open(output_file, 'a' if append else 'w', encoding='utf-8') as f:
+        # json.dump(list, indent=2)와 같은 출력: 요소는 한 단계 들여쓰기
+        if not append:
+            f.write('[')
+        for round_data in rounds:
+            with pipeline_metrics.stage('serialize'):
+                encoded = json.dumps(round_data, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+            with pipeline_metrics.stage('write'):
+                f.write(',\n  ' if count or has_items else '\n  ')
+                f.write(encoded)
+            count += 1
+        f.write('\n]' if count or has_items else ']')
+    _count_written(count, os.path.getsize(output_file) - start)
+    return count
+
+
+def _reopen_json_array(output_file):
+    """
+    write_rounds가 쓴 JSON 배열 파일 끝의 ']'(비어 있지 않으면 '\\n]')를 잘라냄 (이어 쓰기용)
+
+    Returns:
+        (잘라낸 뒤 파일 크기, 기존 요소가 있었는지)
+    """
+    with open(output_file, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(size - 2, 0))
+        tail = f.read()
+        if tail == b'[]' and size == 2:
+            f.truncate(1)
+            return 1, False
+        if tail != b'\n]':
+            raise ValueError(f"이어 쓸 수 없는 JSON 배열 파일입니다 (끝이 '\\n]'가 아님): {output_file}")
+        f.truncate(size - 2)
+        return size - 2, True
+
+
+def _count_written(count, size):
+    """계측 카운터: 기록한 라운드 수 / 바이트 수"""
+    if pipeline_metrics.active() is not None:
+        pipeline_metrics.count('rounds_written', count)
+        pipeline_metrics.count('bytes_written', size)
+
+
+def iter_rounds(input_file, fmt=None, chunk_size=1 << 20):
+    """
+    파일에서 라운드를 하나씩 읽기
+
+    JSON Lines는 줄 단위로, JSON 배열은 청크 단위 증분 파싱으로 스트리밍하므로
+    파일 크기와 무관하게 메모리에는 라운드 1개와 읽기 버퍼만 유지됩니다.
+    """
+    fmt = fmt or detect_format(input_file)
+    with open(input_file, 'r', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_json_array(f, chunk_size)
+
+
+def _iter_json_array(f, chunk_size):
+    """최상위 JSON 배열의 요소를 하나씩 디코딩 (라운드 하나가 청크보다 크면 버퍼를 늘림)"""
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size).lstrip()
+    if not buf.startswith('['):
+        raise ValueError("JSON 배열 형식이 아닙니다")
+    pos = 1
+    eof = False
+    read_size = chunk_size
+
+    while True:
+        # 요소 사이의 공백/쉼표 건너뛰기
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buf) or eof:
+                break
+            buf, pos = f.read(chunk_size), 0
+            eof = not buf
+
+        if pos >= len(buf):
+            raise ValueError("JSON 배열이 닫히지 않았습니다")
+        if buf[pos] == ']':
+            return
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # 요소가 버퍼 끝에서 잘림: 더 읽어서 다시 시도 (읽기 크기는 두 배씩)
+            more = f.read(read_size)
+            read_size *= 2
+            eof = not more
+            buf, pos = buf[pos:] + more, 0
+            continue
+
+        yield item
+        pos = end
+        read_size = chunk_size
+
+
+def read_rounds(input_file, fmt=None):
+    """파일의 라운드 전체를 리스트로 읽기 (원본 라운드처럼 작은 입력용)"""
+    return list(iter_rounds(input_file, fmt))
+
+
+def apply_layout(round_data, layout):
+    """
+    라운드의 샷 배치를 layout으로 변환한 새 라운드 반환 (flat 입력 기준)
+
+    ranged / nested는 홀 순서대로 샷을 모으며, 같은 홀 안의 순서는 유지합니다.
+    어느 홀에도 속하지 않는 샷은 ranged에서는 마지막 구간 뒤에, nested에서는 라운드 shots에 남깁니다.
+    """
+    if layout == 'flat':
+        return round_data
+    if layout not in LAYOUTS:
+        raise ValueError(f"지원하지 않는 배치: {layout}")
+
+    holes = [dict(hole) for hole in round_data['holes']]
+    by_hole = {hole['hole_score_id']: [] for hole in holes}
+    orphans = []
+    for shot in round_data.get('shots', []):
+        by_hole.get(shot['hole_score_id'], orphans).append(shot)
+
+    new_round = dict(round_data)
+    new_round['holes'] = holes
+    if layout == 'nested':
+        for hole in holes:
+            hole['shots'] = by_hole[hole['hole_score_id']]
+        if orphans:
+            new_round['shots'] = orphans
+        else:
+            new_round.pop('shots', None)
+        return new_round
+
+    shots = []
+    for hole in holes:
+        hole['shot_start'] = len(shots)
+        shots.extend(by_hole[hole['hole_score_id']])
+        hole['shot_end'] = len(shots)
+    new_round['shots'] = shots + orphans
+    return new_round
+
+
+def with_layout(rounds, layout):
+    """라운드 이터러블에 apply_layout을 적용하는 제너레이터"""
+    if layout == 'flat':
+        return iter(rounds)
+    return (apply_layout(round_data, layout) for round_data in rounds)
+
+
+def hole_shots(round_data, hole):
+    """홀의 샷 목록 (nested/ranged는 O(1), flat은 라운드 샷 전체를 거름)"""
+    if 'shots' in hole:
+        return hole['shots']
+    if 'shot_start' in hole:
+        return round_data['shots'][hole['shot_start']:hole['shot_end']]
+    hole_score_id = hole['hole_score_id']
+    return [shot for shot in round_data.get('shots', []) if shot['hole_score_id'] == hole_score_id]
+
+
+def iter_hole_shots(round_data):
+    """(홀, 샷 목록)을 홀 순서대로 (flat이면 샷을 한 번만 훑어 인덱스 구성)"""
+    holes = round_data['holes']
+    if holes and 'shots' not in holes[0] and 'shot_start' not in holes[0]:
+        by_hole = {hole['hole_score_id']: [] for hole in holes}
+        for shot in round_data.get('shots', []):
+            if shot['hole_score_id'] in by_hole:
+                by_hole[shot['hole_score_id']].append(shot)
+        for hole in holes:
+            yield hole, by_hole[hole['hole_score_id']]
+        return
+    for hole in holes:
+        yield hole, hole_shots(round_data, hole)
+
+
+def flatten_shots(round_data):
+    """어떤 배치든 flat 배치로 변환 (이미 flat이면 그대로 반환)"""
+    holes = round_data.get('holes', [])
+    if not any('shots' in hole or 'shot_start' in hole for hole in holes):
+        return round_data
+
+    new_round = dict(round_data)
+    shots = []
+    new_holes = []
+    for hole in holes:
+        hole = dict(hole)
+        shots.extend(hole.pop('shots', ()))
+        hole.pop('shot_start', None)
+        hole.pop('shot_end', None)
+        new_holes.append(hole)
+    new_round['holes'] = new_holes
+    new_round['shots'] = shots + list(round_data.get('shots', []))
+    return new_round
+
+
+def _write_index(data_file, entries, size):
+    """(user_id, played_at, 오프셋, 길이) 목록을 사용자별 played_at 순으로 정리해 기록"""
+    users = {}
+    for user_id, played_at, offset, length in entries:
+        users.setdefault(user_id, []).append([played_at, offset, length])
+    for rows in users.values():
+        rows.sort(key=lambda row: row[0] or '')
+    path = index_path(data_file)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': INDEX_VERSION,
+            'data_file': os.path.basename(data_file),
+            'size': size,
+            'rounds': len(entries),
+            'users': users,
+        }, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return path
+
+
+def _scan_index_entries(data_file):
+    """jsonl 파일을 한 번 훑어 (user_id, played_at, 오프셋, 길이) 목록과 파일 크기 반환"""
+    entries = []
+    offset = 0
+    with open(data_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                round_data = json.loads(line)
+                entries.append((round_data.get('user_id'), round_data.get('played_at'), offset, len(line)))
+            offset += len(line)
+    return entries, offset
+
+
+def _existing_index_entries(data_file, size):
+    """기존 인덱스의 항목 목록 (인덱스가 없거나 데이터 파일 크기와 맞지 않으면 파일을 다시 훑음)"""
+    try:
+        with open(index_path(data_file), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        index = None
+    if index is None or index.get('version') != INDEX_VERSION or index.get('size') != size:
+        return _scan_index_entries(data_file)[0]
+    return [
+        (user_id, played_at, offset, length)
+        for user_id, rows in index['users'].items()
+        for played_at, offset, length in rows
+    ]
+
+
+def build_index(data_file):
+    """이미 있는 jsonl 파일을 한 번 훑어 사용자 인덱스 생성 (인덱스 경로 반환)"""
+    entries, size = _scan_index_entries(data_file)
+    return _write_index(data_file, entries, size)
+
+
+class IndexedRounds:
+    """
+    사용자 인덱스와 mmap으로 jsonl 파일에서 필요한 라운드만 읽기
+
+        with IndexedRounds('rounds.jsonl') as data:
+            recent = data.user_rounds('inter.pop000123', limit=10)
+    """
+
+    def __init__(self, data_file):
+        with open(index_path(data_file), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"지원하지 않는 인덱스 버전: {index.get('version')}")
+        size = os.path.getsize(data_file)
+        if size != index['size']:
+            raise ValueError(f"인덱스가 데이터 파일과 맞지 않습니다 (파일 {size}바이트, 인덱스 {index['size']}바이트): "
+                             f"build_index로 다시 만드세요")
+        self.data_file = data_file
+        self.index = index['users']
+        self._file = open(data_file, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b''
+
+    def users(self):
+        return list(self.index)
+
+    def round_count(self, user_id):
+        return len(self.index.get(user_id, ()))
+
+    def user_rounds(self, user_id, limit=None, since=None, newest_first=True):
+        """
+        한 사용자의 라운드 (기본: played_at 역순, filteredRoundsProvider와 같은 순서)
+
+        Args:
+            limit: 최대 라운드 수 (newest_first면 최근 것부터)
+            since: 이 played_at(ISO 문자열) 이후 라운드만
+        """
+        rows = self.index.get(user_id, [])
+        if since:
+            rows = [row for row in rows if (row[0] or '') >= since]
+        if newest_first:
+            rows = rows[::-1]
+        if limit is not None:
+            rows = rows[:limit]
+        return [json.loads(self._map[offset:offset + length]) for _, offset, length in rows]
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="jsonl 라운드 파일 사용자 인덱스 생성 / 조회")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("index", help="<파일>.idx.json 생성")
+    build.add_argument("input", help="라운드 파일 (.jsonl)")
+    query = commands.add_parser("query", help="인덱스로 한 사용자의 최근 라운드 조회")
+    query.add_argument("input", help="라운드 파일 (.jsonl, 인덱스 필요)")
+    query.add_argument("--user", required=True, help="user_id")
+    query.add_argument("--limit", type=int, default=10, help="최근 라운드 수")
+    args = parser.parse_args()
+
+    if args.command == "index":
+        path = build_index(args.input)
+        print(f"✅ 인덱스: {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+        return 0
+
+    with IndexedRounds(args.input) as data:
+        rounds = data.user_rounds(args.user, limit=args.limit)
+    print(f"{args.user}: 최근 {len(rounds)}개 라운드")
+    for round_data in rounds:
+        print(f"  {round_data.get('played_at')}  {round_data.get('course_name')}  {round_data.get('total_score')}타")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+라운드 데이터 user_id 해시 샤드 × played_at 월 파티션 분할
+
+filteredRoundsProvider는 전체 라운드를 읽은 뒤 현재 사용자만 남기고 playedAt 역순으로 정렬합니다.
+파티션으로 나눠 두면 한 사용자의 최근 라운드는 그 사용자 샤드의 최근 월 파일만 읽으면 됩니다.
+
+    <output>/shard=007/month=2025-11/rounds.jsonl
+    <output>/manifest.json   샤드별 파티션 목록, 라운드 수, 사용자 수, played_at 범위
+
+    - 샤드 = crc32(user_id) % 샤드 수 (파이썬/다트 어디서나 같은 값)
+    - 파티션 안은 (user_id, played_at) 순서로 정렬하고, 옆의 users.json에 사용자별
+      [바이트 오프셋, 길이, 라운드 수]를 기록 → 한 사용자 조회는 그 사용자 구간만 읽음
+    - --shard N으로 한 샤드만 다시 만들 수 있으며, 다른 샤드 파일과 매니페스트 항목은 그대로 유지
+
+메모리는 샤드 하나 분량만 사용합니다 (입력은 샤드별 임시 파일로 먼저 나눈 뒤 샤드 단위로 정렬).
+
+사용법:
+    python shard_rounds.py ../../assets/data/all_sample_rounds.json --output ../../assets/data/rounds_sharded
+    python shard_rounds.py population/population_*.jsonl --output sharded --shards 256
+    python shard_rounds.py new_rounds.jsonl --output sharded --shard 7      # 샤드 7만 다시 생성
+    python shard_rounds.py --output sharded --user inter.pop000123 --limit 10   # 최근 10라운드 조회
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import zlib
+import argparse
+import tempfile
+
+from round_io import FORMATS, iter_rounds
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_SHARDS = 64
+PARTITION_FILE = 'rounds.jsonl'
+# 파티션별 user_id → [바이트 오프셋, 길이, 라운드 수]
+USER_RANGES_FILE = 'users.json'
+# played_at이 없는 라운드의 월 파티션 이름
+UNKNOWN_MONTH = 'unknown'
+
+
+def shard_of(user_id, num_shards):
+    """user_id → 샤드 번호 (crc32 기반이라 프로세스/언어와 무관하게 고정)"""
+    return zlib.crc32(str(user_id).encode('utf-8')) % num_shards
+
+
+def month_of(played_at):
+    """ISO played_at → 'YYYY-MM'"""
+    return played_at[:7] if played_at else UNKNOWN_MONTH
+
+
+def shard_dir(output_dir, shard):
+    return os.path.join(output_dir, f"shard={shard:03d}")
+
+
+def partition_path(output_dir, shard, month):
+    return os.path.join(shard_dir(output_dir, shard), f"month={month}", PARTITION_FILE)
+
+
+def load_manifest(output_dir):
+    """매니페스트 읽기 (없으면 None)"""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전: {manifest.get('version')}")
+    return manifest
+
+
+def _save_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _spill(rounds, spill_dir, num_shards, only_shard):
+    """라운드를 샤드별 임시 JSONL 파일로 분배 (샤드 순서 유지, 열린 파일은 샤드 수만큼)"""
+    files = {}
+    count = 0
+    try:
+        for round_data in rounds:
+            shard = shard_of(round_data['user_id'], num_shards)
+            if only_shard is not None and shard != only_shard:
+                continue
+            f = files.get(shard)
+            if f is None:
+                f = files[shard] = open(os.path.join(spill_dir, f"{shard:03d}.jsonl"), 'w', encoding='utf-8')
+            f.write(json.dumps(round_data, ensure_ascii=False))
+            f.write('\n')
+            count += 1
+    finally:
+        for f in files.values():
+            f.close()
+    return sorted(files), count
+
+
+def _write_shard(spill_file, output_dir, shard):
+    """임시 파일의 샤드 하나를 월별 파티션으로 정렬·기록하고 매니페스트 항목 반환"""
+    months = {}
+    with open(spill_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            round_data = json.loads(line)
+            key = (round_data['user_id'], round_data.get('played_at') or '')
+            months.setdefault(month_of(round_data.get('played_at')), []).append((key, line))
+
+    # 새 샤드를 임시 디렉터리에 만든 뒤 기존 샤드와 교체
+    final_dir = shard_dir(output_dir, shard)
+    tmp_dir = f"{final_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    partitions = []
+    for month in sorted(months):
+        rows = sorted(months[month], key=lambda row: row[0])
+        path = os.path.join(tmp_dir, f"month={month}", PARTITION_FILE)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 정렬되어 있으므로 사용자마다 연속된 바이트 구간 하나
+        ranges = {}
+        offset = 0
+        with open(path, 'wb') as out:
+            for (user_id, _), line in rows:
+                data = line.encode('utf-8')
+                out.write(data)
+                user_range = ranges.get(user_id)
+                if user_range is None:
+                    ranges[user_id] = [offset, len(data), 1]
+                else:
+                    user_range[1] += len(data)
+                    user_range[2] += 1
+                offset += len(data)
+        with open(os.path.join(os.path.dirname(path), USER_RANGES_FILE), 'w', encoding='utf-8') as out:
+            json.dump(ranges, out, ensure_ascii=False, separators=(',', ':'))
+        played = [key[1] for key, _ in rows if key[1]]
+        partitions.append({
+            'month': month,
+            'path': os.path.relpath(partition_path(output_dir, shard, month), output_dir).replace(os.sep, '/'),
+            'rounds': len(rows),
+            'users': len(ranges),
+            'bytes': os.path.getsize(path),
+            'min_played_at': min(played) if played else None,
+            'max_played_at': max(played) if played else None,
+        })
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+    return {'rounds': sum(p['rounds'] for p in partitions), 'partitions': partitions}
+
+
+def write_partitioned(rounds, output_dir, num_shards=DEFAULT_SHARDS, only_shard=None):
+    """
+    라운드 이터러블을 샤드 × 월 파티션으로 기록하고 매니페스트를 갱신
+
+    Args:
+        rounds: 라운드 dict 이터러블
+        output_dir: 데이터셋 디렉터리 (manifest.json 위치)
+        num_shards: 샤드 수 (기존 매니페스트가 있으면 같은 값이어야 함)
+        only_shard: 지정하면 해당 샤드에 속한 라운드만 골라 그 샤드만 다시 생성
+
+    Returns:
+        갱신된 매니페스트 dict
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    if manifest is not None and manifest['num_shards'] != num_shards:
+        raise ValueError(f"기존 데이터셋의 샤드 수({manifest['num_shards']})와 다릅니다: {num_shards}")
+    if manifest is None or only_shard is None:
+        # 전체 재생성: 기존 샤드 디렉터리를 모두 지우고 새로 기록
+        if manifest is not None:
+            for shard in manifest['shards']:
+                shutil.rmtree(shard_dir(output_dir, int(shard)), ignore_errors=True)
+        manifest = {'version': MANIFEST_VERSION, 'num_shards': num_shards, 'hash': 'crc32',
+                    'partition_file': PARTITION_FILE, 'total_rounds': 0, 'shards': {}}
+
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix='.spill-') as spill_dir:
+        shards, _ = _spill(rounds, spill_dir, num_shards, only_shard)
+        if only_shard is not None and only_shard not in shards:
+            # 입력에 해당 샤드 라운드가 없으면 빈 샤드로 교체
+            shutil.rmtree(shard_dir(output_dir, only_shard), ignore_errors=True)
+            manifest['shards'].pop(f"{only_shard:03d}", None)
+        for shard in shards:
+            entry = _write_shard(os.path.join(spill_dir, f"{shard:03d}.jsonl"), output_dir, shard)
+            manifest['shards'][f"{shard:03d}"] = entry
+
+    manifest['shards'] = dict(sorted(manifest['shards'].items()))
+    manifest['total_rounds'] = sum(entry['rounds'] for entry in manifest['shards'].values())
+    _save_manifest(output_dir, manifest)
+    return manifest
+
+
+def iter_user_rounds(output_dir, user_id, limit=None, since=None, manifest=None):
+    """
+    한 사용자의 라운드를 played_at 역순으로 반환 (filteredRoundsProvider와 같은 순서)
+
+    그 사용자 샤드의 파티션만 최신 월부터 읽고, limit개를 채우거나 since 이전 월에 도달하면 멈춥니다.
+
+    Args:
+        limit: 최대 라운드 수 (None이면 전체)
+        since: 이 played_at(ISO 문자열) 이후 라운드만
+    """
+    manifest = manifest or load_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"매니페스트가 없습니다: {os.path.join(output_dir, MANIFEST_FILE)}")
+    entry = manifest['shards'].get(f"{shard_of(user_id, manifest['num_shards']):03d}")
+    if entry is None:
+        return
+
+    count = 0
+    for partition in sorted(entry['partitions'], key=lambda p: p['month'], reverse=True):
+        if since and partition['max_played_at'] and partition['max_played_at'] < since:
+            break
+        matched = _read_user_range(os.path.join(output_dir, partition['path']), user_id)
+        for round_data in reversed(matched):
+            if since and (round_data.get('played_at') or '') < since:
+                continue
+            yield round_data
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+
+def _read_user_range(path, user_id):
+    """파티션에서 users.json의 바이트 구간만 읽어 그 사용자 라운드를 played_at 순으로 반환"""
+    with open(os.path.join(os.path.dirname(path), USER_RANGES_FILE), 'r', encoding='utf-8') as f:
+        user_range = json.load(f).get(user_id)
+    if user_range is None:
+        return []
+    offset, length, _ = user_range
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="라운드 데이터 user_id 샤드 × 월 파티션 분할 / 조회")
+    parser.add_argument("inputs", nargs="*", help="라운드 파일 (.json 또는 .jsonl, 여러 개 가능)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="입력 포맷 (기본: 확장자로 판별)")
+    parser.add_argument("--output", required=True, help="파티션 데이터셋 디렉터리")
+    parser.add_argument("--shards", type=int, default=None,
+                        help=f"샤드 수 (기본: 기존 매니페스트 값, 없으면 {DEFAULT_SHARDS})")
+    parser.add_argument("--shard", type=int, default=None, help="이 샤드만 다시 생성 (나머지는 유지)")
+    parser.add_argument("--user", default=None, help="분할 대신 이 사용자의 라운드를 조회")
+    parser.add_argument("--limit", type=int, default=10, help="--user 조회 시 최근 라운드 수")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.user:
+        start = time.perf_counter()
+        rounds = list(iter_user_rounds(args.output, args.user, limit=args.limit))
+        elapsed = time.perf_counter() - start
+        print(f"{args.user}: 최근 {len(rounds)}개 라운드 ({elapsed * 1000:.1f}ms)")
+        for round_data in rounds:
+            print(f"  {round_data['played_at']}  {round_data.get('course_name')}  {round_data['total_score']}타")
+        return 0
+
+    if not args.inputs:
+        print("❌ 분할할 라운드 파일을 지정하세요.")
+        return 1
+    existing = load_manifest(args.output)
+    num_shards = args.shards or (existing['num_shards'] if existing else DEFAULT_SHARDS)
+    if args.shard is not None and not 0 <= args.shard < num_shards:
+        print(f"❌ --shard는 0 ~ {num_shards - 1} 범위여야 합니다.")
+        return 1
+
+    def all_rounds():
+        for path in args.inputs:
+            yield from iter_rounds(path, args.format)
+
+    start = time.perf_counter()
+    manifest = write_partitioned(all_rounds(), args.output, num_shards, only_shard=args.shard)
+    elapsed = time.perf_counter() - start
+
+    partitions = [p for entry in manifest['shards'].values() for p in entry['partitions']]
+    target = f"샤드 {args.shard}" if args.shard is not None else f"샤드 {len(manifest['shards'])}개"
+    print(f"  {target} 기록 ({elapsed:.2f}초)")
+    print(f"  전체 라운드: {manifest['total_rounds']}개, 파티션: {len(partitions)}개, "
+          f"평균 파티션 크기: {sum(p['bytes'] for p in partitions) / max(len(partitions), 1) / 1024:.1f} KB")
+    print(f"✅ 매니페스트: {os.path.join(args.output, MANIFEST_FILE)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,404 @@
+"""
+샷 센서 필드 컴팩트 바이너리 인코딩
+
+라운드 파일 바이트의 대부분은 샷마다 반복되는 키 이름과 들여쓰기입니다. 측정값은 모두
+소수 둘째 자리로 반올림되어 있으므로 ×100 고정소수점 정수 컬럼으로 저장하고,
+club_type / shot_type / lie는 코드 마스터 enum 번호로 저장합니다.
+
+파일 구조 (리틀 엔디언):
+    MAGIC, u32 헤더 길이, 헤더 JSON (필드별 타입/배율, enum 테이블)
+    라운드마다:
+        u8 모드 (0 = 라운드 JSON 그대로, 1 = 샷 컬럼 인코딩)
+        u32 길이 + 라운드 JSON (모드 1이면 shots 제외)
+        모드 1: u32 샷 수 + 컬럼 (shot_id 16바이트, 홀 번호, shot_number, enum 3개, 불리언 플래그,
+                 정수 타입 비트마스크, shot_at 오프셋(µs), 측정값 int16/int32)
+
+디코딩 결과는 원본 JSON과 정확히 같습니다 (int/float 구분, null, 키 순서 포함).
+정확히 복원할 수 없는 라운드(알 수 없는 코드, 범위 초과, 다른 키 구성, ranged/nested 배치 등)는
+모드 0으로 JSON 그대로 저장합니다.
+
+사용법:
+    python shot_codec.py encode ../../assets/data/all_sample_rounds_expanded.json --output rounds.gsc
+    python shot_codec.py decode rounds.gsc --output rounds.jsonl
+    python shot_codec.py compare ../../assets/data/all_sample_rounds_expanded.json   # 크기 / 디코딩 속도 비교
+"""
+
+import os
+import sys
+import math
+import json
+import time
+import struct
+import argparse
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from round_io import FORMATS, iter_rounds, write_rounds
+
+MAGIC = b'GSC1'
+CODEC_VERSION = 1
+
+# 샷 키 순서 (generate_sample_data.SHOT_KEYS와 동일해야 모드 1로 인코딩)
+SHOT_ID_KEYS = ('shot_id', 'hole_score_id', 'user_id', 'shot_number')
+ENUM_KEYS = ('club_type', 'shot_type', 'lie')
+FLAG_KEYS = ('is_putt', 'putt_made', 'is_mulligan')
+
+# 고정소수점 필드: (키, 타입). 값 = 정수 / SCALE
+SCALE = 100
+FIXED_FIELDS = (
+    ('putt_length', 'int16'),
+    ('TOTAL', 'int32'), ('CARRY', 'int32'), ('HEIGHT', 'int16'), ('LAND_ANG', 'int16'),
+    ('SIDE', 'int16'), ('SIDE_TOT', 'int16'), ('HANG_TIME', 'int16'), ('FROM_PIN', 'int32'),
+    ('BALL_SPEED', 'int16'), ('LAUNCH_ANG', 'int16'), ('LAUNCH_DIR', 'int16'), ('SPIN_RATE', 'int32'),
+    ('SPIN_AXIS', 'int16'), ('BACK_SPIN', 'int32'), ('SIDE_SPIN', 'int32'), ('SMASH_FAC', 'int16'),
+    ('ATTACK_ANG', 'int16'), ('CLUB_PATH', 'int16'), ('DYN_LOFT', 'int16'), ('SPIN_LOFT', 'int16'),
+    ('FACE_ANG', 'int16'), ('FACE_TO_PATH', 'int16'), ('CLUB_SPEED', 'int16'),
+)
+_FIXED_NAMES = tuple(name for name, _ in FIXED_FIELDS)
+
+SHOT_KEYS = (
+    'shot_id', 'hole_score_id', 'user_id', 'shot_number', 'club_type', 'shot_type', 'lie',
+    'is_putt', 'putt_made', 'putt_length', 'is_mulligan', 'shot_at',
+    'TOTAL', 'CARRY', 'HEIGHT', 'LAND_ANG', 'SIDE', 'SIDE_TOT', 'HANG_TIME', 'FROM_PIN',
+    'BALL_SPEED', 'LAUNCH_ANG', 'LAUNCH_DIR', 'SPIN_RATE', 'SPIN_AXIS', 'BACK_SPIN', 'SIDE_SPIN',
+    'SMASH_FAC', 'ATTACK_ANG', 'CLUB_PATH', 'DYN_LOFT', 'SPIN_LOFT', 'FACE_ANG', 'FACE_TO_PATH',
+    'CLUB_SPEED',
+)
+
+# 코드 마스터 (골프 통계 서비스 데이터 정의서 4장). None은 NULL_ENUM으로 저장
+ENUMS = {
+    'club_type': ['CLUB_D', 'CLUB_W3', 'CLUB_W5', 'CLUB_U', 'CLUB_I3', 'CLUB_I4', 'CLUB_I5', 'CLUB_I6',
+                  'CLUB_I7', 'CLUB_I8', 'CLUB_I9', 'CLUB_PW', 'CLUB_AW', 'CLUB_SW', 'CLUB_LW', 'CLUB_P',
+                  'CLUB_UNKNOWN'],
+    'shot_type': ['SHOT_T', 'SHOT_A', 'SHOT_C', 'SHOT_B', 'SHOT_P'],
+    'lie': ['LIE_TEE', 'LIE_FAIR', 'LIE_ROUGH', 'LIE_BUNK', 'LIE_GREEN', 'LIE_FRINGE', 'LIE_WATER', 'LIE_OB'],
+}
+NULL_ENUM = 255
+# 고정소수점 컬럼의 표시값: null은 타입별 최솟값, -0.0은 최솟값 + 1 (반올림 결과로 자주 나옴)
+NULL_FIXED = {'int16': np.iinfo(np.int16).min, 'int32': np.iinfo(np.int32).min}
+NEG_ZERO_FIXED = {dtype: value + 1 for dtype, value in NULL_FIXED.items()}
+
+MODE_JSON, MODE_SHOTS = 0, 1
+
+
+class _Unencodable(Exception):
+    """라운드를 모드 1로 정확히 복원할 수 없음 (모드 0으로 저장)"""
+
+
+def _uuid_bytes(value):
+    raw = bytes.fromhex(value.replace('-', '')) if isinstance(value, str) and len(value) == 36 else b''
+    if len(raw) != 16 or _uuid_str(raw) != value:
+        raise _Unencodable(f"UUID 형식이 아님: {value!r}")
+    return raw
+
+
+def _uuid_str(raw):
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _fixed_value(value, dtype):
+    """값 → (정수, 정수 타입 여부). 정확히 복원되지 않으면 _Unencodable"""
+    if value is None:
+        return NULL_FIXED[dtype], False
+    if type(value) is int:
+        scaled, is_int = value * SCALE, True
+    elif type(value) is float:
+        if value == 0 and math.copysign(1, value) < 0:
+            return NEG_ZERO_FIXED[dtype], False
+        scaled, is_int = round(value * SCALE), False
+        # 소수 셋째 자리 이하 값은 정확히 복원되지 않음
+        if scaled / SCALE != value:
+            raise _Unencodable(f"고정소수점으로 표현할 수 없는 값: {value!r}")
+    else:
+        raise _Unencodable(f"숫자가 아닌 측정값: {value!r}")
+    info = np.iinfo(dtype)
+    if not NEG_ZERO_FIXED[dtype] < scaled <= info.max:
+        raise _Unencodable(f"{dtype} 범위 초과: {value!r}")
+    return scaled, is_int
+
+
+def _format_shot_at(played_at, offsets):
+    """played_at + 오프셋(µs) → datetime.isoformat()과 같은 문자열 목록 (마이크로초가 0이면 초까지)"""
+    times = np.datetime64(played_at, 'us') + offsets.astype('timedelta64[us]')
+    texts = np.datetime_as_string(times, unit='us')
+    whole = times.astype(np.int64) % 1_000_000 == 0
+    if whole.any():
+        texts[whole] = np.datetime_as_string(times[whole], unit='s')
+    return texts.tolist()
+
+
+class ShotEncoder:
+    """라운드 → 바이트 (헤더는 encode_header로 파일 앞에 한 번만 기록)"""
+
+    def __init__(self):
+        self.enum_codes = {key: {code: i for i, code in enumerate(values)} for key, values in ENUMS.items()}
+        self.stats = {MODE_JSON: 0, MODE_SHOTS: 0}
+
+    @staticmethod
+    def encode_header():
+        header = json.dumps({
+            'version': CODEC_VERSION,
+            'scale': SCALE,
+            'shot_keys': SHOT_KEYS,
+            'fixed_fields': [{'name': name, 'type': dtype} for name, dtype in FIXED_FIELDS],
+            'enums': ENUMS,
+            'null_enum': NULL_ENUM,
+        }, ensure_ascii=False).encode('utf-8')
+        return MAGIC + struct.pack('<I', len(header)) + header
+
+    def encode(self, round_data):
+        try:
+            payload = self._encode_shots(round_data)
+        except _Unencodable:
+            payload = None
+        if payload is None:
+            self.stats[MODE_JSON] += 1
+            body = json.dumps(round_data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            return struct.pack('<BI', MODE_JSON, len(body)) + body
+
+        self.stats[MODE_SHOTS] += 1
+        rest = {key: value for key, value in round_data.items() if key != 'shots'}
+        body = json.dumps(rest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return struct.pack('<BI', MODE_SHOTS, len(body)) + body + payload
+
+    def _encode_shots(self, round_data):
+        shots = round_data.get('shots')
+        if not isinstance(shots, list) or next(reversed(round_data)) != 'shots':
+            raise _Unencodable("shots가 마지막 키인 flat 배치가 아님")
+        holes = round_data.get('holes', [])
+        if len(holes) > 255 or any('shots' in hole or 'shot_start' in hole for hole in holes):
+            raise _Unencodable("ranged/nested 배치")
+        hole_refs = {hole.get('hole_score_id'): i for i, hole in enumerate(holes)}
+        user_id = round_data.get('user_id')
+        played_at = datetime.fromisoformat(round_data['played_at']) if round_data.get('played_at') else None
+        if played_at is None or played_at.tzinfo is not None:
+            raise _Unencodable("played_at 없음 또는 시간대 포함")
+
+        n = len(shots)
+        ids = bytearray()
+        small = np.zeros((6, n), dtype=np.uint8)   # 홀, shot_number, enum 3개, 플래그
+        int_masks = np.zeros(n, dtype=np.uint32)
+        offsets = np.zeros(n, dtype=np.int64)
+        fixed = [np.zeros(n, dtype=dtype) for _, dtype in FIXED_FIELDS]
+
+        for i, shot in enumerate(shots):
+            if tuple(shot) != SHOT_KEYS:
+                raise _Unencodable("샷 키 구성이 다름")
+            if shot['user_id'] != user_id:
+                raise _Unencodable("라운드와 다른 user_id")
+            ids += _uuid_bytes(shot['shot_id'])
+            hole = hole_refs.get(shot['hole_score_id'])
+            number = shot['shot_number']
+            if hole is None or type(number) is not int or not 0 <= number <= 255:
+                raise _Unencodable("홀 참조 또는 shot_number")
+            small[0, i] = hole
+            small[1, i] = number
+            for row, key in enumerate(ENUM_KEYS, start=2):
+                value = shot[key]
+                code = NULL_ENUM if value is None else self.enum_codes[key].get(value)
+                if code is None:
+                    raise _Unencodable(f"알 수 없는 코드: {value!r}")
+                small[row, i] = code
+            flags = 0
+            for bit, key in enumerate(FLAG_KEYS):
+                if type(shot[key]) is not bool:
+                    raise _Unencodable(f"{key}가 불리언이 아님")
+                flags |= shot[key] << bit
+            small[5, i] = flags
+
+            shot_at = datetime.fromisoformat(shot['shot_at']) if isinstance(shot['shot_at'], str) else None
+            if shot_at is None or shot_at.tzinfo is not None:
+                raise _Unencodable(f"shot_at 형식: {shot['shot_at']!r}")
+            offsets[i] = (shot_at - played_at) // timedelta(microseconds=1)
+
+            mask = 0
+            for col, (name, dtype) in enumerate(FIXED_FIELDS):
+                scaled, is_int = _fixed_value(shot[name], dtype)
+                fixed[col][i] = scaled
+                mask |= is_int << col
+            int_masks[i] = mask
+
+        # 디코더와 같은 방식으로 문자열을 다시 만들어 표기까지 같은지 확인
+        if _format_shot_at(played_at, offsets) != [shot['shot_at'] for shot in shots]:
+            raise _Unencodable("shot_at 표기가 isoformat과 다름")
+
+        return b''.join([struct.pack('<I', n), bytes(ids), small.tobytes(), int_masks.tobytes(),
+                         offsets.tobytes()] + [column.tobytes() for column in fixed])
+
+
+class ShotDecoder:
+    """encode 결과 → 원본과 같은 라운드 dict"""
+
+    def __init__(self, header):
+        if header.get('version') != CODEC_VERSION:
+            raise ValueError(f"지원하지 않는 코덱 버전: {header.get('version')}")
+        self.scale = header['scale']
+        self.shot_keys = tuple(header['shot_keys'])
+        self.fixed_fields = [(field['name'], field['type']) for field in header['fixed_fields']]
+        null_enum = header['null_enum']
+        self.enum_tables = [
+            np.array(header['enums'][key] + [None] * (256 - len(header['enums'][key])), dtype=object)
+            for key in ENUM_KEYS
+        ]
+        for table in self.enum_tables:
+            table[null_enum] = None
+
+    def decode(self, buf, pos):
+        """buf[pos:]의 라운드 하나 → (라운드, 다음 위치)"""
+        mode, length = struct.unpack_from('<BI', buf, pos)
+        pos += 5
+        round_data = json.loads(buf[pos:pos + length])
+        pos += length
+        if mode == MODE_JSON:
+            return round_data, pos
+
+        (n,) = struct.unpack_from('<I', buf, pos)
+        pos += 4
+        raw_ids = buf[pos:pos + 16 * n].hex()
+        pos += 16 * n
+        shot_ids = [
+            f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+            for h in (raw_ids[i:i + 32] for i in range(0, 32 * n, 32))
+        ]
+        small = np.frombuffer(buf, dtype=np.uint8, count=6 * n, offset=pos).reshape(6, n)
+        pos += 6 * n
+        int_masks = np.frombuffer(buf, dtype=np.uint32, count=n, offset=pos)
+        pos += 4 * n
+        offsets = np.frombuffer(buf, dtype=np.int64, count=n, offset=pos)
+        pos += 8 * n
+
+        columns = []
+        for col, (name, dtype) in enumerate(self.fixed_fields):
+            values = np.frombuffer(buf, dtype=dtype, count=n, offset=pos)
+            pos += values.nbytes
+            # float 컬럼을 기본으로 정수 타입 / null / -0.0 위치만 덮어씀 (astype(object)로 파이썬 int/float 유지)
+            column = (values / self.scale).astype(object)
+            is_int = ((int_masks >> col) & 1).astype(bool)
+            if is_int.any():
+                column[is_int] = (values[is_int].astype(np.int64) // self.scale).astype(object)
+            special = values <= NEG_ZERO_FIXED[dtype]
+            if special.any():
+                column[special & (values == NULL_FIXED[dtype])] = None
+                column[values == NEG_ZERO_FIXED[dtype]] = -0.0
+            columns.append(column.tolist())
+
+        holes = round_data['holes']
+        hole_ids = [holes[i]['hole_score_id'] for i in small[0].tolist()]
+        shot_at = _format_shot_at(datetime.fromisoformat(round_data['played_at']), offsets)
+        flags = small[5]
+        putt_length, metrics = columns[0], columns[1:]
+        rows = zip(
+            shot_ids, hole_ids, [round_data['user_id']] * n, small[1].tolist(),
+            *(table[codes].tolist() for table, codes in zip(self.enum_tables, small[2:5])),
+            (flags & 1).astype(bool).tolist(), (flags & 2).astype(bool).tolist(), putt_length,
+            (flags & 4).astype(bool).tolist(), shot_at, *metrics,
+        )
+        round_data['shots'] = [dict(zip(self.shot_keys, row)) for row in rows]
+        return round_data, pos
+
+
+def encode_file(rounds, output_file):
+    """
+    라운드 이터러블을 코덱 파일로 기록
+
+    Returns:
+        {'rounds': 라운드 수, 'encoded': 모드 1 라운드 수, 'fallback': 모드 0 라운드 수}
+    """
+    encoder = ShotEncoder()
+    with open(output_file, 'wb') as f:
+        f.write(encoder.encode_header())
+        for round_data in rounds:
+            f.write(encoder.encode(round_data))
+    return {
+        'rounds': encoder.stats[MODE_JSON] + encoder.stats[MODE_SHOTS],
+        'encoded': encoder.stats[MODE_SHOTS],
+        'fallback': encoder.stats[MODE_JSON],
+    }
+
+
+def iter_decoded(input_file):
+    """코덱 파일의 라운드를 하나씩 디코딩"""
+    with open(input_file, 'rb') as f:
+        buf = f.read()
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"코덱 파일이 아닙니다: {input_file}")
+    (header_len,) = struct.unpack_from('<I', buf, len(MAGIC))
+    pos = len(MAGIC) + 4
+    decoder = ShotDecoder(json.loads(buf[pos:pos + header_len]))
+    pos += header_len
+    while pos < len(buf):
+        round_data, pos = decoder.decode(buf, pos)
+        yield round_data
+
+
+def compare(input_file, fmt=None, output_file=None):
+    """원본 JSON 대비 크기, 디코딩 속도, 정확한 왕복 여부 비교 (일치하면 True)"""
+    output_file = output_file or f"{input_file}.gsc"
+    jsonl_file = f"{output_file}.jsonl"
+
+    start = time.perf_counter()
+    originals = list(iter_rounds(input_file, fmt))
+    json_seconds = time.perf_counter() - start
+
+    stats = encode_file(originals, output_file)
+    write_rounds(originals, jsonl_file, fmt='jsonl')
+    start = time.perf_counter()
+    jsonl_count = sum(1 for _ in iter_rounds(jsonl_file, 'jsonl'))
+    jsonl_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = list(iter_decoded(output_file))
+    codec_seconds = time.perf_counter() - start
+
+    # 키 순서와 int/float 구분까지 같은지 직렬화 결과로 비교
+    exact = len(decoded) == len(originals) == jsonl_count and all(
+        json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False) for a, b in zip(originals, decoded)
+    )
+
+    sizes = [
+        (f"원본 ({fmt or os.path.splitext(input_file)[1][1:]})", os.path.getsize(input_file), json_seconds),
+        ("JSON Lines", os.path.getsize(jsonl_file), jsonl_seconds),
+        ("샷 코덱", os.path.getsize(output_file), codec_seconds),
+    ]
+    print(f"라운드 {stats['rounds']}개 (샷 인코딩 {stats['encoded']}개, JSON 그대로 {stats['fallback']}개)")
+    print(f"  {'형식':<14}{'크기':>12}{'비율':>8}{'읽기+디코딩':>14}")
+    for name, size, seconds in sizes:
+        print(f"  {name:<14}{size / (1024 * 1024):>10.2f}MB{size / sizes[0][1]:>8.1%}{seconds:>12.2f}초")
+    print(f"{'✅' if exact else '❌'} 왕복 결과가 원본과 {'정확히 일치' if exact else '다름'}")
+    os.remove(jsonl_file)
+    return exact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샷 센서 필드 컴팩트 바이너리 인코딩")
+    commands = parser.add_subparsers(dest="command", required=True)
+    encode = commands.add_parser("encode", help="라운드 파일 → 코덱 파일")
+    encode.add_argument("input", help="라운드 파일 (.json 또는 .jsonl)")
+    encode.add_argument("--format", choices=FORMATS, default=None, help="입력 포맷 (기본: 확장자로 판별)")
+    encode.add_argument("--output", default=None, help="출력 파일 (기본: <입력>.gsc)")
+    decode = commands.add_parser("decode", help="코덱 파일 → 라운드 파일")
+    decode.add_argument("input", help="코덱 파일")
+    decode.add_argument("--output", required=True, help="출력 라운드 파일 (.json 또는 .jsonl)")
+    check = commands.add_parser("compare", help="크기 / 디코딩 속도 비교와 왕복 검증")
+    check.add_argument("input", help="라운드 파일 (.json 또는 .jsonl)")
+    check.add_argument("--format", choices=FORMATS, default=None, help="입력 포맷 (기본: 확장자로 판별)")
+    check.add_argument("--output", default=None, help="코덱 파일 (기본: <입력>.gsc)")
+    args = parser.parse_args()
+
+    if args.command == "encode":
+        output_file = args.output or f"{args.input}.gsc"
+        stats = encode_file(iter_rounds(args.input, args.format), output_file)
+        print(f"라운드 {stats['rounds']}개 (샷 인코딩 {stats['encoded']}개, JSON 그대로 {stats['fallback']}개)")
+        print(f"✅ 저장: {output_file} ({os.path.getsize(output_file) / (1024 * 1024):.2f} MB)")
+        return 0
+    if args.command == "decode":
+        count = write_rounds(iter_decoded(args.input), args.output)
+        print(f"✅ {count}개 라운드 → {args.output}")
+        return 0
+    return 0 if compare(args.input, args.format, args.output) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
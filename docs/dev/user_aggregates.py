@@ -0,0 +1,235 @@
+"""
+사용자별 누적 집계 저장소
+
+StatsRepository / DriverRepository / PuttingRepository가 사용자 통계를 구할 때마다
+전체 라운드를 다시 훑는 대신, 사용자마다 합계 · 개수 · 제곱합 · 퍼팅 거리 구간 카운터를
+유지합니다. 새 라운드는 fold_round로 해당 사용자 레코드에만 더하므로 비용이
+라운드의 홀/샷 수에만 비례합니다 (기존 라운드 수와 무관).
+
+저장 형식 (user_aggregates.json):
+    {"version": 1, "users": {user_id: 레코드, ...}}
+
+사용법:
+    # 라운드 파일 전체로 저장소 생성 (기본 출력: 입력 파일 옆 user_aggregates.json)
+    python user_aggregates.py --input ../../assets/data/all_sample_rounds.json
+    # 새 라운드만 기존 저장소에 추가
+    python user_aggregates.py --append new_rounds.jsonl --store ../../assets/data/user_aggregates.json
+"""
+
+import os
+import json
+import math
+import time
+import argparse
+from pathlib import Path
+
+from round_io import FORMATS, flatten_shots, iter_rounds
+
+STORE_VERSION = 1
+
+# StatsRepository.calculateDriverDistance 기준: 드라이버 티샷
+DRIVER_CLUB = 'CLUB_D'
+DRIVER_SHOT_TYPE = 'SHOT_T'
+
+# PuttingRepository와 같은 퍼팅 거리 구간 (상한 포함, 마지막은 30m 초과)
+PUTT_BIN_EDGES = [5, 10, 15, 20, 25, 30]
+PUTT_BINS = [f"{lo}-{hi}m" for lo, hi in zip([0] + PUTT_BIN_EDGES[:-1], PUTT_BIN_EDGES)] + [f"{PUTT_BIN_EDGES[-1]}m+"]
+
+# 라운드에서 그대로 더하는 필드
+ROUND_SUM_FIELDS = [
+    'total_score', 'total_par', 'total_putts', 'fairways_hit', 'fairways_attempted',
+    'greens_in_regulation', 'mulligans_used', 'birdies_or_better', 'pars', 'bogeys',
+    'double_bogey_or_worse',
+]
+
+# 제곱합도 유지하는 필드 (표준편차용)
+SQUARED_FIELDS = ['total_score', 'total_putts']
+
+
+def new_aggregate():
+    """빈 사용자 레코드"""
+    return {
+        'rounds': 0,
+        'holes': 0,
+        'sums': dict.fromkeys(ROUND_SUM_FIELDS, 0),
+        'sum_squares': dict.fromkeys(SQUARED_FIELDS, 0),
+        'score_min': None,
+        'score_max': None,
+        'three_putt_holes': 0,
+        'first_putt': {'holes': 0, 'made': 0},
+        'driver': {'count': 0, 'sum': 0.0, 'sum_squares': 0.0},
+        'putting': {name: {'attempts': 0, 'made': 0} for name in PUTT_BINS},
+        'last_played_at': None,
+    }
+
+
+def _putt_bin(length):
+    for edge, name in zip(PUTT_BIN_EDGES, PUTT_BINS):
+        if length <= edge:
+            return name
+    return PUTT_BINS[-1]
+
+
+def fold_round(agg, round_data):
+    """라운드 하나를 사용자 레코드에 더하기 (O(홀 + 샷))"""
+    round_data = flatten_shots(round_data)
+    agg['rounds'] += 1
+    sums = agg['sums']
+    for field in ROUND_SUM_FIELDS:
+        sums[field] += round_data.get(field) or 0
+    for field in SQUARED_FIELDS:
+        agg['sum_squares'][field] += (round_data.get(field) or 0) ** 2
+
+    score = round_data['total_score']
+    agg['score_min'] = score if agg['score_min'] is None else min(agg['score_min'], score)
+    agg['score_max'] = score if agg['score_max'] is None else max(agg['score_max'], score)
+    played_at = round_data.get('played_at')
+    if played_at and (agg['last_played_at'] is None or played_at > agg['last_played_at']):
+        agg['last_played_at'] = played_at
+
+    holes = round_data.get('holes', [])
+    agg['holes'] += len(holes)
+    for hole in holes:
+        if hole['putts'] >= 3:
+            agg['three_putt_holes'] += 1
+
+    # 홀별 첫 퍼트는 샷 순서상 처음 나온 퍼트 (PuttingRepository 기준)
+    first_putt_seen = set()
+    driver = agg['driver']
+    putting = agg['putting']
+    for shot in round_data.get('shots', []):
+        if shot['is_putt']:
+            made = shot.get('putt_made') is True
+            counter = putting[_putt_bin(shot.get('putt_length') or 0.0)]
+            counter['attempts'] += 1
+            counter['made'] += made
+            hole_score_id = shot['hole_score_id']
+            if hole_score_id not in first_putt_seen:
+                first_putt_seen.add(hole_score_id)
+                agg['first_putt']['holes'] += 1
+                agg['first_putt']['made'] += made
+        elif (shot['club_type'] == DRIVER_CLUB and shot['shot_type'] == DRIVER_SHOT_TYPE
+              and shot.get('TOTAL') is not None):
+            driver['count'] += 1
+            driver['sum'] += shot['TOTAL']
+            driver['sum_squares'] += shot['TOTAL'] ** 2
+    return agg
+
+
+def _mean(total, count):
+    return total / count if count else 0.0
+
+
+def _std(total, sum_squares, count):
+    """제곱합으로 구한 모표준편차"""
+    if not count:
+        return 0.0
+    mean = total / count
+    return math.sqrt(max(sum_squares / count - mean * mean, 0.0))
+
+
+def summarize(agg):
+    """레코드에서 화면용 통계 계산 (StatsRepository 등과 같은 정의)"""
+    rounds, sums = agg['rounds'], agg['sums']
+    driver = agg['driver']
+    return {
+        'rounds': rounds,
+        'average_score': _mean(sums['total_score'], rounds),
+        'score_std': _std(sums['total_score'], agg['sum_squares']['total_score'], rounds),
+        'best_score': agg['score_min'],
+        'average_over_par': _mean(sums['total_score'] - sums['total_par'], rounds),
+        'average_putts': _mean(sums['total_putts'], rounds),
+        'putts_std': _std(sums['total_putts'], agg['sum_squares']['total_putts'], rounds),
+        'fairway_percentage': _mean(sums['fairways_hit'], sums['fairways_attempted']) * 100,
+        'gir_percentage': _mean(sums['greens_in_regulation'], agg['holes']) * 100,
+        'double_bogey_or_worse_rate': _mean(sums['double_bogey_or_worse'], agg['holes']) * 100,
+        'three_putt_rate': _mean(agg['three_putt_holes'], agg['holes']) * 100,
+        'first_putt_success_rate': _mean(agg['first_putt']['made'], agg['first_putt']['holes']),
+        'driver_distance': _mean(driver['sum'], driver['count']),
+        'driver_distance_std': _std(driver['sum'], driver['sum_squares'], driver['count']),
+        'putting_success_rate': {
+            name: _mean(counter['made'], counter['attempts'])
+            for name, counter in agg['putting'].items()
+        },
+        'last_played_at': agg['last_played_at'],
+    }
+
+
+class UserAggregateStore:
+    """user_id → 누적 레코드. append_round로 새 라운드를 해당 사용자에만 반영"""
+
+    def __init__(self, users=None):
+        self.users = users if users is not None else {}
+
+    def append_round(self, round_data):
+        user_id = round_data['user_id']
+        agg = self.users.get(user_id)
+        if agg is None:
+            agg = self.users[user_id] = new_aggregate()
+        return fold_round(agg, round_data)
+
+    def append_rounds(self, rounds):
+        """라운드 이터러블을 모두 반영하고 반영한 라운드 수 반환"""
+        count = 0
+        for round_data in rounds:
+            self.append_round(round_data)
+            count += 1
+        return count
+
+    def summary(self, user_id):
+        agg = self.users.get(user_id)
+        return summarize(agg) if agg is not None else None
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != STORE_VERSION:
+            raise ValueError(f"지원하지 않는 저장소 버전: {data.get('version')}")
+        return cls(data['users'])
+
+    def save(self, path):
+        """임시 파일에 쓴 뒤 교체 (중간에 실패해도 기존 저장소 유지)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'users': self.users}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def parse_args(project_root):
+    parser = argparse.ArgumentParser(description="사용자별 누적 집계 저장소 생성/갱신")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--input", type=Path,
+                        default=project_root / "assets" / "data" / "all_sample_rounds.json",
+                        help="전체 라운드 파일로 저장소를 새로 생성")
+    source.add_argument("--append", type=Path, default=None,
+                        help="기존 저장소에 이 파일의 라운드만 추가")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="입력 포맷 (기본: 확장자로 판별)")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="저장소 파일 (기본: 입력 파일 옆 user_aggregates.json)")
+    return parser.parse_args()
+
+
+def main():
+    project_root = Path(__file__).parent.parent.parent
+    args = parse_args(project_root)
+    source = args.append or args.input
+    store_file = args.store or source.with_name('user_aggregates.json')
+
+    if args.append:
+        store = UserAggregateStore.load(store_file)
+        print(f"기존 저장소: {store_file} (사용자 {len(store.users)}명)")
+    else:
+        store = UserAggregateStore()
+
+    start = time.perf_counter()
+    count = store.append_rounds(iter_rounds(source, args.format))
+    elapsed = time.perf_counter() - start
+    store.save(store_file)
+
+    print(f"  반영한 라운드: {count}개 ({elapsed:.2f}초), 사용자: {len(store.users)}명")
+    print(f"✅ 저장: {store_file} ({Path(store_file).stat().st_size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,292 @@
-import json
-
-# 데이터 로드
-with open('../../assets/data/all_sample_rounds_expanded.json', encoding='utf-8') as f:
-    data = json.load(f)
-
-# 기본 통계
-print("=" * 60)
-print("데이터 검증 결과")
-print("=" * 60)
-
-print(f"\n📊 기본 통계:")
-print(f"  총 라운드 수: {len(data)}")
-
-users = set(r['user_id'] for r in data)
-print(f"  총 사용자 수: {len(users)}")
-
-# 레벨별 분포
-beginner = [r for r in data if 'beginner' in r['user_id']]
-inter = [r for r in data if 'inter' in r['user_id']]
-advanced = [r for r in data if 'advanced' in r['user_id']]
-
-print(f"\n🎯 레벨별 분포:")
-print(f"  초급: {len(beginner)}개 라운드 (평균 스코어: {sum(r['total_score'] for r in beginner)/len(beginner):.1f})")
-print(f"  중급: {len(inter)}개 라운드 (평균 스코어: {sum(r['total_score'] for r in inter)/len(inter):.1f})")
-print(f"  상급: {len(advanced)}개 라운드 (평균 스코어: {sum(r['total_score'] for r in advanced)/len(advanced):.1f})")
-
-# 스코어 범위
-scores = [r['total_score'] for r in data]
-print(f"\n📈 스코어 통계:")
-print(f"  최소: {min(scores)}")
-print(f"  최대: {max(scores)}")
-print(f"  평균: {sum(scores)/len(scores):.1f}")
-
-# 데이터 무결성
-print(f"\n✅ 데이터 무결성:")
-print(f"  모든 라운드에 user_id: {all('user_id' in r for r in data)}")
-print(f"  모든 라운드에 holes: {all('holes' in r for r in data)}")
-print(f"  모든 라운드에 shots: {all('shots' in r for r in data)}")
-print(f"  모든 라운드에 18홀: {all(len(r['holes']) == 18 for r in data)}")
-
-# ID 중복 검사
-round_ids = [r['round_id'] for r in data]
-print(f"  round_id 중복 없음: {len(round_ids) == len(set(round_ids))}")
-
-# 샘플 검증
-sample = data[0]
-print(f"\n🔍 샘플 라운드:")
-print(f"  user_id: {sample['user_id']}")
-print(f"  round_id: {sample['round_id']}")
-print(f"  홀 수: {len(sample['holes'])}")
-print(f"  샷 수: {len(sample['shots'])}")
-print(f"  스코어: {sample['total_score']}")
-
-print("\n" + "=" * 60)
-print("✅ 검증 완료! 데이터가 정상입니다.")
-print("=" * 60)
+"""
+확장 샘플 데이터 검증 스크립트
+
+라운드 파일을 스트리밍으로 한 번만 읽으면서 모든 통계와 무결성 검사를 누적합니다.
+라운드 데이터는 한 번에 하나만 메모리에 두지만, ID 중복 검사용 집합(round_id, hole_score_id, shot_id)은
+데이터셋 크기에 비례해 커집니다 (ID 하나당 16바이트 다이제스트 + 집합 오버헤드, 사용자 집합은 user_id 문자열).
+검사에 실패하면 종료 코드 1을 반환합니다.
+
+ranged / nested 샷 배치(round_io.LAYOUTS) 파일도 그대로 검증합니다.
+
+사용법:
+    python validate_data.py [파일 경로] [--format json|jsonl] [--max-examples N]
+"""
+
+import argparse
+import sys
+import uuid
+
+from round_io import AGGREGATE_FIELDS, FORMATS, flatten_shots, iter_rounds, summarize_holes
+
+DEFAULT_INPUT = '../../assets/data/all_sample_rounds_expanded.json'
+
+# 레벨별 분포 (user_id에 포함된 접두어 기준)
+LEVELS = [('beginner', '초급'), ('inter', '중급'), ('advanced', '상급')]
+
+# 라운드 필수 키
+REQUIRED_KEYS = ['round_id', 'user_id', 'total_score', 'holes', 'shots']
+
+# 참조 무결성 규칙 (규칙 키, 설명)
+INTEGRITY_RULES = [
+    ('shot_hole_ref', "shot.hole_score_id가 같은 라운드의 홀을 참조"),
+    ('shot_id_unique', "shot_id 전역 중복 없음"),
+    ('hole_score_id_unique', "hole_score_id 전역 중복 없음"),
+    ('shot_number_contiguous', "홀별 shot_number가 1부터 연속"),
+    ('round_aggregates', "라운드 집계값이 홀 합계와 일치"),
+    ('shot_range', "홀의 [shot_start, shot_end) 구간이 해당 홀 샷만 포함 (ranged 배치)"),
+    ('field_types', "user_id는 문자열, total_score는 정수"),
+]
+
+
+def _id_key(value):
+    """중복 검사용 키: UUID면 16바이트로 줄여서 보관"""
+    try:
+        return uuid.UUID(value).bytes
+    except (ValueError, TypeError, AttributeError):
+        return value
+
+
+class RoundValidator:
+    """
+    라운드를 하나씩 받아 통계와 무결성 검사 결과를 누적
+
+    전역 ID 중복은 해시 집합, 라운드 내 참조는 라운드별 dict 인덱스로 확인하므로
+    전체 검사가 샷 수에 대해 O(n)입니다. 위반 사례는 규칙별로 max_examples개까지만 보관합니다.
+    """
+
+    def __init__(self, max_examples=5):
+        self.max_examples = max_examples
+        self.total_rounds = 0
+        self.users = set()
+        self.level_counts = {prefix: 0 for prefix, _ in LEVELS}
+        self.level_score_sums = {prefix: 0 for prefix, _ in LEVELS}
+        self.score_min = None
+        self.score_max = None
+        self.score_sum = 0
+        self.scored_rounds = 0
+        self.missing_keys = {key: 0 for key in REQUIRED_KEYS}
+        self.not_18_holes = 0
+        self.round_ids = set()
+        self.duplicate_round_ids = 0
+        self.sample = None
+        self.shot_ids = set()
+        self.hole_score_ids = set()
+        self.violations = {rule: 0 for rule, _ in INTEGRITY_RULES}
+        self.examples = {rule: [] for rule, _ in INTEGRITY_RULES}
+
+    def _violation(self, rule, message):
+        self.violations[rule] += 1
+        if len(self.examples[rule]) < self.max_examples:
+            self.examples[rule].append(message)
+
+    def _check_ranges(self, round_data):
+        """ranged 배치: 홀의 [shot_start, shot_end) 구간이 해당 홀 샷만 가리키는지 확인"""
+        holes = [hole for hole in round_data.get('holes', []) if 'shot_start' in hole]
+        if not holes:
+            return
+        shots = round_data.get('shots', [])
+        covered = 0
+        broken = False
+        for hole in holes:
+            start, end = hole['shot_start'], hole.get('shot_end', -1)
+            hole_score_id = hole.get('hole_score_id')
+            if not (0 <= start <= end <= len(shots)) or any(
+                    shot.get('hole_score_id') != hole_score_id for shot in shots[start:end]):
+                self._violation('shot_range',
+                                f"round {round_data.get('round_id')} hole {hole.get('hole_number')}: [{start}, {end})")
+                broken = True
+            else:
+                covered += end - start
+        # 구간 밖에 남은 샷이 있으면 어떤 홀의 샷이 구간에서 빠진 것
+        hole_ids = {hole.get('hole_score_id') for hole in holes}
+        owned = sum(1 for shot in shots if shot.get('hole_score_id') in hole_ids)
+        if not broken and covered != owned:
+            self._violation('shot_range', f"round {round_data.get('round_id')}: 구간 밖 샷 {owned - covered}개")
+
+    def _check_references(self, round_data):
+        """홀/샷 ID 중복, 샷 → 홀 참조, shot_number 연속성, 집계값 일치 확인"""
+        round_id = round_data.get('round_id')
+        holes = round_data.get('holes', [])
+        shots = round_data.get('shots', [])
+
+        # 라운드 내 hole_score_id 인덱스 (+ 전역 중복)
+        shot_numbers = {}
+        for hole in holes:
+            hole_score_id = hole.get('hole_score_id')
+            key = _id_key(hole_score_id)
+            if key in self.hole_score_ids:
+                self._violation('hole_score_id_unique', f"round {round_id}: hole_score_id {hole_score_id}")
+            else:
+                self.hole_score_ids.add(key)
+            shot_numbers[hole_score_id] = []
+
+        for shot in shots:
+            shot_id = shot.get('shot_id')
+            key = _id_key(shot_id)
+            if key in self.shot_ids:
+                self._violation('shot_id_unique', f"round {round_id}: shot_id {shot_id}")
+            else:
+                self.shot_ids.add(key)
+
+            numbers = shot_numbers.get(shot.get('hole_score_id'))
+            if numbers is None:
+                self._violation('shot_hole_ref', f"round {round_id}: shot {shot_id} → {shot.get('hole_score_id')}")
+            else:
+                numbers.append(shot.get('shot_number'))
+
+        for hole in holes:
+            numbers = shot_numbers[hole.get('hole_score_id')]
+            if sorted(numbers) != list(range(1, len(numbers) + 1)):
+                self._violation('shot_number_contiguous',
+                                f"round {round_id} hole {hole.get('hole_number')}: {numbers}")
+
+        try:
+            expected = summarize_holes(holes)
+        except (KeyError, TypeError) as e:
+            self._violation('round_aggregates', f"round {round_id}: 홀 필드 누락 ({e})")
+            return
+        mismatched = [
+            f"{field}={round_data.get(field)}(홀 합계 {expected[field]})"
+            for field in AGGREGATE_FIELDS
+            if round_data.get(field) != expected[field]
+        ]
+        if mismatched:
+            self._violation('round_aggregates', f"round {round_id}: {', '.join(mismatched)}")
+
+    def add(self, round_data):
+        self.total_rounds += 1
+        # ranged/nested 배치는 구간을 확인한 뒤 flat으로 맞춰서 검사
+        self._check_ranges(round_data)
+        round_data = flatten_shots(round_data)
+
+        for key in REQUIRED_KEYS:
+            if key not in round_data:
+                self.missing_keys[key] += 1
+
+        # 키는 있지만 타입이 틀린 값은 field_types 위반으로 집계하고 통계에서 제외
+        user_id = round_data.get('user_id', '')
+        score = round_data.get('total_score')
+        round_id = round_data.get('round_id')
+        if not isinstance(user_id, str):
+            self._violation('field_types', f"round {round_id}: user_id={user_id!r}")
+            user_id = None
+        if score is not None and (isinstance(score, bool) or not isinstance(score, int)):
+            self._violation('field_types', f"round {round_id}: total_score={score!r}")
+            score = None
+
+        if user_id is not None:
+            self.users.add(user_id)
+
+        # total_score / round_id가 없는 라운드는 missing_keys로만 집계하고 통계 · 중복 검사에서 제외
+        if score is not None and user_id is not None:
+            for prefix, _ in LEVELS:
+                if prefix in user_id:
+                    self.level_counts[prefix] += 1
+                    self.level_score_sums[prefix] += score
+
+            self.score_sum += score
+            self.scored_rounds += 1
+            self.score_min = score if self.score_min is None else min(self.score_min, score)
+            self.score_max = score if self.score_max is None else max(self.score_max, score)
+
+        if len(round_data.get('holes', [])) != 18:
+            self.not_18_holes += 1
+
+        if 'round_id' in round_data:
+            round_key = _id_key(round_data['round_id'])
+            if round_key in self.round_ids:
+                self.duplicate_round_ids += 1
+            else:
+                self.round_ids.add(round_key)
+
+        self._check_references(round_data)
+
+        if self.sample is None:
+            self.sample = {
+                'user_id': user_id,
+                'round_id': round_data.get('round_id'),
+                'holes': len(round_data.get('holes', [])),
+                'shots': len(round_data.get('shots', [])),
+                'total_score': score,
+            }
+
+    def checks(self):
+        """(설명, 통과 여부) 목록"""
+        results = [(f"모든 라운드에 {key}", count == 0) for key, count in self.missing_keys.items()]
+        results.append(("모든 라운드에 18홀", self.not_18_holes == 0))
+        results.append(("round_id 중복 없음", self.duplicate_round_ids == 0))
+        results.append(("라운드 1개 이상", self.total_rounds > 0))
+        results.extend((label, self.violations[rule] == 0) for rule, label in INTEGRITY_RULES)
+        return results
+
+
+def _average(total, count):
+    return f"{total / count:.1f}" if count else "-"
+
+
+def print_report(v):
+    print("=" * 60)
+    print("데이터 검증 결과")
+    print("=" * 60)
+
+    print(f"\n📊 기본 통계:")
+    print(f"  총 라운드 수: {v.total_rounds}")
+    print(f"  총 사용자 수: {len(v.users)}")
+
+    print(f"\n🎯 레벨별 분포:")
+    for prefix, name in LEVELS:
+        count = v.level_counts[prefix]
+        print(f"  {name}: {count}개 라운드 (평균 스코어: {_average(v.level_score_sums[prefix], count)})")
+
+    print(f"\n📈 스코어 통계:")
+    print(f"  최소: {v.score_min}")
+    print(f"  최대: {v.score_max}")
+    print(f"  평균: {_average(v.score_sum, v.scored_rounds)}")
+
+    print(f"\n✅ 데이터 무결성:")
+    for label, passed in v.checks():
+        print(f"  {label}: {passed}")
+
+    if any(v.violations.values()):
+        print(f"\n🔗 참조 무결성 위반 (규칙별 최대 {v.max_examples}건 예시):")
+        for rule, label in INTEGRITY_RULES:
+            if v.violations[rule]:
+                print(f"  [{rule}] {label}: {v.violations[rule]}건")
+                for example in v.examples[rule]:
+                    print(f"    - {example}")
+
+    if v.sample:
+        print(f"\n🔍 샘플 라운드:")
+        print(f"  user_id: {v.sample['user_id']}")
+        print(f"  round_id: {v.sample['round_id']}")
+        print(f"  홀 수: {v.sample['holes']}")
+        print(f"  샷 수: {v.sample['shots']}")
+        print(f"  스코어: {v.sample['total_score']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="확장 샘플 데이터 검증")
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT, help="라운드 파일 (.json 또는 .jsonl)")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="입력 포맷 (기본: 확장자로 판별)")
+    parser.add_argument("--max-examples", type=int, default=5, help="규칙별로 출력할 위반 예시 수")
+    args = parser.parse_args()
+
+    validator = RoundValidator(max_examples=args.max_examples)
+    for round_data in iter_rounds(args.input, args.format):
+        validator.add(round_data)
+
+    print_report(validator)
+
+    print("\n" + "=" * 60)
+    if all(passed for _, passed in validator.checks()):
+        print("✅ 검증 완료! 데이터가 정상입니다.")
+        print("=" * 60)
+        return 0
+
+    print("❌ 검증 실패! 위의 무결성 항목을 확인하세요.")
+    print("=" * 60)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())